@@ -6,48 +6,46 @@ Run benchmarks and comparisons from the command line.
 Usage:
     python cli.py benchmark sudoku --solver backtracking
     python cli.py benchmark sudoku --all
+    python cli.py benchmark sudoku --all --workers 8
+    python cli.py benchmark sudoku --all --timeout-ms 500
+    python cli.py benchmark sudoku --all --warmup 2 --repeat 5
+    python cli.py benchmark sudoku --all --min-time-ms 20 --target-cv 0.02
+    python cli.py benchmark sudoku --all --stable --no-gc --repeat 5
+    python cli.py benchmark sudoku --all --memory both --memory-top 3
+    python cli.py benchmark sudoku --all --count
+    python cli.py benchmark sudoku --all --profile sampling
+    python cli.py benchmark sudoku --all --dataset nightly --seed 1 --param difficulty=hard
+    python cli.py benchmark sudoku --all --n 100000 --chunk-size 512
+    python cli.py benchmark sudoku --solver propagation --no-batch
+    python cli.py benchmark sudoku --all --store results/logs/results.db --output-mode keep
+    python cli.py benchmark sudoku --all --seed 1 --n 5000 --incremental
+    python cli.py compare sudoku backtracking propagation --seed 1
+    python cli.py compare sudoku --all --baseline results/logs/main.jsonl --threshold 0.05
+    python cli.py compare sudoku --all --baseline base.jsonl --candidate cand.jsonl --runs 3
+    python cli.py sweep sudoku --all --grid holes=20:60:8 --n 20 --timeout-ms 2000
+    python cli.py sweep mastermind --all --grid colors=4,6,8 --grid length=3,4 --x colors
+    SOLVERBENCH_AUTHKEY=<secret> python cli.py coordinator sudoku --all --n 10000 --listen 0.0.0.0:7878
+    SOLVERBENCH_AUTHKEY=<secret> python cli.py worker --connect coordinator-host:7878 --workers 8
+    python cli.py benchmark mastermind --interactive --concurrency 2000 --oracle-latency-ms 20 --n 10000
+    python cli.py benchmark sudoku --solver dlx --startup-timing
     python cli.py benchmark sudoku --import mysolver.py --solver mysolver
 """
 
+import time
+_STARTED = time.perf_counter()
+
+import ast
+import importlib
+import inspect
 import sys
-import os
 import importlib.util
-import importlib
-import pkgutil
 from typing import List
-from core.registry import get_accuracy_fn
-from core.runner import run_batch
+from core import registry
+from core.registry import autoload_internal_solvers, import_extra_modules
 from core.registry import list_solvers
-from core.metrics import summarize_results
-from puzzles import sudoku
-import example_solvers
-
-
-# ---------------------------------------------------------------------------
-# Internal solver auto-loader
-# ---------------------------------------------------------------------------
-def autoload_internal_solvers():
-    """Auto-import all solvers bundled in example_solvers/"""
-    for _, modname, _ in pkgutil.iter_modules(example_solvers.__path__):
-        importlib.import_module(f"example_solvers.{modname}")
-
-
-# ---------------------------------------------------------------------------
-# External solver loader (user-supplied)
-# ---------------------------------------------------------------------------
-def import_extra_modules(paths):
-    """Import arbitrary modules or .py files specified by the user."""
-    for path in paths or []:
-        if os.path.isfile(path) and path.endswith(".py"):
-            modname = os.path.splitext(os.path.basename(path))[0]
-            spec = importlib.util.spec_from_file_location(modname, path)
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[modname] = module
-            spec.loader.exec_module(module)
-            print(f"[SolverBench] Imported file: {path}")
-        else:
-            importlib.import_module(path)
-            print(f"[SolverBench] Imported module: {path}")
+# Command modules (runner, compare, sweep, distributed, ...) are imported by
+# the command that needs them, so --help and argument errors stay fast.
+_IMPORTED = time.perf_counter()
 
 
 # ---------------------------------------------------------------------------
@@ -64,8 +62,60 @@ else:
 # ---------------------------------------------------------------------------
 # Common benchmark logic
 # ---------------------------------------------------------------------------
-def run_benchmark(puzzle: str, solvers: List[str], measure_memory=False):
-    """Run solvers on the given puzzle dataset."""
+def parse_params(pairs) -> dict:
+    """Turn ["holes=50", "difficulty=hard"] into {"holes": 50, "difficulty": "hard"}."""
+    params = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            print(f"[ERROR] --param expects KEY=VALUE, got '{pair}'")
+            sys.exit(1)
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return params
+
+
+def run_benchmark(puzzle: str, solvers: List[str], measure_memory=False,
+                  workers: int = 1, extra_modules=None, timeout_ms=None,
+                  dataset_name=None, seed=None, params=None, chunk_size=256,
+                  store_path=None, output_mode="hash", flags=None, on_result=None,
+                  coordinator=None, game_loop=None, checkpoints=None, **timing):
+    """
+    Run solvers on the given puzzle dataset.
+
+    With a dataset name or a seed the inputs come from the dataset store
+    (generated and saved on first use); otherwise a fresh dataset is drawn.
+    Either way cases are streamed through the runner ``chunk_size`` at a
+    time and results are folded into the summary as they arrive.
+
+    With ``store_path`` every result is also appended to a result store
+    (JSONL or SQLite) under a run header describing this run; outputs are
+    treated according to ``output_mode``. ``on_result`` is called with each
+    result as well. Returns the SummaryAccumulator.
+
+    With a ``coordinator`` (core.distributed.Coordinator) the jobs run on
+    its remote workers instead, and one summary is kept and printed per
+    worker host, so timings from different machines are never pooled;
+    the return value is then {host id: SummaryAccumulator}.
+
+    With a ``game_loop`` (core.interactive.GameLoop) the async solvers play
+    against its simulated oracle instead, and their throughput is printed
+    after the summary.
+
+    With ``checkpoints`` (core.checkpoint.CheckpointStore) the run is
+    incremental: results already checkpointed for the same solver code,
+    dataset and options are reused, and only the rest is run. This needs a
+    stored dataset (a dataset name or a seed).
+    """
+    from core import datasets
+    from core.checkpoint import iter_incremental, options_key
+    from core.environment import host_fingerprint, run_header
+    from core.metrics import SummaryAccumulator
+    from core.profiling import ProfileCollector
+    from core.results import open_store
+    from core.runner import WorkerStartupError, iter_batch
 
     # Try to dynamically import the puzzle module
     try:
@@ -75,29 +125,297 @@ def run_benchmark(puzzle: str, solvers: List[str], measure_memory=False):
         sys.exit(1)
 
     # Try to call the dataset generator
-    try:
-        dataset, refs = puzzle_module.generate_dataset()
-    except AttributeError:
+    if not hasattr(puzzle_module, "generate_dataset"):
         print(f"[ERROR] Puzzle '{puzzle}' does not define generate_dataset().")
         sys.exit(1)
+    params = params or {}
+    if checkpoints and not (dataset_name or seed is not None):
+        print("[ERROR] Incremental runs need a stored dataset: pass --dataset or --seed")
+        sys.exit(1)
+    if checkpoints and timing.get("profile"):
+        print("[ERROR] --profile cannot be combined with --incremental")
+        sys.exit(1)
+    stored = None
+    if dataset_name or seed is not None:
+        try:
+            stored = datasets.load_or_generate(
+                puzzle, puzzle_module.generate_dataset, params, seed, dataset_name
+            )
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        dataset, refs, dataset_name = stored.cases, stored.references, stored.name
+        print(f"[SolverBench] Using dataset '{dataset_name}' ({len(dataset)} cases).")
+        pairs = zip(dataset, refs)
+    elif "stream" in inspect.signature(puzzle_module.generate_dataset).parameters:
+        pairs = puzzle_module.generate_dataset(**params, stream=True)
+    else:
+        pairs = zip(*puzzle_module.generate_dataset(**params))
 
-    results = run_batch(
-        puzzle, solvers, dataset, references=refs, measure_memory=measure_memory
-    )
-    print(summarize_results(results))
+    store = None
+    if store_path:
+        store = open_store(store_path)
+        header = run_header(puzzle, solvers, dataset_name, flags)
+        store.start_run(header)
+        print(f"[SolverBench] Recording run {header['run_id']} to {store_path}")
+
+    summary = SummaryAccumulator()
+    host_summaries = {}
+    profiles = ProfileCollector(puzzle, timing["profile"]) if timing.get("profile") else None
+    kept = output_mode if store else ("hash" if checkpoints else "drop")
+
+    def run(names, pairs):
+        if coordinator:
+            return coordinator.run(
+                puzzle, names, pairs, chunk_size=chunk_size, measure_memory=measure_memory,
+                timeout_ms=timeout_ms, output_mode=kept, **timing,
+            )
+        if game_loop:
+            return game_loop.run(names, pairs, chunk_size=chunk_size, output_mode=kept)
+        return iter_batch(
+            puzzle, names, pairs, measure_memory=measure_memory, workers=workers,
+            extra_modules=extra_modules, timeout_ms=timeout_ms, chunk_size=chunk_size,
+            output_mode=kept, **timing,
+        )
+
+    try:
+        if checkpoints:
+            key = options_key({
+                "measure_memory": measure_memory, "timeout_ms": timeout_ms, "output_mode": kept,
+                "workers": workers, "timing": timing,
+                "host": "coordinator" if coordinator else {
+                    k: v for k, v in host_fingerprint().items() if k not in ("id", "git_commit")
+                },
+                "game_loop": game_loop and [game_loop.concurrency, game_loop.latency_ms,
+                                            game_loop.jitter_ms, game_loop.timeout_ms],
+            })
+            results = iter_incremental(
+                puzzle, solvers, dataset, refs,
+                f"{dataset_name}@{datasets.dataset_digest(dataset_name)[:16]}",
+                key, checkpoints, run,
+            )
+        else:
+            results = run(solvers, pairs)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    try:
+        for result in results:
+            if profiles:
+                profiles.add(result)
+            if "host" in result:
+                host_summaries.setdefault(result["host"]["id"], SummaryAccumulator()).add(result)
+            else:
+                summary.add(result)
+            if store:
+                store.add(result)
+            if on_result:
+                on_result(result)
+    except WorkerStartupError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        if store:
+            store.close()
+        if checkpoints:
+            checkpoints.close()  # keeps what finished before an interruption
+        if stored:
+            stored.close()
+    if coordinator:
+        for host_id, host_summary in host_summaries.items():
+            host = coordinator.hosts[host_id]
+            print(f"Host {host_id} — {host['hostname']}, {host['cpu_model']} "
+                  f"({host['cpu_count']} CPUs), {host['python']}\n")
+            print(host_summary.render())
+        if summary.solvers:
+            print("Jobs no worker could finish\n")
+            print(summary.render())
+    else:
+        print(summary.render())
+    if game_loop:
+        for solver in game_loop.wall_s:
+            lost = [f"{n} {label}" for n, label in (
+                (game_loop.timed_out.get(solver, 0), "timed out"),
+                (game_loop.failed.get(solver, 0), "failed"),
+            ) if n]
+            print(f"🌐 {solver}: {game_loop.throughput(solver):,.0f} games/s "
+                  f"({game_loop.concurrency} concurrent)" + (f"; {', '.join(lost)}" if lost else ""))
+    if profiles:
+        for solver in profiles.profiles:
+            print(profiles.render(solver))
+        for path in profiles.write():
+            print(f"[SolverBench] Wrote profile {path}")
+    return host_summaries if coordinator else summary
 
 # ---------------------------------------------------------------------------
-# SnapArg CLI
+# Shared argument setup and dispatch
 # ---------------------------------------------------------------------------
-def cli_snaparg():
-    parser = snaparg.SnapArgumentParser(description="SolverBench CLI (SnapArg-powered)")
-
-    parser.add_argument("command", choices=["benchmark"], help="Command to execute.")
-    parser.add_argument("puzzle", help="Puzzle name (e.g., sudoku).")
+def add_common_arguments(parser):
+    """Arguments shared by the SnapArg and argparse front-ends."""
+    parser.add_argument(
+        "command", choices=["benchmark", "compare", "sweep", "coordinator", "worker"],
+        help="Command to execute.",
+    )
+    parser.add_argument("puzzle", nargs="?", help="Puzzle name (e.g., sudoku); not used by worker.")
+    parser.add_argument(
+        "targets", nargs="*", metavar="SOLVER",
+        help="compare: solvers to compare, baseline first (or the solvers to check with --baseline).",
+    )
     parser.add_argument("--solver", help="Specific solver name.")
     parser.add_argument("--all", action="store_true", help="Run all solvers for the puzzle.")
-    parser.add_argument("--memory", action="store_true", help="Track memory usage.")
-    parser.add_argument("--autofix", action="store_true", help="Auto-fix argument typos.")
+    parser.add_argument(
+        "--memory", nargs="?", const="tracemalloc", default=None,
+        choices=["tracemalloc", "rss", "both"],
+        help="Track memory usage in a separate untimed pass (default mode: tracemalloc).",
+    )
+    parser.add_argument(
+        "--memory-top", type=int, default=5,
+        help="With tracemalloc, report this many top allocation sites per solver (0 disables).",
+    )
+    parser.add_argument(
+        "--count", action="store_true",
+        help="Count operations (is_valid calls, guesses, backtracks, ...) in a separate untimed pass.",
+    )
+    parser.add_argument(
+        "--profile", choices=["cprofile", "sampling"], default=None,
+        help="Profile each solver in a separate untimed pass and write reports to results/profiles/.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes to spread cases over (default: 1, serial).",
+    )
+    parser.add_argument(
+        "--no-batch", dest="batch", action="store_false",
+        help="Call every solver one case at a time, even if it has a batch entry point.",
+    )
+    parser.add_argument(
+        "--timeout-ms", type=float, default=None,
+        help="Wall-clock budget per case; overrunning cases are killed and marked timed_out.",
+    )
+    parser.add_argument(
+        "--dataset", dest="dataset_name",
+        help="Pin a stored dataset by name (generated and saved on first use).",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=256,
+        help="Cases held in memory at once while streaming the dataset (default: 256).",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for dataset generation.")
+    parser.add_argument("--n", type=int, default=None, help="Number of cases to generate.")
+    parser.add_argument(
+        "--param", action="append", metavar="KEY=VALUE",
+        help="Extra generator parameter, e.g. --param holes=55 (repeatable).",
+    )
+    parser.add_argument(
+        "--store", dest="store_path", nargs="?", const=True, default=None,
+        help="Append every result to a store (.jsonl, or .db/.sqlite for SQLite; "
+             "default: results/logs/results.jsonl).",
+    )
+    parser.add_argument(
+        "--output-mode", choices=["drop", "hash", "keep"], default="hash",
+        help="What to store of each solver output (default: hash).",
+    )
+    parser.add_argument(
+        "--incremental", "--resume", dest="incremental", action="store_true",
+        help="Checkpoint every result and reuse those whose solver code, dataset and options "
+             "are unchanged; needs --dataset or --seed.",
+    )
+    parser.add_argument(
+        "--checkpoints", metavar="PATH", default=None,
+        help="Checkpoint database for --incremental (default: $SOLVERBENCH_CHECKPOINTS or "
+             "results/cache/checkpoints.db).",
+    )
+    parser.add_argument(
+        "--baseline", metavar="STORE",
+        help="compare: result store holding the baseline run.",
+    )
+    parser.add_argument("--baseline-run", metavar="RUN_ID", help="compare: baseline run (default: latest).")
+    parser.add_argument(
+        "--candidate", metavar="STORE",
+        help="compare: load the candidate from this store instead of running it.",
+    )
+    parser.add_argument("--candidate-run", metavar="RUN_ID", help="compare: candidate run (default: latest).")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="compare: slowdown ratio above 1 + THRESHOLD counts as a regression (default: 0.10).",
+    )
+    parser.add_argument(
+        "--alpha", type=float, default=0.05,
+        help="compare: significance level; verdicts use the paired (1 - ALPHA) CI over runs and "
+             "cases (default: 0.05).",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=1,
+        help="compare: use the latest RUNS runs of each store, or run a fresh candidate RUNS "
+             "times; the CI then covers run-to-run variation (default: 1).",
+    )
+    parser.add_argument(
+        "--cross-host", action="store_true",
+        help="compare: allow a baseline recorded on a different machine.",
+    )
+    parser.add_argument(
+        "--grid", action="append", metavar="NAME=VALUES",
+        help="sweep: generator parameter values, e.g. holes=20:64:4 or colors=6,8 (repeatable).",
+    )
+    parser.add_argument("--x", metavar="NAME", help="sweep: grid parameter to fit growth curves against.")
+    parser.add_argument(
+        "--listen", metavar="ADDRESS", default="127.0.0.1:7878",
+        help="coordinator: HOST:PORT or Unix socket path to accept workers on (default: 127.0.0.1:7878).",
+    )
+    parser.add_argument(
+        "--connect", metavar="ADDRESS", default="127.0.0.1:7878",
+        help="worker: coordinator address, HOST:PORT or a Unix socket path (default: 127.0.0.1:7878).",
+    )
+    parser.add_argument(
+        "--authkey", default=None,
+        help="coordinator/worker: shared secret key (prefer $SOLVERBENCH_AUTHKEY); required on "
+             "non-loopback addresses, otherwise a private per-user key is used.",
+    )
+    parser.add_argument(
+        "--interactive", action="store_true",
+        help="Play async solvers against a simulated oracle, many games at once "
+             "(with --all, only the async solvers run).",
+    )
+    parser.add_argument(
+        "--oracle-latency-ms", type=float, default=0.0,
+        help="interactive: round-trip time of every oracle call (default: 0).",
+    )
+    parser.add_argument(
+        "--oracle-jitter-ms", type=float, default=0.0,
+        help="interactive: extra random delay of up to this much per oracle call (default: 0).",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1000,
+        help="interactive: games in flight at once (default: 1000).",
+    )
+    parser.add_argument(
+        "--stable", action="store_true",
+        help="Benchmark hygiene: pin to CPUs, gc.collect() before each case, record GC, CPU clock "
+             "and load per case and flag disturbed cases (implies --repeat 3 unless given).",
+    )
+    parser.add_argument(
+        "--no-gc", action="store_true",
+        help="Switch the garbage collector off during each timed call (implies --stable).",
+    )
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed calls per case before timing.")
+    parser.add_argument(
+        "--repeat", type=int, default=None,
+        help="Timed calls per case; the median is reported (default: 1, or 3 with --stable).",
+    )
+    parser.add_argument(
+        "--min-time-ms", type=float, default=None,
+        help="Adaptive mode: keep repeating a case until this much time was measured.",
+    )
+    parser.add_argument(
+        "--target-cv", type=float, default=None,
+        help="Adaptive mode: stop repeating once the coefficient of variation drops to this (e.g. 0.02).",
+    )
+    parser.add_argument("--max-repeat", type=int, default=1000, help="Cap on timed calls per case in adaptive mode.")
+    parser.add_argument(
+        "--startup-timing", action="store_true",
+        help="Report how long imports and solver discovery took before running "
+             "(python -X importtime gives a per-module breakdown).",
+    )
     parser.add_argument(
         "--import",
         dest="extra_modules",
@@ -105,23 +423,295 @@ def cli_snaparg():
         help="Additional modules or .py files to import before running.",
     )
 
-    args = parser.parse_args()
 
-    # load solvers
+def select_solvers(args):
+    """Solvers named by --all / --solver, or None."""
+    if args.all:
+        if getattr(args, "interactive", False):
+            return [name for name in list_solvers(args.puzzle)
+                    if registry.is_async_solver(args.puzzle, name)]
+        return list_solvers(args.puzzle)
+    if args.solver:
+        return [args.solver]
+    return None
+
+
+def benchmark_options(args, inherited=None) -> dict:
+    """
+    run_benchmark keyword arguments from the parsed command line.
+
+    ``inherited`` are the flags of a stored run whose dataset options
+    (--dataset, --seed, --n, --param) are reused when none were given.
+    """
+    from core.checkpoint import DEFAULT_CHECKPOINTS, CheckpointStore
+    from core.results import DEFAULT_STORE
+
+    dataset_flags = ("dataset_name", "seed", "n", "param")
+    if inherited and all(getattr(args, k) is None for k in dataset_flags):
+        dataset = {k: inherited.get(k) for k in dataset_flags}
+    else:
+        dataset = {k: getattr(args, k) for k in dataset_flags}
+    params = parse_params(dataset["param"])
+    if dataset["n"] is not None:
+        params["n"] = dataset["n"]
+    stable = args.stable or args.no_gc
+    repeat = args.repeat if args.repeat is not None else (3 if stable else 1)
+    return dict(
+        measure_memory=args.memory, dataset_name=dataset["dataset_name"], seed=dataset["seed"],
+        params=params, workers=args.workers, extra_modules=args.extra_modules,
+        timeout_ms=args.timeout_ms, chunk_size=max(1, args.chunk_size),
+        store_path=DEFAULT_STORE if args.store_path is True else args.store_path,
+        output_mode=args.output_mode,
+        flags={k: v for k, v in vars(args).items() if k != "authkey"},
+        warmup=args.warmup, repeat=repeat, min_time_ms=args.min_time_ms,
+        target_cv=args.target_cv, max_repeat=args.max_repeat,
+        memory_top=args.memory_top if args.memory else 0, count_ops=args.count,
+        profile=args.profile, batch=args.batch, stable=stable, disable_gc=args.no_gc,
+        checkpoints=(CheckpointStore(args.checkpoints or DEFAULT_CHECKPOINTS)
+                     if args.incremental else None),
+    )
+
+
+def run_compare(args) -> bool:
+    """
+    Run the compare command; returns True if a regression was found.
+
+    Without --baseline the named solvers run on one dataset and each is
+    compared with the first. With --baseline STORE the same solvers are
+    compared across runs: the baseline's latest (or --baseline-run) run
+    against a fresh run of the current code on the same dataset, or against
+    another stored run with --candidate. Cases are paired by index, so both
+    runs must use the same stored dataset; a baseline from another machine
+    is refused (unless --cross-host) and differing timing flags are warned
+    about.
+
+    With --runs N the latest N runs of each store are compared (fresh
+    candidates are run N times), and the CI covers the variation between
+    runs as well as between cases (see core.compare).
+    """
+    from core.compare import compare_times, load_times, render_comparison, setup_differences
+    from core.environment import run_header
+
+    runs = max(1, args.runs)
+    times = {}  # solver -> [{case_index: time_ms} per run]
+    current = [0]  # run being collected
+
+    def collect(result):
+        if result["success"] and result["time_ms"] is not None:
+            per_run = times.setdefault(result["solver"], [{} for _ in range(runs)])
+            per_run[current[0]][result["case_index"]] = result["time_ms"]
+
+    def run_fresh(solvers, options):
+        for current[0] in range(runs):
+            run_benchmark(args.puzzle, solvers, on_result=collect, **options)
+
+    rows = []
+    if args.baseline:
+        try:
+            base_header, base_times = load_times(args.baseline, args.puzzle, args.baseline_run, runs)
+            if args.candidate:
+                cand_header, times = load_times(args.candidate, args.puzzle, args.candidate_run, runs)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        if not base_header.get("dataset_id"):
+            print("[ERROR] The baseline run did not use a stored dataset (--dataset or --seed), "
+                  "so its cases cannot be paired with a new run")
+            sys.exit(1)
+        if not args.candidate:
+            solvers = args.targets or select_solvers(args) or [
+                name for name in base_header["solvers"] if name in list_solvers(args.puzzle)
+            ]
+            options = benchmark_options(args, inherited=base_header["flags"])
+            cand_header = run_header(args.puzzle, solvers, base_header["dataset_id"], options["flags"])
+        if cand_header.get("dataset_id") != base_header["dataset_id"]:
+            print(f"[ERROR] Baseline used dataset '{base_header['dataset_id']}', candidate used "
+                  f"'{cand_header.get('dataset_id')}'; cases can only be paired on the same dataset")
+            sys.exit(1)
+        machine, setup = setup_differences(base_header, cand_header)
+        if machine and not args.cross_host:
+            print("[ERROR] The baseline was recorded on a different machine; its timings are not "
+                  "comparable:\n  " + "\n  ".join(machine) + "\nPass --cross-host to compare anyway.")
+            sys.exit(1)
+        for difference in machine + setup:
+            print(f"[SolverBench] Warning: baseline and candidate differ in {difference}")
+        if not args.candidate:
+            run_fresh(solvers, options)
+        base_label = (base_header.get("git_commit") or base_header["run_id"])[:12]
+        title = f"{args.puzzle} (baseline: run {base_header['run_id'][:8]} @ {base_label})"
+        for name, cand in times.items():
+            if name in base_times:
+                rows.append(compare_times(name, base_times[name], cand,
+                                          args.threshold, args.alpha))
+            else:
+                print(f"[SolverBench] Solver '{name}' is not in the baseline run; skipped.")
+    else:
+        if len(args.targets) < 2:
+            print("[ERROR] compare needs two or more solvers, or --baseline STORE")
+            sys.exit(1)
+        baseline = args.targets[0]
+        run_fresh(args.targets, benchmark_options(args))
+        title = f"{args.puzzle} (baseline: {baseline})"
+        for name in args.targets[1:]:
+            rows.append(compare_times(f"{name} vs {baseline}", times.get(baseline, []),
+                                      times.get(name, []), args.threshold, args.alpha))
+
+    print(render_comparison(title, rows, args.threshold))
+    return any(row["regression"] for row in rows)
+
+
+def run_sweep_command(args):
+    """Run the sweep command: every solver at every point of the --grid."""
+    from core.environment import run_header
+    from core.results import open_store
+    from core.sweep import parse_grid, render_sweep, run_sweep
+
+    solvers = select_solvers(args)
+    if solvers is None:
+        print("[ERROR] Must specify --solver or --all")
+        sys.exit(1)
+    try:
+        grid = parse_grid(args.grid or [])
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if not grid:
+        print("[ERROR] sweep needs at least one --grid NAME=VALUES")
+        sys.exit(1)
+    x_param = args.x or next((k for k, v in grid.items() if len(v) > 1), None)
+    if x_param is not None and x_param not in grid:
+        print(f"[ERROR] --x {x_param} is not a grid parameter")
+        sys.exit(1)
+    generate = __import__(f"puzzles.{args.puzzle}", fromlist=[""]).generate_dataset
+
+    options = benchmark_options(args)
+    params, seed = options.pop("params"), options.pop("seed")
+    store_path, flags = options.pop("store_path"), options.pop("flags")
+    for unused in ("dataset_name", "output_mode", "checkpoints"):
+        options.pop(unused)
+    store = None
+    if store_path:
+        store = open_store(store_path)
+        header = run_header(args.puzzle, solvers, None, flags)
+        store.start_run(header)
+        print(f"[SolverBench] Recording run {header['run_id']} to {store_path}")
+    try:
+        sweep = run_sweep(args.puzzle, solvers, generate, grid, params, seed,
+                          on_result=store.add if store else None,
+                          output_mode=args.output_mode if store else "drop", **options)
+    finally:
+        if store:
+            store.close()
+    print(render_sweep(args.puzzle, sweep, x_param, args.timeout_ms))
+
+
+def startup_timing(args, discovery_s: float):
+    """Import the puzzle and the selected solvers now, and report what each step cost."""
+    rows = [("cli + core imports", _IMPORTED - _STARTED), ("solver discovery", discovery_s)]
+    start = time.perf_counter()
+    try:
+        importlib.import_module(f"puzzles.{args.puzzle}")
+    except ModuleNotFoundError:
+        pass
+    rows.append((f"puzzles.{args.puzzle}", time.perf_counter() - start))
+    already = set(registry.import_times)
+    for name in select_solvers(args) or args.targets or []:
+        try:
+            registry.get_solver(args.puzzle, name)
+        except ValueError:
+            pass  # reported properly when the command runs
+    rows += [(module, t) for module, t in registry.import_times.items() if module not in already]
+    available = list_solvers(args.puzzle)
+    loaded = len(registry.all_solvers_loaded(args.puzzle))
+    print(f"[SolverBench] Startup timing ({loaded} of {len(available)} {args.puzzle} solvers imported):")
+    for label, seconds in rows:
+        print(f"  {label:<40} {seconds*1000:8.2f} ms")
+    print(f"  {'total':<40} {(time.perf_counter() - _STARTED)*1000:8.2f} ms\n")
+
+
+def dispatch(args):
+    """Load solvers and run the selected command."""
+    start = time.perf_counter()
     autoload_internal_solvers()
     import_extra_modules(getattr(args, "extra_modules", []))
+    if args.startup_timing:
+        startup_timing(args, time.perf_counter() - start)
 
-    if args.command == "benchmark":
-        available = list_solvers(args.puzzle)
-        if args.all:
-            solvers = available
-        elif args.solver:
-            solvers = [args.solver]
-        else:
+    if args.command == "worker":
+        from core.distributed import run_worker
+
+        authkey = args.authkey.encode() if args.authkey else None
+        try:
+            done = run_worker(args.connect, authkey, max(1, args.workers), args.extra_modules)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        except OSError as e:
+            print(f"[ERROR] Cannot reach coordinator at {args.connect}: {e}")
+            sys.exit(1)
+        print(f"[SolverBench] Worker finished {done} job(s).")
+        return
+    if not args.puzzle:
+        print(f"[ERROR] {args.command} needs a puzzle name")
+        sys.exit(1)
+
+    if args.command in ("benchmark", "coordinator"):
+        solvers = select_solvers(args)
+        if solvers is None:
             print("[ERROR] Must specify --solver or --all")
             sys.exit(1)
+        if args.command == "benchmark" and args.interactive:
+            from core.interactive import GameLoop
 
-        run_benchmark(args.puzzle, solvers, measure_memory=args.memory)
+            try:
+                __import__(f"puzzles.{args.puzzle}")
+                game_loop = GameLoop(args.puzzle, args.concurrency, args.oracle_latency_ms,
+                                     args.oracle_jitter_ms, args.timeout_ms, args.seed)
+            except (ModuleNotFoundError, ValueError) as e:
+                print(f"[ERROR] {e}")
+                sys.exit(1)
+            if not solvers:
+                print(f"[ERROR] Puzzle '{args.puzzle}' has no async solvers")
+                sys.exit(1)
+            for name in solvers:
+                if not registry.is_async_solver(args.puzzle, name):
+                    print(f"[ERROR] Solver '{name}' is not async; --interactive needs async def solvers")
+                    sys.exit(1)
+            run_benchmark(args.puzzle, solvers, game_loop=game_loop, **benchmark_options(args))
+            return
+        if args.command == "benchmark":
+            run_benchmark(args.puzzle, solvers, **benchmark_options(args))
+            return
+        from core.distributed import Coordinator
+
+        authkey = args.authkey.encode() if args.authkey else None
+        try:
+            coordinator = Coordinator(args.listen, authkey)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        except OSError as e:
+            print(f"[ERROR] Cannot listen on {args.listen}: {e}")
+            sys.exit(1)
+        with coordinator:
+            run_benchmark(args.puzzle, solvers, coordinator=coordinator, **benchmark_options(args))
+
+    elif args.command == "compare":
+        if run_compare(args):
+            sys.exit(1)
+
+    elif args.command == "sweep":
+        run_sweep_command(args)
+
+
+# ---------------------------------------------------------------------------
+# SnapArg CLI
+# ---------------------------------------------------------------------------
+def cli_snaparg():
+    parser = snaparg.SnapArgumentParser(description="SolverBench CLI (SnapArg-powered)")
+    add_common_arguments(parser)
+    parser.add_argument("--autofix", action="store_true", help="Auto-fix argument typos.")
+    dispatch(parser.parse_args())
 
 
 # ---------------------------------------------------------------------------
@@ -131,35 +721,8 @@ def cli_argparse():
     import argparse
 
     parser = argparse.ArgumentParser(description="SolverBench CLI (fallback mode)")
-    parser.add_argument("command", choices=["benchmark"], help="Command to run")
-    parser.add_argument("puzzle", help="Puzzle name (e.g., sudoku)")
-    parser.add_argument("--solver", help="Specific solver to run")
-    parser.add_argument("--all", action="store_true", help="Run all solvers for the puzzle")
-    parser.add_argument("--memory", action="store_true", help="Track memory usage")
-    parser.add_argument(
-        "--import",
-        dest="extra_modules",
-        nargs="+",
-        help="Additional modules or .py files to import before running.",
-    )
-
-    args = parser.parse_args()
-
-    # load solvers
-    autoload_internal_solvers()
-    import_extra_modules(getattr(args, "extra_modules", []))
-
-    if args.command == "benchmark":
-        available = list_solvers(args.puzzle)
-        if args.all:
-            solvers = available
-        elif args.solver:
-            solvers = [args.solver]
-        else:
-            print("[ERROR] Must specify --solver or --all")
-            sys.exit(1)
-
-        run_benchmark(args.puzzle, solvers, measure_memory=args.memory)
+    add_common_arguments(parser)
+    dispatch(parser.parse_args())
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,8 @@
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def results_dir(*parts: str) -> str:
+    """Path under the repository's results/ directory (logs, datasets, caches, profiles)."""
+    return os.path.join(REPO_ROOT, "results", *parts)
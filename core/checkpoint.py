@@ -0,0 +1,149 @@
+"""
+SolverBench Checkpoints
+-----------------------
+Resumable, incremental runs (--incremental / --resume).
+
+Every finished result is checkpointed in a SQLite file under the key
+
+    (puzzle, solver, solver source hash, dataset, options, case_index)
+
+where the source hash covers the solver's module, its puzzle module, the
+runner and every in-repo module those import (see
+registry.solver_source_hash), the dataset is a stored dataset's
+name and content digest, and the options are everything else a result
+depends on (timing and memory settings, workers, host, ...). On the next
+run, every (solver, case) whose key is already there is replayed from the
+checkpoint instead of run again, marked ``"cached": True``. A run that
+died partway picks up where it stopped, and after editing one solver only
+that solver runs again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Set
+
+from core import results_dir
+from core.registry import solver_source_hash
+
+DEFAULT_CHECKPOINTS = os.environ.get(
+    "SOLVERBENCH_CHECKPOINTS", results_dir("cache", "checkpoints.db")
+)
+
+
+def options_key(options: Dict[str, Any]) -> str:
+    """Short stable hash of the run options a result depends on."""
+    data = json.dumps(options, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """Checkpointed results in SQLite, one row per (solver, case) under its full key."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            puzzle       TEXT NOT NULL,
+            solver       TEXT NOT NULL,
+            source_hash  TEXT NOT NULL,
+            dataset      TEXT NOT NULL,
+            options      TEXT NOT NULL,
+            case_index   INTEGER NOT NULL,
+            record       TEXT NOT NULL,
+            PRIMARY KEY (puzzle, solver, source_hash, dataset, options, case_index)
+        );
+    """
+    _COMMIT_EVERY = 256
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINTS):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self._SCHEMA)
+        self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def completed(self, puzzle: str, solver: str, source_hash: str, dataset: str,
+                  options: str) -> Set[int]:
+        """Case indices already checkpointed under this key."""
+        rows = self._db.execute(
+            "SELECT case_index FROM checkpoints WHERE puzzle = ? AND solver = ? AND source_hash = ?"
+            " AND dataset = ? AND options = ?",
+            (puzzle, solver, source_hash, dataset, options),
+        )
+        return {i for (i,) in rows}
+
+    def records(self, puzzle: str, solver: str, source_hash: str, dataset: str,
+                options: str) -> Iterator[Dict[str, Any]]:
+        """Checkpointed results under this key, by case index."""
+        rows = self._db.execute(
+            "SELECT record FROM checkpoints WHERE puzzle = ? AND solver = ? AND source_hash = ?"
+            " AND dataset = ? AND options = ? ORDER BY case_index",
+            (puzzle, solver, source_hash, dataset, options),
+        )
+        for (record,) in rows:
+            yield json.loads(record)
+
+    def add(self, result: Dict[str, Any], source_hash: str, dataset: str, options: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (result["puzzle"], result["solver"], source_hash, dataset, options,
+             result["case_index"], json.dumps(result, separators=(",", ":"), default=repr)),
+        )
+        self._pending += 1
+        if self._pending >= self._COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self._db.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+
+def iter_incremental(puzzle: str, solver_names: List[str], cases, references, dataset: str,
+                     options: str, store: CheckpointStore,
+                     run: Callable[[List[str], Any], Iterator[Dict[str, Any]]]):
+    """
+    Results for every solver on every case, running only what is not
+    checkpointed yet.
+
+    ``cases`` and ``references`` are sequences (a stored dataset);
+    ``run(solver_names, pairs)`` runs solvers on a stream of pairs, numbering
+    cases from 0 (iter_batch, Coordinator.run, GameLoop.run). Checkpointed
+    results come first, solver by solver; then solvers that miss the same
+    cases run together on just those cases, and each new result is
+    checkpointed as it arrives.
+    """
+    hashes = {name: solver_source_hash(puzzle, name) for name in solver_names}
+    stale_groups: Dict[tuple, List[str]] = {}
+    for name in solver_names:
+        done = store.completed(puzzle, name, hashes[name], dataset, options)
+        if done:
+            print(f"[SolverBench] Solver '{name}': {len(done)} of {len(cases)} case(s) "
+                  f"unchanged since the last run, reusing checkpointed results.")
+            for result in store.records(puzzle, name, hashes[name], dataset, options):
+                result["cached"] = True
+                yield result
+        stale = tuple(i for i in range(len(cases)) if i not in done)
+        if stale:
+            stale_groups.setdefault(stale, []).append(name)
+
+    try:
+        for stale, names in stale_groups.items():
+            pairs = ((cases[i], references[i]) for i in stale)
+            for result in run(names, pairs):
+                result["case_index"] = stale[result["case_index"]]
+                store.add(result, hashes[result["solver"]], dataset, options)
+                yield result
+    finally:
+        store.commit()
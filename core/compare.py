@@ -0,0 +1,190 @@
+"""
+SolverBench Compare
+-------------------
+Paired statistical comparison of per-case timings.
+
+A comparison pits a candidate against a baseline: two solvers from one
+run, or the same solver in two sets of runs on the same stored dataset
+(e.g. baseline runs from main against runs of the working tree). Timings
+are paired by case_index, so differences in case difficulty cancel out,
+and each case contributes one log(candidate / baseline), its log times
+averaged over the runs of each side. For each comparison it reports:
+
+    ratio   - exp(median per-case log ratio); below 1 is faster
+    CI      - confidence interval of that ratio (level 1 - alpha) from a
+              bootstrap over runs and cases (stats.paired_run_bootstrap)
+    p       - two-sided bootstrap p-value for a ratio of 1
+
+The verdict comes from the CI: "slower" if it lies above 1, "faster" if
+below. A candidate is a regression when it is slower and its ratio
+exceeds 1 + threshold.
+
+Separate processes on one machine can differ by far more than the cases
+within one run (memory layout, frequency, neighbours), and one run per
+side cannot show that: the CI then only covers case-to-case variation.
+For a gate, record several runs of each side, interleaved (baseline,
+candidate, baseline, ...), and compare them all (--runs).
+
+Timings from different machines or timing setups are not comparable;
+setup_differences() lists what differs between two run headers.
+"""
+
+import math
+from statistics import median
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from core import stats
+from core.results import open_store
+
+# run flags that change what a timing means
+TIMING_FLAGS = ("warmup", "repeat", "min_time_ms", "target_cv", "max_repeat", "workers",
+                "batch", "timeout_ms", "stable", "no_gc")
+
+
+Times = Dict[int, float]
+
+
+def compare_times(label: str, baseline: Union[Times, Sequence[Times]],
+                  candidate: Union[Times, Sequence[Times]],
+                  threshold: float = 0.10, alpha: float = 0.05) -> Dict[str, Any]:
+    """
+    Compare timings case by case; see the module docstring. ``baseline``
+    and ``candidate`` are each a {case_index: time_ms} mapping, or a list
+    of them, one per run. Only cases timed in every run are compared.
+    """
+    base_runs = [baseline] if isinstance(baseline, dict) else list(baseline)
+    cand_runs = [candidate] if isinstance(candidate, dict) else list(candidate)
+    row = {
+        "label": label,
+        "runs": (len(base_runs), len(cand_runs)),
+        "n_pairs": 0,
+        "baseline_ms": None,
+        "candidate_ms": None,
+        "ratio": None,
+        "ci": None,
+        "confidence": 1 - alpha,
+        "p_value": None,
+        "verdict": "n/a",
+        "regression": False,
+    }
+    runs = base_runs + cand_runs
+    if not base_runs or not cand_runs:
+        return row
+    cases = [i for i in sorted(set.intersection(*(set(r) for r in runs)))
+             if all(r[i] > 0 for r in runs)]
+    if not cases:
+        return row
+
+    def log_times(side):
+        return [[math.log(r[i]) for i in cases] for r in side]
+
+    estimate, (lo, hi), p = stats.paired_run_bootstrap(
+        log_times(base_runs), log_times(cand_runs), 1 - alpha,
+        stats.bootstrap_resamples(len(cases) * len(runs)),
+    )
+    ratio = math.exp(estimate)
+
+    if math.exp(lo) > 1:
+        verdict = "slower"
+    elif math.exp(hi) < 1:
+        verdict = "faster"
+    else:
+        verdict = "no significant change"
+    row.update({
+        "n_pairs": len(cases),
+        "baseline_ms": median(median(r[i] for r in base_runs) for i in cases),
+        "candidate_ms": median(median(r[i] for r in cand_runs) for i in cases),
+        "ratio": ratio,
+        "ci": (math.exp(lo), math.exp(hi)),
+        "p_value": p,
+        "verdict": verdict,
+        "regression": verdict == "slower" and ratio > 1 + threshold,
+    })
+    return row
+
+
+def load_times(store_path: str, puzzle: str, run_id: Optional[str] = None,
+               runs: int = 1) -> Tuple[Dict[str, Any], Dict[str, List[Times]]]:
+    """
+    (run header, {solver: [{case_index: time_ms} per run]}) for stored runs.
+
+    Takes the latest ``runs`` runs of ``puzzle`` (oldest first), or just
+    ``run_id``; the header is that of the latest one. All of them must use
+    the same stored dataset. Failed and timed-out cases are left out of
+    the times.
+    """
+    with open_store(store_path) as store:
+        headers = store.runs(puzzle)
+        if run_id is not None:
+            if runs != 1:
+                raise ValueError("A single run id cannot be combined with several runs.")
+            headers = [h for h in headers if h["run_id"] == run_id]
+        if not headers:
+            wanted = f"run '{run_id}'" if run_id else f"{puzzle} run"
+            raise ValueError(f"No {wanted} found in {store_path}.")
+        if len(headers) < runs:
+            raise ValueError(f"{store_path} has {len(headers)} {puzzle} run(s), {runs} wanted.")
+        headers = headers[-runs:]
+        if len({h.get("dataset_id") for h in headers}) > 1:
+            raise ValueError(f"The last {runs} {puzzle} runs in {store_path} used different datasets.")
+        times: Dict[str, List[Times]] = {}
+        for k, header in enumerate(headers):
+            for r in store.results(run_id=header["run_id"], puzzle=puzzle):
+                if r.get("success") and r.get("time_ms") is not None:
+                    per_run = times.setdefault(r["solver"], [{} for _ in headers])
+                    per_run[k][r["case_index"]] = r["time_ms"]
+    return headers[-1], times
+
+
+def _machine(header: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a run header that describe the machine (older headers have no "host")."""
+    return {
+        "hostname": (header.get("host") or {}).get("hostname"),
+        "cpu_model": header.get("cpu_model"),
+        "cpu_count": header.get("cpu_count"),
+        "platform": header.get("platform"),
+        "python": f"{header.get('python_implementation')} {header.get('python')}",
+    }
+
+
+def setup_differences(baseline: Dict[str, Any],
+                      candidate: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """
+    (machine differences, timing-setup differences) between two run headers,
+    each as "name: baseline -> candidate" lines. Fields missing on either
+    side are not compared.
+    """
+    def diff(a: Dict[str, Any], b: Dict[str, Any], keys) -> List[str]:
+        return [f"{k}: {a.get(k)} -> {b.get(k)}" for k in keys
+                if k in a and k in b and a[k] is not None and b[k] is not None and a[k] != b[k]]
+
+    base_machine, cand_machine = _machine(baseline), _machine(candidate)
+    base_flags, cand_flags = baseline.get("flags") or {}, candidate.get("flags") or {}
+    return diff(base_machine, cand_machine, base_machine), diff(base_flags, cand_flags, TIMING_FLAGS)
+
+
+def render_comparison(title: str, rows: List[Dict[str, Any]], threshold: float) -> str:
+    line = f"SolverBench Compare — {title}\n{'-'*54}\n"
+    if not rows:
+        return line + "Nothing to compare.\n"
+    for row in rows:
+        if row["ratio"] is None:
+            line += f"  {row['label']}: n/a (no case timed on both sides)\n"
+            continue
+        lo, hi = row["ci"]
+        marker = "✗ REGRESSION" if row["regression"] else row["verdict"]
+        line += (
+            f"  {row['label']}: {row['ratio']:.3f}x  "
+            f"({row['baseline_ms']:.3f} -> {row['candidate_ms']:.3f} ms, {row['n_pairs']} paired cases, "
+            f"{row['runs'][0]}+{row['runs'][1]} runs)   "
+            f"{row['confidence']*100:.0f}% CI [{lo:.3f}, {hi:.3f}]   p={row['p_value']:.2g}   {marker}\n"
+        )
+    if any(row["runs"] == (1, 1) for row in rows):
+        line += ("  (one run per side: the CI leaves out run-to-run variation; "
+                 "compare several interleaved runs with --runs)\n")
+    regressions = sum(row["regression"] for row in rows)
+    if regressions:
+        line += f"✗ {regressions} regression(s) beyond {threshold*100:.0f}%\n"
+    else:
+        line += f"✓ no regression beyond {threshold*100:.0f}%\n"
+    return line
@@ -0,0 +1,199 @@
+"""
+SolverBench Dataset Store
+-------------------------
+Persists generated datasets so every run can see byte-identical inputs.
+
+A stored dataset is a directory under results/datasets/ holding:
+    meta.json  - puzzle, generator params, seed, case count, record size,
+                 SHA-256 digest of cases.bin
+    cases.bin  - fixed-size binary records, one per (case, reference) pair,
+                 packed by the puzzle's registered codec
+
+cases.bin is memory-mapped on load and records are decoded on access, so
+opening a large dataset costs nothing up front. Datasets are named
+explicitly (--dataset NAME) or by dataset_id(puzzle, params, seed).
+"""
+
+import hashlib
+import inspect
+import json
+import mmap
+import os
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Optional
+
+from core import results_dir
+from core.registry import get_codec
+
+FORMAT_VERSION = 1
+DATASET_DIR = os.environ.get("SOLVERBENCH_DATASET_DIR", results_dir("datasets"))
+
+
+def dataset_id(puzzle: str, params: Dict[str, Any], seed: Optional[int]) -> str:
+    """Stable name for a (puzzle, generator params, seed) combination."""
+    key = json.dumps({"puzzle": puzzle, "params": params, "seed": seed}, sort_keys=True)
+    return f"{puzzle}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+
+
+class _Records(Sequence):
+    """Lazily decoded view over a memory-mapped record file."""
+
+    def __init__(self, buf, count: int, size: int, decode: Callable, part: int):
+        self._buf, self._count, self._size = buf, count, size
+        self._decode, self._part = decode, part
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("dataset index out of range")
+        start = i * self._size
+        return self._decode(self._buf[start:start + self._size])[self._part]
+
+
+class StoredDataset:
+    """
+    An opened dataset: .cases and .references are lazy sequences over the
+    memory-mapped records, valid until close(). Use as a context manager.
+    """
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        with open(os.path.join(path, "meta.json")) as fh:
+            self.meta = json.load(fh)
+        if self.meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Dataset '{name}' has an unsupported format version.")
+        codec = get_codec(self.meta["puzzle"])
+        if codec is None:
+            raise ValueError(f"Puzzle '{self.meta['puzzle']}' has no registered codec.")
+
+        params, size, count = self.meta["params"], self.meta["record_size"], self.meta["count"]
+        self._file = open(os.path.join(path, "cases.bin"), "rb")
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if count else b""
+
+        def decode(record):
+            return codec.decode(record, params)
+
+        self.cases = _Records(self._buf, count, size, decode, 0)
+        self.references = _Records(self._buf, count, size, decode, 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._buf = b""
+        self._file.close()
+
+
+def dataset_path(name: str) -> str:
+    return os.path.join(DATASET_DIR, name)
+
+
+def exists(name: str) -> bool:
+    return os.path.exists(os.path.join(dataset_path(name), "meta.json"))
+
+
+def save_dataset(name: str, puzzle: str, params: Dict[str, Any], seed: Optional[int],
+                 pairs) -> str:
+    """Encode and write an iterable of (case, reference) pairs; returns the directory."""
+    codec = get_codec(puzzle)
+    if codec is None:
+        raise ValueError(f"Puzzle '{puzzle}' has no registered codec.")
+    size = codec.record_size(params)
+    path = dataset_path(name)
+    os.makedirs(path, exist_ok=True)
+
+    count = 0
+    digest = hashlib.sha256()
+    tmp = os.path.join(path, f"cases.bin.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        for case, ref in pairs:
+            record = codec.encode(case, ref, params)
+            if len(record) != size:
+                raise ValueError(f"Codec produced {len(record)} bytes, expected {size}.")
+            fh.write(record)
+            digest.update(record)
+            count += 1
+    os.replace(tmp, os.path.join(path, "cases.bin"))
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "puzzle": puzzle,
+        "params": params,
+        "seed": seed,
+        "count": count,
+        "record_size": size,
+        "digest": digest.hexdigest(),
+    }
+    tmp = os.path.join(path, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(path, "meta.json"))  # the dataset exists once this lands
+    return path
+
+
+def load_dataset(name: str) -> StoredDataset:
+    if not exists(name):
+        raise FileNotFoundError(f"No stored dataset named '{name}'.")
+    return StoredDataset(name, dataset_path(name))
+
+
+def dataset_digest(name: str) -> str:
+    """SHA-256 of a stored dataset's records (hashed now for datasets saved without one)."""
+    with open(os.path.join(dataset_path(name), "meta.json")) as fh:
+        digest = json.load(fh).get("digest")
+    if digest:
+        return digest
+    h = hashlib.sha256()
+    with open(os.path.join(dataset_path(name), "cases.bin"), "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_or_generate(puzzle: str, generate: Callable, params: Dict[str, Any],
+                     seed: Optional[int], name: Optional[str] = None) -> StoredDataset:
+    """
+    Open a stored dataset, generating and storing it on a miss; the caller
+    closes it (see StoredDataset).
+
+    ``generate`` is the puzzle's generate_dataset; it receives ``params`` as
+    keyword arguments plus ``seed`` when one is given, and is asked to stream
+    when it supports that, so cases go to disk without piling up in memory.
+    A named dataset that already exists is loaded as-is and must match the
+    requested params/seed.
+    """
+    name = name or dataset_id(puzzle, params, seed)
+    if not exists(name):
+        kwargs = dict(params)
+        if seed is not None:
+            kwargs["seed"] = seed
+        if "stream" in inspect.signature(generate).parameters:
+            pairs = generate(**kwargs, stream=True)
+        else:
+            pairs = zip(*generate(**kwargs))
+        save_dataset(name, puzzle, params, seed, pairs)
+
+    stored = load_dataset(name)
+    meta = stored.meta
+    if meta["puzzle"] != puzzle:
+        stored.close()
+        raise ValueError(f"Dataset '{name}' is a {meta['puzzle']} dataset, not {puzzle}.")
+    if (params and meta["params"] != params) or (seed is not None and meta["seed"] != seed):
+        stored.close()
+        raise ValueError(
+            f"Dataset '{name}' was generated with params={meta['params']} seed={meta['seed']}; "
+            f"pick another name or drop the conflicting options."
+        )
+    return stored
@@ -0,0 +1,420 @@
+"""
+SolverBench Distributed Runs
+----------------------------
+Spreads a benchmark over several machines: one coordinator, any number of
+workers.
+
+The coordinator cuts the (case, reference) stream into chunks and hands
+out (solver, chunk) jobs; each worker runs a job with the ordinary runner
+(iter_batch, so --workers, --timeout-ms and batch entry points work as
+they do locally) and sends the results back. Messages are pickled dicts
+over multiprocessing.connection, on TCP ("host:port") or a Unix socket
+(a path), authenticated with a shared key:
+
+    worker -> coordinator   {"type": "hello", "host": fingerprint}
+                            {"type": "heartbeat"}
+                            {"type": "result", "job": id, "results": [...]}
+                            {"type": "error", "job": id, "error": message}
+    coordinator -> worker   {"type": "job", "job": id, "puzzle", "solver",
+                             "start", "pairs", "options"}
+                            {"type": "stop"}
+
+Workers send a heartbeat every HEARTBEAT_INTERVAL seconds, also while a
+job runs. A worker that disconnects or stays silent for HEARTBEAT_TIMEOUT
+seconds is dropped and its job is queued again for someone else; so is a
+job that raised on a worker, which keeps serving. A job that failed
+MAX_ATTEMPTS times is given up, and its cases are reported as "crashed"
+with the last error. Results are merged into one stream in the same order as a local run, and every
+result carries the fingerprint of the host that timed it under "host", so
+timings from different machines can always be told apart.
+
+Messages are pickles, so whoever holds the key can run code on the
+coordinator and the workers. There is no built-in key: a coordinator or
+worker on a non-loopback address refuses to start unless a key is given
+(--authkey, or better SOLVERBENCH_AUTHKEY, which stays out of the process
+list). On loopback and Unix sockets without one, both sides use a random
+per-user key kept in LOCAL_KEY_PATH (mode 0600).
+"""
+
+import importlib
+import ipaddress
+import itertools
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, wait
+from typing import Any, Dict, Iterator, Optional
+
+from core.environment import host_fingerprint
+from core.registry import autoload_internal_solvers, get_solver, import_extra_modules
+
+DEFAULT_ADDRESS = "127.0.0.1:7878"
+HEARTBEAT_INTERVAL = 2.0
+HEARTBEAT_TIMEOUT = 10.0
+MAX_ATTEMPTS = 3
+_POLL = 0.5
+
+
+LOCAL_KEY_PATH = os.path.join(os.path.expanduser("~"), ".cache", "solverbench", "authkey")
+
+
+def is_local(address) -> bool:
+    """True for Unix sockets and loopback TCP addresses."""
+    if not isinstance(address, tuple):
+        return True
+    host = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _local_key() -> bytes:
+    """This user's private key for same-machine runs, created on first use."""
+    try:
+        with open(LOCAL_KEY_PATH, "rb") as fh:
+            return fh.read()
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(LOCAL_KEY_PATH), mode=0o700, exist_ok=True)
+    key = secrets.token_hex(32).encode()
+    try:
+        fd = os.open(LOCAL_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # another process won the race
+        return _local_key()
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(key)
+    return key
+
+
+def resolve_authkey(address, authkey: Optional[bytes] = None) -> bytes:
+    """
+    The key to use on ``address``: ``authkey``, else $SOLVERBENCH_AUTHKEY,
+    else (loopback and Unix sockets only) the per-user local key. Raises
+    ValueError for a non-loopback address without an explicit key.
+    """
+    authkey = authkey or os.environ.get("SOLVERBENCH_AUTHKEY", "").encode()
+    if authkey:
+        return authkey
+    if not is_local(address):
+        raise ValueError(
+            f"{format_address(address)} is not a loopback address; set a private key with "
+            f"SOLVERBENCH_AUTHKEY (or --authkey) on the coordinator and every worker."
+        )
+    return _local_key()
+
+
+def parse_address(text: str):
+    """"host:port" -> (host, port) for TCP; anything else is a Unix socket path."""
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit() and "/" not in text:
+        return host or "127.0.0.1", int(port)
+    return text
+
+
+def format_address(address) -> str:
+    return f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+
+
+# ----------------------------------------------------------------------
+# Coordinator
+# ----------------------------------------------------------------------
+class _Remote:
+    """One connected worker as seen by the coordinator."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.host = None  # fingerprint, once it said hello
+        self.slot = None
+        self.job = None
+        self.last_seen = time.monotonic()
+
+    @property
+    def name(self) -> str:
+        return self.host["hostname"] if self.host else "unknown"
+
+
+class Coordinator:
+    """
+    Listens for workers and runs job streams on them.
+
+    Use as a context manager; run() can be called more than once while the
+    same workers stay connected.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey: Optional[bytes] = None,
+                 heartbeat_timeout: float = HEARTBEAT_TIMEOUT):
+        if isinstance(address, str):
+            address = parse_address(address)
+        self.listener = Listener(address, authkey=resolve_authkey(address, authkey))
+        self.address = self.listener.address
+        self.heartbeat_timeout = heartbeat_timeout
+        self.workers: Dict[Any, _Remote] = {}
+        self.hosts: Dict[str, Dict[str, Any]] = {}  # fingerprint id -> fingerprint
+        self._incoming: "queue.Queue" = queue.Queue()
+        self._closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                self._incoming.put(self.listener.accept())
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed:
+                    return  # listener closed
+                # failed handshake (wrong key, port scan, ...): keep listening
+
+    def _drop(self, worker: _Remote, reason: str):
+        """Disconnect a worker; returns the (slot, job) it was running, if any."""
+        del self.workers[worker.conn]
+        worker.conn.close()
+        if worker.job is None:
+            print(f"[SolverBench] Worker on {worker.name} {reason}.")
+            return None
+        return worker.slot, worker.job
+
+    def run(self, puzzle: str, solver_names, pairs, chunk_size: int = 64,
+            measure_memory=False, timeout_ms: Optional[float] = None,
+            **timing) -> Iterator[Dict[str, Any]]:
+        """
+        Run every solver on a stream of (case, reference) pairs on the
+        connected workers (waiting for at least one), yielding results in
+        the same order as iter_batch. Extra keyword arguments are passed to
+        iter_batch on the workers.
+
+        Raises ValueError right away, before any job goes out, if a solver
+        is not registered here.
+        """
+        for solver_name in solver_names:
+            get_solver(puzzle, solver_name)
+        options = dict(measure_memory=measure_memory, timeout_ms=timeout_ms, **timing)
+        return self._run(puzzle, solver_names, pairs, chunk_size, options)
+
+    def _run(self, puzzle: str, solver_names, pairs, chunk_size: int, options: Dict[str, Any]):
+        jobs = enumerate(_iter_chunk_jobs(puzzle, solver_names, pairs, chunk_size, options))
+        pending = deque()  # (slot, job) taken back from lost or failing workers
+        finished = {}  # slot -> results, held until every earlier slot is yielded
+        attempts = {}  # slot -> failed attempts so far
+
+        def retry(taken, reason: str):
+            if taken is None:
+                return
+            slot, job = taken
+            attempts[slot] = attempts.get(slot, 0) + 1
+            what = f"{job['solver']} cases {job['start']}+"
+            if attempts[slot] < MAX_ATTEMPTS:
+                pending.appendleft(taken)
+                print(f"[SolverBench] {reason}; re-queued {what}.")
+            else:
+                finished[slot] = _failed_results(job, reason)
+                print(f"[SolverBench] {reason}; giving up on {what} after {MAX_ATTEMPTS} attempts.")
+
+        next_slot = 0
+        exhausted = False
+        announced_wait = False
+        print(f"[SolverBench] Coordinator on {format_address(self.address)}: running "
+              f"{len(solver_names)} solver(s) on puzzle '{puzzle}' in chunks of {chunk_size}...")
+
+        while True:
+            while not self._incoming.empty():
+                conn = self._incoming.get()
+                self.workers[conn] = _Remote(conn)
+
+            for w in list(self.workers.values()):
+                if w.host is None or w.job is not None:
+                    continue
+                if pending:
+                    slot, job = pending.popleft()
+                elif not exhausted and len(finished) < max(16, 4 * len(self.workers)):
+                    nxt = next(jobs, None)
+                    if nxt is None:
+                        exhausted = True
+                        continue
+                    slot, job = nxt
+                else:
+                    continue
+                w.slot, w.job = slot, job
+                try:
+                    w.conn.send({"type": "job", "job": slot, **job})
+                except OSError:
+                    retry(self._drop(w, "disconnected"), f"Worker on {w.name} disconnected")
+            if exhausted and not pending and all(w.job is None for w in self.workers.values()):
+                break
+
+            if not self.workers:
+                if not announced_wait:
+                    print(f"[SolverBench] Waiting for workers on {format_address(self.address)}...")
+                    announced_wait = True
+                time.sleep(_POLL)
+                continue
+
+            ready = wait(list(self.workers), _POLL)
+            now = time.monotonic()
+            for conn in ready:
+                w = self.workers[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    retry(self._drop(w, "disconnected"), f"Worker on {w.name} disconnected")
+                    continue
+                w.last_seen = now
+                if message["type"] == "hello":
+                    w.host = message["host"]
+                    self.hosts[w.host["id"]] = w.host
+                    print(f"[SolverBench] Worker joined from {w.name} "
+                          f"(host {w.host['id']}, {w.host['cpu_model']}).")
+                elif message["type"] == "result" and message["job"] == w.slot:
+                    finished[w.slot] = message["results"]
+                    w.slot = w.job = None
+                elif message["type"] == "error" and message["job"] == w.slot:
+                    taken = w.slot, w.job
+                    w.slot = w.job = None
+                    retry(taken, f"Job failed on {w.name}: {message['error'].rstrip('.')}")
+            for w in list(self.workers.values()):
+                if now - w.last_seen > self.heartbeat_timeout:
+                    reason = f"silent for {self.heartbeat_timeout:g} s"
+                    retry(self._drop(w, reason), f"Worker on {w.name} {reason}")
+
+            while next_slot in finished:
+                yield from finished.pop(next_slot)
+                next_slot += 1
+
+        while next_slot in finished:  # the last results arrived just before the loop ended
+            yield from finished.pop(next_slot)
+            next_slot += 1
+
+    def close(self):
+        """Tell every worker to stop, then stop listening."""
+        self._closed = True
+        for w in list(self.workers.values()):
+            try:
+                w.conn.send({"type": "stop"})
+            except OSError:
+                pass
+            w.conn.close()
+        self.workers.clear()
+        self.listener.close()
+
+
+def _failed_results(job: Dict[str, Any], error: str):
+    """Results for every case of a job that no worker could finish."""
+    return [
+        {"puzzle": job["puzzle"], "solver": job["solver"], "success": False,
+         "status": "crashed", "error": error, "time_ms": None, "mem_peak": None,
+         "accuracy": None, "output": None, "case_index": job["start"] + k}
+        for k in range(len(job["pairs"]))
+    ]
+
+
+def _iter_chunk_jobs(puzzle: str, solver_names, pairs, chunk_size: int, options: Dict[str, Any]):
+    """(solver, chunk) jobs, chunk by chunk, each chunk solver-major."""
+    pairs = iter(pairs)
+    start = 0
+    while True:
+        chunk = list(itertools.islice(pairs, chunk_size))
+        if not chunk:
+            return
+        for solver_name in solver_names:
+            yield {"puzzle": puzzle, "solver": solver_name, "start": start,
+                   "pairs": chunk, "options": options}
+        start += len(chunk)
+
+
+# ----------------------------------------------------------------------
+# Worker
+# ----------------------------------------------------------------------
+def _connect(address, authkey: bytes, connect_timeout: float):
+    """Connect, retrying while the coordinator is not up yet."""
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(_POLL)
+
+
+def run_worker(address=DEFAULT_ADDRESS, authkey: Optional[bytes] = None, workers: int = 1,
+               extra_modules=None, connect_timeout: float = 30.0,
+               heartbeat_interval: float = HEARTBEAT_INTERVAL) -> int:
+    """
+    Serve jobs from a coordinator until it says stop or goes away.
+
+    ``workers`` local processes run each job (see iter_batch). Returns the
+    number of jobs completed.
+    """
+    from core.runner import iter_batch
+
+    if isinstance(address, str):
+        address = parse_address(address)
+    conn = _connect(address, resolve_authkey(address, authkey), connect_timeout)
+    host = host_fingerprint()
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def send(message):
+        with lock:
+            conn.send(message)
+
+    def beat():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send({"type": "heartbeat"})
+            except OSError:
+                return
+
+    autoload_internal_solvers()
+    import_extra_modules(extra_modules, quiet=True)
+    send({"type": "hello", "host": host})
+    print(f"[SolverBench] Worker {host['id']} connected to {format_address(address)}.")
+    threading.Thread(target=beat, daemon=True).start()
+    done = 0
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message["type"] == "stop":
+                break
+            puzzle, start = message["puzzle"], message["start"]
+            try:
+                importlib.import_module(f"puzzles.{puzzle}")
+            except ModuleNotFoundError:
+                pass
+            try:
+                results = list(iter_batch(puzzle, [message["solver"]], message["pairs"],
+                                          workers=workers, extra_modules=extra_modules,
+                                          chunk_size=max(1, len(message["pairs"])),
+                                          **message["options"]))
+            except Exception as e:  # report it and keep serving other jobs
+                print(f"[ERROR] Job {message['job']} ({message['solver']}) failed: {e}")
+                reply = {"type": "error", "job": message["job"],
+                         "error": f"{type(e).__name__}: {e}"}
+            else:
+                for result in results:
+                    result["case_index"] += start
+                    result["host"] = host
+                reply = {"type": "result", "job": message["job"], "results": results}
+                done += 1
+            try:
+                send(reply)
+            except OSError:
+                break
+    finally:
+        stopped.set()
+        conn.close()
+    return done
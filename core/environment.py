@@ -0,0 +1,146 @@
+"""
+SolverBench Environment
+-----------------------
+Describes the machine and code a benchmark run was made with.
+
+run_header() returns the dict written at the start of every stored run:
+a run id, timestamp, git commit, Python version, CPU model, dataset id,
+the flags the run was started with, the host fingerprint and the state of
+the machine when the run started, so results from different days and
+machines can be told apart later.
+"""
+
+import datetime
+import hashlib
+import os
+import platform
+import socket
+import subprocess
+import sys
+import uuid
+from typing import Any, Dict, Optional
+
+from core import REPO_ROOT
+
+
+def git_commit() -> Optional[str]:
+    """HEAD commit of the SolverBench checkout, with "-dirty" if it has local edits."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True,
+            timeout=5, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def cpu_model() -> str:
+    """Human-readable CPU model, best effort per platform."""
+    try:
+        with open("/proc/cpuinfo") as fh:
+            for line in fh:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    if sys.platform == "darwin":
+        try:
+            return subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.brand_string"], capture_output=True, text=True,
+                timeout=5, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return platform.processor() or platform.machine()
+
+
+def cpu_freq_mhz(cpu: Optional[int] = None) -> Optional[float]:
+    """Current clock of one CPU (default: the first) in MHz, or None where unknown."""
+    cpu = cpu or 0
+    try:
+        with open(f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq") as fh:
+            return int(fh.read()) / 1000
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/cpuinfo") as fh:
+            current = None
+            for line in fh:
+                if line.startswith("processor"):
+                    current = int(line.split(":", 1)[1])
+                elif line.startswith("cpu MHz") and current == cpu:
+                    return float(line.split(":", 1)[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def load_average() -> Optional[float]:
+    """One-minute load average, or None where the platform has none."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+def _read_sysfs(path: str) -> Optional[str]:
+    try:
+        with open(path) as fh:
+            return fh.read().strip()
+    except OSError:
+        return None
+
+
+def host_fingerprint(commit: Optional[str] = None) -> Dict[str, Any]:
+    """What timings on this machine depend on, plus a short id hashed from it."""
+    info = {
+        "hostname": socket.gethostname(),
+        "cpu_model": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "git_commit": commit or git_commit(),
+    }
+    digest = hashlib.sha256(repr(sorted(info.items())).encode()).hexdigest()
+    return {"id": digest[:12], **info}
+
+
+def machine_state() -> Dict[str, Any]:
+    """Readings that change from run to run: load, clock, governor, turbo, usable CPUs."""
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    no_turbo = _read_sysfs("/sys/devices/system/cpu/intel_pstate/no_turbo")
+    boost = _read_sysfs("/sys/devices/system/cpu/cpufreq/boost")
+    return {
+        "load_avg": load_average(),
+        "cpu_mhz": cpu_freq_mhz(cpus[0] if cpus else None),
+        "governor": _read_sysfs("/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"),
+        "turbo": (no_turbo == "0") if no_turbo is not None else (boost == "1" if boost is not None else None),
+        "usable_cpus": cpus,
+    }
+
+
+def run_header(puzzle: str, solvers, dataset_id: Optional[str] = None,
+               flags: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Metadata for a new run."""
+    commit = git_commit()
+    return {
+        "run_id": uuid.uuid4().hex,
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "puzzle": puzzle,
+        "solvers": list(solvers),
+        "dataset_id": dataset_id,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_model": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "flags": dict(flags or {}),
+        "host": host_fingerprint(commit),
+        "machine": machine_state(),
+    }
@@ -0,0 +1,245 @@
+"""
+SolverBench Exact Cover
+-----------------------
+Generic exact-cover engine (Knuth's Algorithm X with Dancing Links).
+
+The matrix is stored in flat integer arrays (left/right/up/down/column
+links per node) rather than one Python object per node, and the search is
+iterative, so it neither hits the recursion limit nor allocates while it
+runs. Usage:
+
+    ec = ExactCover(n_columns=4, rows=[[0, 1], [2, 3], [1, 2], [0], [3]])
+    ec.solve(limit=1)     -> [[0, 1]]         (row ids of each solution)
+    ec.count(limit=2)     -> number of solutions, stopping at the limit
+    ec.solve(given=[3])   -> solutions that include row 3
+
+The structure is restored after every call, so one matrix can be built
+once and queried many times with different ``given`` rows (e.g. the clues
+of different Sudoku puzzles).
+"""
+
+from typing import List, Optional, Sequence
+
+from core import metrics
+
+
+class ExactCover:
+    """
+    Dancing Links matrix over ``n_columns`` columns.
+
+    Columns ``0..n_primary-1`` are primary (must be covered exactly once);
+    any remaining columns are secondary (covered at most once).
+    """
+
+    def __init__(self, n_columns: int, rows: Sequence[Sequence[int]],
+                 n_primary: Optional[int] = None):
+        if n_primary is None:
+            n_primary = n_columns
+        self.n_columns = n_columns
+        self.n_rows = len(rows)
+
+        # node 0 is the root, nodes 1..n_columns are the column headers
+        n_nodes = 1 + n_columns + sum(len(r) for r in rows)
+        L = [0] * n_nodes
+        R = [0] * n_nodes
+        U = list(range(n_nodes))
+        D = list(range(n_nodes))
+        C = [0] * n_nodes
+        row_of = [-1] * n_nodes
+        S = [0] * (n_columns + 1)
+
+        for h in range(1, n_columns + 1):
+            C[h] = h
+            if h <= n_primary:
+                L[h], R[h] = h - 1, (h + 1 if h < n_primary else 0)
+            else:
+                L[h] = R[h] = h  # secondary headers stay out of the root ring
+        L[0], R[0] = (n_primary, 1) if n_primary else (0, 0)
+
+        self._row_start = []
+        node = n_columns + 1
+        for row_id, cols in enumerate(rows):
+            if not cols:
+                raise ValueError(f"Row {row_id} covers no columns.")
+            first = node
+            self._row_start.append(first)
+            for k, col in enumerate(cols):
+                if not 0 <= col < n_columns:
+                    raise ValueError(f"Row {row_id} has column {col} out of range.")
+                h = col + 1
+                C[node] = h
+                row_of[node] = row_id
+                # append at the bottom of column h
+                U[node], D[node] = U[h], h
+                D[U[h]] = node
+                U[h] = node
+                S[h] += 1
+                # link into the row ring
+                L[node] = node - 1 if k else first + len(cols) - 1
+                R[node] = node + 1 if k < len(cols) - 1 else first
+                node += 1
+
+        self._L, self._R, self._U, self._D, self._C, self._S = L, R, U, D, C, S
+        self._row_of = row_of
+
+    # ------------------------------------------------------------------
+    # Dancing links primitives
+    # ------------------------------------------------------------------
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self._L, self._R, self._U, self._D, self._C, self._S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def _select(self, r: int) -> None:
+        """Cover the columns of every node in r's row except r's own column."""
+        R, C = self._R, self._C
+        j = R[r]
+        while j != r:
+            self._cover(C[j])
+            j = R[j]
+
+    def _deselect(self, r: int) -> None:
+        L, C = self._L, self._C
+        j = L[r]
+        while j != r:
+            self._uncover(C[j])
+            j = L[j]
+
+    def _choose_column(self) -> int:
+        """Primary column with the fewest remaining rows (Knuth's S heuristic)."""
+        R, S = self._R, self._S
+        best, best_size = 0, None
+        c = R[0]
+        while c:
+            size = S[c]
+            if best_size is None or size < best_size:
+                best, best_size = c, size
+                if size <= 1:
+                    break
+            c = R[c]
+        return best
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _apply_given(self, given: Sequence[int]) -> Optional[List[int]]:
+        """Select the given rows up front. Returns their nodes, or None on conflict."""
+        C, R, U, D = self._C, self._R, self._U, self._D
+        applied = []
+        covered = set()  # column headers covered by the rows selected so far
+        for row_id in given:
+            r = self._row_start[row_id]
+            # The row clashes with an earlier one if it shares a column: then
+            # either that column is covered, or covering it unlinked the
+            # row's other nodes. Secondary headers are not in the root ring,
+            # so the header links alone cannot tell.
+            j = r
+            while True:
+                if C[j] in covered or U[D[j]] != j:
+                    self._unapply_given(applied)
+                    return None
+                j = R[j]
+                if j == r:
+                    break
+            self._cover(C[r])
+            self._select(r)
+            applied.append(r)
+            j = r
+            while True:
+                covered.add(C[j])
+                j = R[j]
+                if j == r:
+                    break
+        return applied
+
+    def _unapply_given(self, applied: List[int]) -> None:
+        for r in reversed(applied):
+            self._deselect(r)
+            self._uncover(self._C[r])
+
+    def _search(self, given: Sequence[int], limit: int, collect: bool):
+        """Run Algorithm X; returns (count, solutions). limit <= 0 means no limit."""
+        applied = self._apply_given(given)
+        if applied is None:
+            return 0, []
+
+        R, D, C, row_of = self._R, self._D, self._C, self._row_of
+        given_ids = list(given)
+        count, solutions = 0, []
+        stack = []  # selected row node per level; its column is covered
+        tried = 0  # rows tried during the search (an operation count)
+
+        if R[0] == 0:
+            count, solutions = 1, [given_ids] if collect else []
+            self._unapply_given(applied)
+            return count, solutions
+
+        c = self._choose_column()
+        self._cover(c)
+        r = D[c]
+        while True:
+            if r != c:
+                tried += 1
+                stack.append(r)
+                self._select(r)
+                if R[0] == 0:
+                    count += 1
+                    if collect:
+                        solutions.append(given_ids + [row_of[n] for n in stack])
+                    if 0 < limit <= count:
+                        break
+                else:
+                    c = self._choose_column()
+                    self._cover(c)
+                    r = D[c]
+                    continue
+            else:
+                # column exhausted: backtrack one level
+                self._uncover(c)
+                if not stack:
+                    break
+            r = stack.pop()
+            self._deselect(r)
+            c = C[r]
+            r = D[r]
+
+        # stopped early at the limit: unwind the remaining levels
+        while stack:
+            r = stack.pop()
+            self._deselect(r)
+            self._uncover(C[r])
+        self._unapply_given(applied)
+        if metrics.counting:
+            metrics.count("dlx_rows", tried)
+        return count, solutions
+
+    def solve(self, limit: int = 1, given: Sequence[int] = ()) -> List[List[int]]:
+        """Return up to ``limit`` solutions (lists of row ids); limit <= 0 returns all."""
+        return self._search(given, limit, collect=True)[1]
+
+    def count(self, limit: int = 0, given: Sequence[int] = ()) -> int:
+        """Count solutions, stopping once ``limit`` is reached (limit <= 0: count all)."""
+        return self._search(given, limit, collect=False)[0]
@@ -0,0 +1,165 @@
+"""
+SolverBench Stable Mode
+-----------------------
+Benchmark hygiene for --stable runs: keeps what happened before a case
+and elsewhere on the machine from leaking into its timing, and records
+what could not be kept out.
+
+- Each process is pinned to one CPU (os.sched_setaffinity), so the
+  scheduler cannot migrate it mid-case; parallel workers get one each.
+- gc.collect() runs before every case, so no case pays for garbage left
+  by the previous one; the collector can also be switched off during
+  each timed call (disable_gc).
+- Per case, the GC collections that ran while timing, the CPU clock and
+  the load average are recorded, and the case is flagged ("unstable")
+  when any of them suggests the timing was disturbed, or when some of its
+  repeated timings are slow outliers.
+- Across cases, a case whose median is far above the other cases of its
+  chunk (by the MAD of their medians) is marked "slow_case". That can be
+  a disturbance lasting a whole case, which leaves its samples consistent
+  with each other, but on a dataset of mixed difficulty it is usually
+  just a hard input, so it is reported as a hint to re-run and does not
+  mark the case unstable.
+"""
+
+import gc
+import itertools
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from core import stats
+from core.environment import cpu_freq_mhz, load_average
+
+# clock change within one case that counts as frequency drift
+FREQ_DRIFT = 0.10
+
+
+def usable_cpus() -> Optional[List[int]]:
+    """CPUs this process may run on, or None where affinity is unsupported (macOS, Windows)."""
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    return sorted(os.sched_getaffinity(0))
+
+
+def assign_cpus(n: int) -> List[Optional[int]]:
+    """
+    One CPU for each of ``n`` processes, from the highest usable CPU down
+    (CPU 0 tends to handle most interrupts), wrapping around if there are
+    more processes than CPUs.
+    """
+    cpus = usable_cpus()
+    if not cpus:
+        return [None] * n
+    cpus = cpus[::-1]
+    return [cpus[k % len(cpus)] for k in range(n)]
+
+
+def pin_to_cpu(cpu: Optional[int]) -> bool:
+    """Restrict this process to one CPU; False if that is not possible here."""
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return False
+    return True
+
+
+@contextmanager
+def pinned_to(cpu: Optional[int]):
+    """Pin this process to ``cpu`` for the block, then restore its affinity; yields whether it worked."""
+    before = usable_cpus()
+    pinned = pin_to_cpu(cpu)
+    try:
+        yield pinned
+    finally:
+        if pinned:
+            os.sched_setaffinity(0, before)
+
+
+def pinned_cpu() -> Optional[int]:
+    """The CPU this process is pinned to, or None if it may run on several."""
+    cpus = usable_cpus()
+    return cpus[0] if cpus and len(cpus) == 1 else None
+
+
+def _gc_collections() -> int:
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+
+class StableCase:
+    """
+    Conditions of one case in stable mode.
+
+    The runner calls enter() just before and exit() just after every timed
+    call (both outside the timed region), then fields(samples) for the
+    per-case fields to add to the result.
+    """
+
+    def __init__(self, disable_gc: bool = False):
+        self.disable_gc = disable_gc
+        self.collected = False
+        self.gc_collections = 0
+        self.cpu = pinned_cpu()
+        self.mhz_before = None
+        self._gc_was_enabled = True
+        self._collections = 0
+
+    def enter(self) -> None:
+        if not self.collected:
+            gc.collect()  # once per case, after any warm-up calls
+            self.collected = True
+            self.mhz_before = cpu_freq_mhz(self.cpu)
+        self._gc_was_enabled = gc.isenabled()
+        if self.disable_gc:
+            gc.disable()
+        self._collections = _gc_collections()
+
+    def exit(self) -> None:
+        self.gc_collections += _gc_collections() - self._collections
+        if self.disable_gc and self._gc_was_enabled:
+            gc.enable()
+
+    def fields(self, samples) -> Dict[str, Any]:
+        mhz, load = cpu_freq_mhz(self.cpu), load_average()
+        outliers = stats.slow_outliers(samples)
+        unstable = []
+        if self.gc_collections:
+            unstable.append("gc")
+        if outliers:
+            unstable.append("outlier samples")
+        if mhz and self.mhz_before and abs(mhz - self.mhz_before) > FREQ_DRIFT * self.mhz_before:
+            unstable.append("cpu frequency")
+        if load is not None and load > (os.cpu_count() or 1):
+            unstable.append("load")
+        return {
+            "gc_collections": self.gc_collections,
+            "cpu": self.cpu,
+            "cpu_mhz": mhz,
+            "load_avg": round(load, 2) if load is not None else None,
+            "outlier_samples": len(outliers),
+            "unstable": unstable,
+        }
+
+
+def flag_outlier_cases(results, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Pass stable-mode results through, setting "slow_case" on each: True
+    when the case's median is a slow outlier among the timed cases of its
+    chunk for the same solver (stats.slow_outliers over the per-case
+    medians). This is a hint, kept apart from the "unstable" flags, which
+    only judge a case by its own samples. Results must arrive chunk by
+    chunk, each chunk solver-major, as iter_batch yields them.
+    """
+    def block(result):
+        return result["solver"], result["case_index"] // chunk_size
+
+    for _, group in itertools.groupby(results, key=block):
+        group = list(group)
+        timed = [r for r in group if r.get("unstable") is not None and r["time_ms"] is not None]
+        for r in timed:
+            r["slow_case"] = False
+        for i in stats.slow_outliers([r["time_ms"] for r in timed]):
+            timed[i]["slow_case"] = True
+        yield from group
@@ -0,0 +1,153 @@
+"""
+SolverBench Interactive Mode
+----------------------------
+Plays session-based puzzles (e.g. Mastermind) against an asynchronous
+oracle, many games at once on one event loop.
+
+Solvers are ``async def`` and await every move. Each case is turned into
+an async session by the puzzle's ``async_session`` hook (see
+register_puzzle), whose oracle answers after a simulated round trip. Up
+to ``concurrency`` games are in flight together, so the benchmark
+measures throughput under I/O-bound conditions.
+
+Every game reports two times:
+    time_ms     solver CPU time: only the steps the game's coroutine
+                actually ran, not the time it spent waiting (None for
+                games that raised or timed out)
+    latency_ms  end-to-end wall time from the first move to the answer
+GameLoop.throughput() gives completed games per second for each solver;
+games that timed out or raised are counted separately (timed_out, failed).
+"""
+
+import asyncio
+import random
+import time
+import types
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.registry import get_async_session, get_solver, is_async_solver
+from core.results import apply_output_mode
+from core.runner import iter_chunks, input_protocol, validate_results
+
+
+@types.coroutine
+def cpu_timed(coro, clock: List[float]):
+    """
+    Await ``coro``, adding the time each of its steps runs to clock[0].
+
+    The event loop resumes a coroutine step by step; timing only the steps
+    leaves out every wait, including time other games ran in the meantime.
+    """
+    value, error = None, None
+    while True:
+        start = time.perf_counter()
+        try:
+            yielded = coro.send(value) if error is None else coro.throw(error)
+        except StopIteration as done:
+            clock[0] += time.perf_counter() - start
+            return done.value
+        clock[0] += time.perf_counter() - start
+        try:
+            value, error = (yield yielded), None
+        except BaseException as e:  # cancellation, timeouts: hand them to the game
+            value, error = None, e
+
+
+class GameLoop:
+    """
+    Runs async solvers over a stream of cases, ``concurrency`` games at a
+    time, against oracles with ``latency_ms`` (+ up to ``jitter_ms``)
+    round trips. ``seed`` makes the jitter reproducible.
+    """
+
+    def __init__(self, puzzle: str, concurrency: int = 1000, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, timeout_ms: Optional[float] = None,
+                 seed: Optional[int] = None):
+        self.puzzle = puzzle
+        self.concurrency = max(1, concurrency)
+        self.latency_ms, self.jitter_ms = latency_ms, jitter_ms
+        self.timeout_ms = timeout_ms
+        self.rng = random.Random(seed)
+        self.games: Dict[str, int] = {}  # completed games (status "ok")
+        self.timed_out: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.wall_s: Dict[str, float] = {}
+        self.make_session = get_async_session(puzzle)
+        if self.make_session is None:
+            raise ValueError(f"Puzzle '{puzzle}' has no async session; it cannot run interactively.")
+
+    def throughput(self, solver_name: str) -> float:
+        """Completed games per second; timed-out and failed games do not count."""
+        wall = self.wall_s.get(solver_name, 0.0)
+        return self.games.get(solver_name, 0) / wall if wall else 0.0
+
+    async def _play(self, solver: Callable, session, limit: asyncio.Semaphore) -> Dict[str, Any]:
+        async with limit:
+            clock = [0.0]
+            start = time.perf_counter()
+            try:
+                game = cpu_timed(solver(session), clock)
+                if self.timeout_ms:
+                    output = await asyncio.wait_for(game, self.timeout_ms / 1000)
+                else:
+                    output = await game
+                status = "ok"
+            except asyncio.TimeoutError:
+                output, status = None, "timed_out"
+            except Exception as e:
+                output, status = e, "error"
+            latency = (time.perf_counter() - start) * 1000
+        success = status == "ok"
+        return {
+            "success": success,
+            "status": status,
+            "error": f"{type(output).__name__}: {output}" if status == "error" else None,
+            "time_ms": round(clock[0] * 1000, 3) if success else None,
+            "latency_ms": round(latency, 3),
+            "oracle_calls": len(session.history),
+            "accuracy": None,
+            "output": output if success else None,
+        }
+
+    async def _play_chunk(self, solver: Callable, sessions) -> List[Dict[str, Any]]:
+        limit = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._play(solver, s, limit) for s in sessions))
+
+    def run(self, solver_names, pairs, chunk_size: int = 4096,
+            output_mode: str = "keep") -> Iterator[Dict[str, Any]]:
+        """
+        Play every solver over a stream of (case, reference) pairs, chunk by
+        chunk (at least ``concurrency`` cases per chunk so the loop stays
+        full), yielding results in the same order as iter_batch. Raises
+        ValueError up front if a solver is not ``async def``.
+        """
+        solvers = {}
+        for name in solver_names:
+            if not is_async_solver(self.puzzle, name):
+                raise ValueError(f"Solver '{name}' is not async; interactive mode needs async def solvers.")
+            solvers[name] = get_solver(self.puzzle, name)
+        return self._run(solvers, pairs, max(chunk_size, self.concurrency), output_mode)
+
+    def _run(self, solvers: Dict[str, Callable], pairs, chunk_size: int, output_mode: str):
+        thaw = input_protocol(self.puzzle)[1]
+        for name in solvers:
+            print(f"[SolverBench] Playing solver '{name}' on puzzle '{self.puzzle}' "
+                  f"({self.concurrency} concurrent games, oracle latency "
+                  f"{self.latency_ms:g} ms + up to {self.jitter_ms:g} ms jitter)...")
+
+        for start, chunk in iter_chunks(self.puzzle, pairs, chunk_size):
+            refs = [ref for _, ref in chunk]
+            for name, solver in solvers.items():
+                sessions = [self.make_session(thaw(case), self.latency_ms, self.jitter_ms, self.rng)
+                            for case, _ in chunk]
+                began = time.perf_counter()
+                outcomes = asyncio.run(self._play_chunk(solver, sessions))
+                self.wall_s[name] = self.wall_s.get(name, 0.0) + time.perf_counter() - began
+                for outcome in outcomes:
+                    tally = {"ok": self.games, "timed_out": self.timed_out}.get(
+                        outcome["status"], self.failed)
+                    tally[name] = tally.get(name, 0) + 1
+                results = [{"puzzle": self.puzzle, "solver": name, **outcome, "case_index": start + k}
+                           for k, outcome in enumerate(outcomes)]
+                validate_results(self.puzzle, results, refs)
+                yield from (apply_output_mode(r, output_mode) for r in results)
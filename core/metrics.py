@@ -6,9 +6,16 @@ Provides accuracy and comparison utilities for solver outputs.
 Currently supports:
 - direct equality comparison
 - numeric tolerance comparison (for floats, vectors, etc.)
+- grouped per-solver summaries with robust timing statistics
+- operation counters (steps, backtracks, feedback calls) for solvers and
+  puzzle primitives
 """
-from statistics import mean
-from typing import Any, Union
+from array import array
+from contextlib import contextmanager
+from statistics import mean, median
+from typing import Any, Dict, Union
+
+from core import stats
 
 def compute_accuracy(output: Any, reference: Any, tolerance: float = 1e-9) -> Union[float, None]:
     """
@@ -41,34 +48,239 @@ def compute_accuracy(output: Any, reference: Any, tolerance: float = 1e-9) -> Un
     return None
 
 
-def summarize_results(results: list[dict]) -> str:
+# ----------------------------------------------------------------------
+# Operation counters
+# ----------------------------------------------------------------------
+# Counting is off except during the runner's dedicated counting pass.
+# Hot primitives guard with the module flag, so the disabled cost is a
+# single attribute check:
+#
+#     if metrics.counting:
+#         metrics.count("is_valid")
+#
+# Solvers can instead hold a named counter and call .inc() on it.
+counting = False
+_counts: Dict[str, int] = {}
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a counter (call only when ``counting`` is on)."""
+    _counts[name] = _counts.get(name, 0) + n
+
+
+class OpCounter:
+    """Named counter handed out by counter(); inc() is a no-op when counting is off."""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def inc(self, n: int = 1) -> None:
+        if counting:
+            _counts[self.name] = _counts.get(self.name, 0) + n
+
+
+_op_counters: Dict[str, OpCounter] = {}
+
+
+def counter(name: str) -> OpCounter:
+    """Shared counter object for ``name``, e.g. counter("backtracks").inc()."""
+    if name not in _op_counters:
+        _op_counters[name] = OpCounter(name)
+    return _op_counters[name]
+
+
+@contextmanager
+def counting_operations():
+    """Turn counting on for the block; yields the dict that collects the counts."""
+    global counting, _counts
+    _counts = {}
+    counting = True
+    try:
+        yield _counts
+    finally:
+        counting = False
+
+
+class SolverSummary:
     """
-    Produce a readable grouped summary by solver.
+    Running totals for one solver's results.
+
+    Only what the report needs is kept (one float per case for timing), so
+    results can be streamed through without holding on to them.
     """
-    if not results:
-        return "No results."
 
-    # group by solver
-    grouped = {}
-    for r in results:
-        solver = r["solver"]
-        grouped.setdefault(solver, []).append(r)
+    def __init__(self, puzzle: str, solver: str):
+        self.puzzle, self.solver = puzzle, solver
+        self.cases = self.successes = self.timed_out = self.crashed = 0
+        self.acc_sum, self.acc_count = 0.0, 0
+        self.times = array("d")
+        self.latencies = array("d")
+        self.repeated, self.repeat_total, self.repeat_cv_total = 0, 0, 0.0
+        self.mem_peaks, self.mem_peak_total, self.mem_peak_max = 0, 0, 0
+        self.rss_peak, self.rss_delta = None, None
+        self.sites = {}
+        self.op_totals, self.op_cases = {}, 0
+        self.stable_cases, self.flagged, self.unstable = 0, 0, {}
+        self.slow_cases = 0
+        self.mhz_min = self.mhz_max = self.load_max = None
 
-    lines = []
-    for solver, group in grouped.items():
-        success_count = sum(1 for r in group if r["success"])
-        acc_values = [r["accuracy"] for r in group if r.get("accuracy") is not None]
-        time_values = [r["time_ms"] for r in group]
-        acc_avg = mean(acc_values) if acc_values else 0.0
+    def add(self, r: dict) -> None:
+        self.cases += 1
+        self.successes += bool(r["success"])
+        self.timed_out += r.get("status") == "timed_out"
+        self.crashed += r.get("status") == "crashed"
+        if r.get("accuracy") is not None:
+            self.acc_sum += r["accuracy"]
+            self.acc_count += 1
+        if r["success"] and r.get("time_ms") is not None:
+            self.times.append(r["time_ms"])
+        if r.get("latency_ms") is not None:
+            self.latencies.append(r["latency_ms"])
+        samples = (r.get("times_ms") or ()) if r["success"] else ()
+        if len(samples) > 1:
+            self.repeated += 1
+            self.repeat_total += len(samples)
+            self.repeat_cv_total += stats.cv(samples)
+        if r.get("mem_peak") is not None:
+            self.mem_peaks += 1
+            self.mem_peak_total += r["mem_peak"]
+            self.mem_peak_max = max(self.mem_peak_max, r["mem_peak"])
+        if r.get("rss_peak_kb") is not None:
+            self.rss_peak = max(self.rss_peak or 0, r["rss_peak_kb"])
+        if r.get("rss_delta_kb") is not None:
+            self.rss_delta = max(self.rss_delta or 0, r["rss_delta_kb"])
+        for trace, size, blocks in r.get("mem_top") or ():
+            total = self.sites.setdefault(trace, [0, 0])
+            total[0] += size
+            total[1] += blocks
+        if r.get("counts") is not None:
+            self.op_cases += 1
+            for name, n in r["counts"].items():
+                self.op_totals[name] = self.op_totals.get(name, 0) + n
+        if r.get("unstable") is not None:
+            self.stable_cases += 1
+            self.flagged += bool(r["unstable"])
+            for reason in r["unstable"]:
+                self.unstable[reason] = self.unstable.get(reason, 0) + 1
+            self.slow_cases += bool(r.get("slow_case"))
+            if r.get("cpu_mhz"):
+                self.mhz_min = min(self.mhz_min or r["cpu_mhz"], r["cpu_mhz"])
+                self.mhz_max = max(self.mhz_max or 0, r["cpu_mhz"])
+            if r.get("load_avg") is not None:
+                self.load_max = max(self.load_max or 0, r["load_avg"])
 
+    def render(self, top_n: int = 5) -> str:
+        times = self.times
         line = (
-            f"SolverBench Summary — {group[0]['puzzle']} / {solver} ({len(group)} cases)\n"
+            f"SolverBench Summary — {self.puzzle} / {self.solver} ({self.cases} cases)\n"
             f"{'-'*54}\n"
-            f"✓ {success_count} runs, {success_count/len(group)*100:.1f}% success\n"
-            f"⏱ avg time: {mean(time_values):.2f} ms   "
-            f"min: {min(time_values):.2f} ms   max: {max(time_values):.2f} ms\n"
-            f"🎯 avg accuracy: {acc_avg*100:.1f}%\n"
+            f"✓ {self.successes} runs, {self.successes/self.cases*100:.1f}% success\n"
         )
-        lines.append(line)
+        if self.timed_out or self.crashed:
+            line += f"⌛ {self.timed_out} timed out, {self.crashed} crashed\n"
+        if times:
+            ci_lo, ci_hi = stats.bootstrap_ci(times, median,
+                                              resamples=stats.bootstrap_resamples(len(times)))
+            line += (
+                f"⏱ avg time: {mean(times):.2f} ms   "
+                f"min: {min(times):.2f} ms   max: {max(times):.2f} ms\n"
+                f"  median: {median(times):.3f} ms   "
+                f"p90: {stats.percentile(times, 90):.3f} ms   "
+                f"p99: {stats.percentile(times, 99):.3f} ms   "
+                f"stddev: {stats.std(times):.3f} ms\n"
+                f"  95% CI (median): [{ci_lo:.3f}, {ci_hi:.3f}] ms\n"
+            )
+            if self.repeated:
+                line += (
+                    f"  repeats/case: {self.repeat_total/self.repeated:.1f}   "
+                    f"mean within-case CV: {self.repeat_cv_total/self.repeated*100:.1f}%\n"
+                )
+        else:
+            line += "⏱ avg time: n/a (no case succeeded)\n"
+        if self.latencies:
+            lat = self.latencies
+            line += (
+                f"🌐 end-to-end latency: median {median(lat):.1f} ms   "
+                f"p90: {stats.percentile(lat, 90):.1f} ms   "
+                f"p99: {stats.percentile(lat, 99):.1f} ms\n"
+            )
+        acc_avg = self.acc_sum / self.acc_count if self.acc_count else 0.0
+        line += f"🎯 avg accuracy: {acc_avg*100:.1f}%\n"
+        if self.op_cases:
+            ops = "   ".join(f"{name}: {n/self.op_cases:.1f}"
+                             for name, n in sorted(self.op_totals.items()))
+            line += f"🔢 ops/case: {ops or 'none counted'}\n"
+        if self.stable_cases:
+            line += self._stable_line()
+        line += self._memory_lines(top_n)
+        return line
+
+    def _stable_line(self) -> str:
+        """Stable-mode conditions: flagged cases, CPU clock range, peak load."""
+        if self.flagged:
+            reasons = ", ".join(f"{r}: {n}" for r, n in sorted(self.unstable.items()))
+            out = f"🧪 stable: {self.flagged} of {self.stable_cases} cases flagged ({reasons})"
+        else:
+            out = "🧪 stable: no case flagged"
+        if self.mhz_min is not None:
+            clock = f"{self.mhz_min:.0f}" if self.mhz_min == self.mhz_max else f"{self.mhz_min:.0f}–{self.mhz_max:.0f}"
+            out += f"   CPU {clock} MHz"
+        if self.load_max is not None:
+            out += f"   load ≤ {self.load_max:.2f}"
+        if self.slow_cases:
+            out += (f"\n  {self.slow_cases} case(s) far slower than the rest of their chunk "
+                    f"(hard inputs, or disturbed; re-run to tell)")
+        return out + "\n"
+
+    def _memory_lines(self, top_n: int) -> str:
+        """Memory lines (empty if memory wasn't measured)."""
+        out = ""
+        if self.mem_peaks:
+            out += (
+                f"💾 avg peak (tracemalloc): {self.mem_peak_total/self.mem_peaks/1024:.1f} KiB   "
+                f"max: {self.mem_peak_max/1024:.1f} KiB\n"
+            )
+        if self.rss_peak is not None or self.rss_delta is not None:
+            peak = f"{self.rss_peak/1024:.1f} MiB" if self.rss_peak is not None else "n/a"
+            growth = f"~{self.rss_delta} KiB" if self.rss_delta is not None else "n/a"
+            out += f"💾 peak RSS: {peak}   max growth in one case: {growth}\n"
+        if self.sites:
+            out += "  top allocation sites (live at return, avg per case):\n"
+            ranked = sorted(self.sites.items(), key=lambda kv: kv[1][0], reverse=True)[:top_n]
+            for trace, (size, count) in ranked:
+                out += f"    {size/self.cases/1024:8.1f} KiB  {count/self.cases:8.1f} blocks  {trace}\n"
+        return out
+
+
+class SummaryAccumulator:
+    """Collects results (e.g. from iter_batch) into per-solver summaries."""
+
+    def __init__(self):
+        self.solvers: dict[str, SolverSummary] = {}
+
+    def add(self, result: dict) -> None:
+        solver = result["solver"]
+        if solver not in self.solvers:
+            self.solvers[solver] = SolverSummary(result["puzzle"], solver)
+        self.solvers[solver].add(result)
 
-    return "\n".join(lines)
\ No newline at end of file
+    def render(self) -> str:
+        if not self.solvers:
+            return "No results."
+        return "\n".join(s.render() for s in self.solvers.values())
+
+
+def summarize_results(results) -> str:
+    """
+    Produce a readable grouped summary by solver.
+
+    Per-case times are the median of that case's repetitions; across cases
+    the summary reports median, p90/p99, stddev and a 95% bootstrap
+    confidence interval for the median. ``results`` may be any iterable,
+    including a generator from iter_batch.
+    """
+    summary = SummaryAccumulator()
+    for r in results:
+        summary.add(r)
+    return summary.render()
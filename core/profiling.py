@@ -0,0 +1,219 @@
+"""
+SolverBench Profiling
+---------------------
+Per-solver hot-spot profiles, gathered in their own untimed pass.
+
+Two modes:
+    cprofile  - deterministic: every case runs once under cProfile; the
+                per-case stats are merged per solver and written as a
+                .pstats file (open with pstats, snakeviz, ...)
+    sampling  - low overhead: a background thread samples the solver's
+                stack every SAMPLE_INTERVAL seconds; stacks are written in
+                collapsed form (.folded), ready for flamegraph.pl/speedscope
+
+Profiles are collected where the solver runs (including worker
+processes) and merged in the parent by ProfileCollector, which writes
+the files under results/profiles/ and prints the top functions.
+"""
+
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from core import results_dir
+
+PROFILE_MODES = ("cprofile", "sampling")
+PROFILE_DIR = results_dir("profiles")
+SAMPLE_INTERVAL = 0.0005
+# short cases are re-run (on fresh inputs) until sampled for this long
+SAMPLE_MIN_SECONDS = 0.02
+
+
+# ----------------------------------------------------------------------
+# Stack sampler
+# ----------------------------------------------------------------------
+class StackSampler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, root_code, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._root_code = root_code  # only frames called from here are recorded
+        self._target = None
+        self._thread = None
+        self._stopped = threading.Event()
+        self._switch_interval = None
+
+    def _collapse(self, frame) -> str:
+        """Collapsed stack below the root frame; empty if the root isn't on the stack."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            if code is self._root_code:
+                return ";".join(reversed(names))
+            names.append(f"{os.path.basename(code.co_filename)}:"
+                         f"{getattr(code, 'co_qualname', code.co_name)}")
+            frame = frame.f_back
+        return ""
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                stack = self._collapse(frame)
+                if stack:
+                    self.samples[stack] += 1
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        # let the sampler get the GIL about as often as it wants to sample
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stopped.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+
+# ----------------------------------------------------------------------
+# Profiling one case
+# ----------------------------------------------------------------------
+def _sampled_call(solver: Callable, case: Any) -> None:
+    """Root frame for the sampler: only what runs inside this is recorded."""
+    solver(case)
+
+
+def profile_call(mode: str, solver: Callable, fresh_input: Callable[[], Any]):
+    """
+    Profile the solver on one case; returns a picklable payload.
+
+    cprofile: the raw pstats dict of a single call. sampling: a Counter
+    of collapsed stacks, re-running the case until SAMPLE_MIN_SECONDS of
+    solver time was sampled.
+    """
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        case = fresh_input()
+        try:
+            profiler.runcall(solver, case)
+        except Exception:
+            pass
+        profiler.create_stats()
+        return profiler.stats
+    if mode == "sampling":
+        with StackSampler(_sampled_call.__code__) as sampler:
+            spent = 0.0
+            while spent < SAMPLE_MIN_SECONDS:
+                case = fresh_input()
+                start = time.perf_counter()
+                try:
+                    _sampled_call(solver, case)
+                except Exception:
+                    break
+                spent += time.perf_counter() - start
+        return sampler.samples
+    raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}.")
+
+
+# ----------------------------------------------------------------------
+# Aggregation and reports
+# ----------------------------------------------------------------------
+def _merge_pstats(into: Dict, stats: Dict) -> None:
+    for func, entry in stats.items():
+        if func in into:
+            into[func] = pstats.add_func_stats(into[func], entry)
+        else:
+            into[func] = entry
+
+
+def _describe(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+class ProfileCollector:
+    """Merges per-case profiles (result["profile"]) into one profile per solver."""
+
+    def __init__(self, puzzle: str, mode: str):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {PROFILE_MODES}.")
+        self.puzzle, self.mode = puzzle, mode
+        self.profiles: Dict[str, Any] = {}
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Take the profile out of a result (it is not meant to be stored)."""
+        payload = result.pop("profile", None)
+        if payload is None:
+            return
+        if self.mode == "cprofile":
+            _merge_pstats(self.profiles.setdefault(result["solver"], {}), payload)
+        else:
+            self.profiles.setdefault(result["solver"], Counter()).update(payload)
+
+    def write(self, directory: str = PROFILE_DIR) -> List[str]:
+        """Write one file per solver; returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for solver, profile in self.profiles.items():
+            base = os.path.join(directory, f"{self.puzzle}-{solver}")
+            if self.mode == "cprofile":
+                path = base + ".pstats"
+                with open(path, "wb") as fh:
+                    marshal.dump(profile, fh)
+            else:
+                path = base + ".folded"
+                with open(path, "w") as fh:
+                    for stack, n in sorted(profile.items()):
+                        fh.write(f"{stack} {n}\n")
+            paths.append(path)
+        return paths
+
+    def hot_spots(self, solver: str, top: int = 10) -> List[tuple]:
+        """
+        Top functions as (self share, inclusive share, name), by self time
+        (cprofile) or by samples where the function was on top (sampling).
+        """
+        profile = self.profiles.get(solver)
+        if not profile:
+            return []
+        if self.mode == "cprofile":
+            total = sum(entry[2] for entry in profile.values()) or 1.0
+            rows = [(tt / total, ct / total, _describe(func))
+                    for func, (cc, nc, tt, ct, callers) in profile.items()]
+        else:
+            total = sum(profile.values())
+            own, inclusive = Counter(), Counter()
+            for stack, n in profile.items():
+                frames = stack.split(";")
+                own[frames[-1]] += n
+                for name in set(frames):
+                    inclusive[name] += n
+            rows = [(own[name] / total, inclusive[name] / total, name) for name in inclusive]
+        rows.sort(reverse=True)
+        return rows[:top]
+
+    def render(self, solver: str, top: int = 10) -> str:
+        profile = self.profiles.get(solver)
+        if not profile:
+            return ""
+        unit = "s in profiled calls" if self.mode == "cprofile" else "samples"
+        size = (sum(entry[2] for entry in profile.values()) if self.mode == "cprofile"
+                else sum(profile.values()))
+        amount = f"{size:.3f}" if self.mode == "cprofile" else f"{size}"
+        line = f"🔥 hot spots — {solver} ({self.mode}, {amount} {unit})\n"
+        line += f"   {'self':>6}  {'incl':>6}  function\n"
+        for own, inclusive, name in self.hot_spots(solver, top):
+            line += f"   {own*100:5.1f}%  {inclusive*100:5.1f}%  {name}\n"
+        return line
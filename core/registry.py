@@ -17,18 +17,86 @@ Internally stores solvers as:
             "bfs": <function>,
         }
     }
+
+A solver may also provide a batch entry point, solve_batch(list_of_inputs)
+-> list_of_outputs, which the runner prefers when it is available:
+
+    @register_solver("sudoku", "propagation", batch=solve_propagation_batch)
+    def solve_propagation(board): ...
+
+Solvers can also be registered lazily, as (puzzle, name) -> module path,
+and are only imported when first asked for by get_solver(). The bundled
+example_solvers/ are discovered this way from a manifest built by scanning
+the source for @register_solver decorators (cached under results/cache/
+and refreshed per file when it changes), and installed packages can
+advertise solvers through the "solverbench.solvers" entry point group:
+
+    [project.entry-points."solverbench.solvers"]
+    "sudoku/fast" = "mypkg.fast_solver"            # module registers itself
+    "sudoku/other" = "mypkg.other:solve"           # or: register this callable
 """
 
-from typing import Callable, Dict
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core import REPO_ROOT, results_dir
 
 # main registry structure
 _registry: Dict[str, Dict[str, Callable]] = {}
+# optional batch entry points: puzzle -> solver name -> solve_batch
+_batch: Dict[str, Dict[str, Callable]] = {}
+# optional prepare hooks: puzzle -> solver name -> prepare(input)
+_prepare: Dict[str, Dict[str, Callable]] = {}
 _puzzles: dict[str, dict] = {}
+# lazy entries: puzzle -> solver name -> module path or entry point
+_lazy: Dict[str, Dict[str, object]] = {}
+# seconds spent importing solver modules, by module (see --startup-timing)
+import_times: Dict[str, float] = {}
+
+ENTRY_POINT_GROUP = "solverbench.solvers"
+MANIFEST_VERSION = 1
+MANIFEST_PATH = os.environ.get(
+    "SOLVERBENCH_MANIFEST", results_dir("cache", "solver_manifest.json")
+)
+
+def register_puzzle(name: str, accuracy_fn=None, codec=None, freeze=None, thaw=None,
+                    batch_accuracy_fn=None, async_session=None):
+    """
+    Register a puzzle type and its optional accuracy function.
+
+    ``batch_accuracy_fn(outputs, references) -> accuracies`` scores many
+    finished cases in one call; the runner uses it, when given, to check
+    a whole chunk of results at once.
+
+    ``codec`` packs cases into fixed-size binary records for the dataset
+    store; it provides record_size(params), encode(case, ref, params) -> bytes
+    and decode(record, params) -> (case, ref).
+
+    ``freeze``/``thaw`` are the puzzle's input protocol: freeze(case) returns
+    an immutable form (e.g. bytes) made once per case, and thaw(frozen)
+    cheaply builds a fresh, independent input from it for every solver call.
+    Without them the runner falls back to copy.deepcopy.
+
+    Interactive puzzles can give ``async_session(case, latency_ms=0.0,
+    jitter_ms=0.0, rng=None)``, which turns a (thawed) case into a session
+    whose moves are awaited (``await session.guess(code)``) against an
+    oracle with simulated round-trip latency. Solvers written as
+    ``async def`` are played through it.
+    """
+    if (freeze is None) != (thaw is None):
+        raise ValueError(f"Puzzle '{name}' must register both freeze and thaw, or neither.")
 
-def register_puzzle(name: str, accuracy_fn=None):
-    """Register a puzzle type and its optional accuracy function."""
     def decorator(cls_or_func):
-        _puzzles[name] = {"accuracy": accuracy_fn}
+        _puzzles[name] = {"accuracy": accuracy_fn, "codec": codec, "freeze": freeze, "thaw": thaw,
+                          "batch_accuracy": batch_accuracy_fn, "async_session": async_session}
         return cls_or_func
     return decorator
 
@@ -36,12 +104,46 @@ def get_accuracy_fn(puzzle: str):
     entry = _puzzles.get(puzzle, {})
     return entry.get("accuracy")
 
-def register_solver(puzzle: str, name: str):
+def get_batch_accuracy_fn(puzzle: str):
+    entry = _puzzles.get(puzzle, {})
+    return entry.get("batch_accuracy")
+
+def get_async_session(puzzle: str):
+    entry = _puzzles.get(puzzle, {})
+    return entry.get("async_session")
+
+def get_codec(puzzle: str):
+    entry = _puzzles.get(puzzle, {})
+    return entry.get("codec")
+
+def get_input_protocol(puzzle: str):
+    """(freeze, thaw) for a puzzle, or (None, None) if it has none."""
+    entry = _puzzles.get(puzzle, {})
+    return entry.get("freeze"), entry.get("thaw")
+
+def register_solver(puzzle: str, name: str, batch: Optional[Callable] = None,
+                    prepare: Optional[Callable] = None):
     """
     Decorator to register a solver function.
     Example:
         @register_solver("sudoku", "backtracking")
         def solve(board): ...
+
+    ``batch`` is an optional solve_batch(inputs) -> outputs that solves a
+    whole list of inputs in one call, so setup (lookup tables, vectorized
+    passes over many boards) is paid once per batch. An output may be an
+    exception instance to fail just that case. If solve_batch accepts a
+    ``charge`` keyword it is passed charge(index, ms), with which it can
+    attribute time spent on one case alone; the rest of the batch time is
+    split evenly over its cases.
+
+    ``prepare`` is an optional prepare(input) the runner calls once per
+    case, untimed, before warm-up. It builds whatever the solver caches
+    for inputs like this one (tables, decision trees loaded from disk), so
+    the first timed call does not pay for it.
+
+    Solvers of interactive puzzles may be ``async def``: they receive the
+    puzzle's async session and await its moves (see register_puzzle).
     """
     def decorator(func: Callable):
         if puzzle not in _registry:
@@ -49,28 +151,277 @@ def register_solver(puzzle: str, name: str):
         if name in _registry[puzzle]:
             raise ValueError(f"Solver '{name}' for puzzle '{puzzle}' already exists.")
         _registry[puzzle][name] = func
+        if batch is not None:
+            _batch.setdefault(puzzle, {})[name] = batch
+        if prepare is not None:
+            _prepare.setdefault(puzzle, {})[name] = prepare
+        _lazy.get(puzzle, {}).pop(name, None)  # imported directly before it was needed
         return func
     return decorator
 
 
+def register_lazy_solver(puzzle: str, name: str, source: str) -> None:
+    """
+    Register a solver without importing it. ``source`` is a module path
+    (the module registers the solver when imported) or "module:attr"
+    naming the solver callable itself, as in an entry point. Solvers that
+    are already registered are left alone.
+    """
+    if name in _registry.get(puzzle, {}):
+        return
+    _lazy.setdefault(puzzle, {})[name] = source
+
+
+def _load_source(puzzle: str, name: str, source: str) -> None:
+    """Import a lazy solver's module (registering the named callable if needed)."""
+    start = time.perf_counter()
+    module_name, _, attr = source.partition(":")
+    loaded = importlib.import_module(module_name.strip())
+    if attr and name not in _registry.get(puzzle, {}):
+        for part in attr.strip().split("."):
+            loaded = getattr(loaded, part)
+        register_solver(puzzle, name)(loaded)
+    import_times[source] = import_times.get(source, 0.0) + time.perf_counter() - start
+    if name not in _registry.get(puzzle, {}):
+        raise ValueError(f"Importing '{source}' did not register solver '{name}' for '{puzzle}'.")
+
+
+def _load_lazy(puzzle: str, name: str) -> None:
+    _load_source(puzzle, name, _lazy[puzzle].pop(name))
+
+
 def get_solver(puzzle: str, name: str) -> Callable:
-    """Retrieve a solver by puzzle and name."""
+    """Retrieve a solver by puzzle and name, importing it first if it is lazy."""
+    if name not in _registry.get(puzzle, {}) and name in _lazy.get(puzzle, {}):
+        _load_lazy(puzzle, name)
     try:
         return _registry[puzzle][name]
     except KeyError:
         raise ValueError(f"Solver '{name}' not found for puzzle '{puzzle}'.")
 
 
+def get_batch_solver(puzzle: str, name: str) -> Optional[Callable]:
+    """The solver's batch entry point, or None if it only solves one input at a time."""
+    get_solver(puzzle, name)
+    return _batch.get(puzzle, {}).get(name)
+
+
+def get_prepare(puzzle: str, name: str) -> Optional[Callable]:
+    """The solver's prepare hook, or None if it has nothing to set up."""
+    get_solver(puzzle, name)
+    return _prepare.get(puzzle, {}).get(name)
+
+
+def is_async_solver(puzzle: str, name: str) -> bool:
+    """True if the solver is a coroutine function (imports it if it is lazy)."""
+    return inspect.iscoroutinefunction(get_solver(puzzle, name))
+
+
+def _repo_imports(modules: list) -> list:
+    """
+    The given modules plus every module of this repository they import,
+    directly or indirectly: modules bound at module level (``import x``)
+    and the modules of objects imported from them (``from x import f``).
+    """
+    seen = {id(m): m for m in modules}
+    pending = list(modules)
+    while pending:
+        for value in list(vars(pending.pop()).values()):
+            dep = value if inspect.ismodule(value) else sys.modules.get(
+                getattr(value, "__module__", None) or "")
+            path = getattr(dep, "__file__", None) or ""
+            if (dep is not None and id(dep) not in seen
+                    and os.path.abspath(path).startswith(REPO_ROOT + os.sep)):
+                seen[id(dep)] = dep
+                pending.append(dep)
+    return list(seen.values())
+
+
+def solver_source_hash(puzzle: str, name: str) -> str:
+    """
+    Hash of the code a solver's results depend on: the source files of the
+    modules its entry points were registered from, the puzzle module and
+    the runner, plus every module of this repository those import (so
+    editing e.g. core/exact_cover.py invalidates the dlx results). A
+    solver without a source file (defined interactively) is hashed from
+    its bytecode.
+    """
+    digest = hashlib.sha256()
+    funcs = [get_solver(puzzle, name), get_batch_solver(puzzle, name), get_prepare(puzzle, name)]
+    own = [sys.modules.get(f.__module__) for f in funcs if f is not None]
+    if not any(getattr(m, "__file__", None) for m in own):
+        digest.update(funcs[0].__code__.co_code)
+    modules = [*own, sys.modules.get(f"puzzles.{puzzle}"), importlib.import_module("core.runner")]
+    modules = _repo_imports([m for m in modules if m is not None])
+    for path in sorted({getattr(m, "__file__", None) or "" for m in modules} - {""}):
+        with open(path, "rb") as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
 def list_puzzles() -> list[str]:
-    """List all puzzles currently registered."""
-    return list(_registry.keys())
+    """List all puzzles with registered (or lazily registered) solvers."""
+    return list(dict.fromkeys([*_registry, *_lazy]))
 
 
 def list_solvers(puzzle: str) -> list[str]:
-    """List all solvers available for a specific puzzle."""
-    return list(_registry.get(puzzle, {}).keys())
+    """List all solvers available for a specific puzzle, without importing any."""
+    return list(dict.fromkeys([*_registry.get(puzzle, {}), *_lazy.get(puzzle, {})]))
+
+
+def all_solvers_loaded(puzzle: str) -> list[str]:
+    """Solvers of a puzzle that have actually been imported."""
+    return list(_registry.get(puzzle, {}))
 
 
 def all_solvers() -> Dict[str, Dict[str, Callable]]:
-    """Return the entire registry (read-only)."""
+    """Return the entire registry (read-only); imports every lazy solver."""
+    for puzzle in list(_lazy):
+        for name in list(_lazy[puzzle]):
+            get_solver(puzzle, name)
     return {p: dict(s) for p, s in _registry.items()}
+
+
+# ---------------------------------------------------------------------------
+# Solver loading
+# ---------------------------------------------------------------------------
+def scan_registrations(path: str) -> List[Tuple[str, str]]:
+    """(puzzle, name) of every literal @register_solver(...) decorator in a source file."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for deco in node.decorator_list:
+            if not isinstance(deco, ast.Call):
+                continue
+            func = deco.func
+            called = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if called != "register_solver":
+                continue
+            args = {k.arg: k.value for k in deco.keywords}
+            values = [*deco.args, args.get("puzzle"), args.get("name")]
+            values = [v for v in values if v is not None][:2]
+            if len(values) == 2 and all(isinstance(v, ast.Constant) and isinstance(v.value, str)
+                                        for v in values):
+                found.append((values[0].value, values[1].value))
+    return found
+
+
+def _load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH) as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def _save_manifest(manifest: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        tmp = f"{MANIFEST_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"version": MANIFEST_VERSION, **manifest}, fh, indent=1)
+        os.replace(tmp, MANIFEST_PATH)
+    except OSError:
+        pass  # a read-only checkout still works, it just rescans every time
+
+
+def _scan_package(package: str, cached: dict) -> dict:
+    """{file path: {"stamp", "module", "solvers"}}, re-parsing only changed files."""
+    spec = importlib.util.find_spec(package)
+    directories = list(spec.submodule_search_locations or []) if spec else []
+    files = {}
+    for directory in directories:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".py") or filename.startswith("_"):
+                continue
+            path = os.path.join(directory, filename)
+            st = os.stat(path)
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = cached.get(path)
+            if entry is None or entry["stamp"] != stamp:
+                entry = {"stamp": stamp, "module": f"{package}.{filename[:-3]}",
+                         "solvers": scan_registrations(path)}
+            files[path] = entry
+    return files
+
+
+def _scan_entry_points(cached: dict) -> dict:
+    """
+    {"stamp", "solvers": [[puzzle, name, "module[:attr]"], ...]} for the
+    solverbench.solvers entry points. Only re-read when a sys.path
+    directory changed (i.e. packages were installed or removed), since
+    importlib.metadata alone costs ~20 ms to import.
+    """
+    stamp = [[p, os.stat(p).st_mtime_ns] for p in sys.path if p and os.path.isdir(p)]
+    if cached.get("stamp") == stamp:
+        return cached
+    import importlib.metadata
+    solvers = []
+    for ep in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP):
+        puzzle, sep, name = ep.name.partition("/")
+        if not sep:
+            print(f"[SolverBench] Ignoring entry point '{ep.name}': expected 'puzzle/solver'.")
+            continue
+        solvers.append([puzzle, name, ep.value])
+    return {"stamp": stamp, "solvers": solvers}
+
+
+def solver_manifest(package: str = "example_solvers") -> dict:
+    """
+    The cached discovery manifest, refreshed where anything changed:
+    {"files": {path: {"stamp", "module", "solvers": [[puzzle, name], ...]}},
+     "entry_points": {"stamp", "solvers": [[puzzle, name, "module[:attr]"], ...]}}
+    """
+    cached = _load_manifest()
+    manifest = {
+        "files": _scan_package(package, cached.get("files", {})),
+        "entry_points": _scan_entry_points(cached.get("entry_points", {})),
+    }
+    if manifest != {k: cached.get(k) for k in manifest}:
+        _save_manifest(manifest)
+    return manifest
+
+
+def autoload_internal_solvers(lazy: bool = True):
+    """
+    Make all solvers bundled in example_solvers/ (and installed via entry
+    points) available. By default they are registered lazily from the
+    manifest; ``lazy=False`` imports every module up front.
+    """
+    manifest = solver_manifest("example_solvers")
+    for entry in manifest["files"].values():
+        if lazy and entry["solvers"]:
+            for puzzle, name in entry["solvers"]:
+                register_lazy_solver(puzzle, name, entry["module"])
+        else:
+            # nothing found by the scan (e.g. registered in a loop): import it to be safe
+            importlib.import_module(entry["module"])
+    for puzzle, name, source in manifest["entry_points"]["solvers"]:
+        if lazy:
+            register_lazy_solver(puzzle, name, source)
+        else:
+            _load_source(puzzle, name, source)
+
+
+def import_extra_modules(paths, quiet: bool = False):
+    """Import arbitrary modules or .py files specified by the user."""
+    for path in paths or []:
+        if os.path.isfile(path) and path.endswith(".py"):
+            modname = os.path.splitext(os.path.basename(path))[0]
+            loaded = sys.modules.get(modname)
+            if loaded is not None and os.path.abspath(getattr(loaded, "__file__", "") or "") == os.path.abspath(path):
+                continue  # already registered (e.g. inherited by a forked worker)
+            spec = importlib.util.spec_from_file_location(modname, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[modname] = module
+            spec.loader.exec_module(module)
+            if not quiet:
+                print(f"[SolverBench] Imported file: {path}")
+        else:
+            importlib.import_module(path)
+            if not quiet:
+                print(f"[SolverBench] Imported module: {path}")
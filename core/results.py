@@ -0,0 +1,217 @@
+"""
+SolverBench Result Store
+------------------------
+Append-only persistence for benchmark results.
+
+A store holds any number of runs. Each run starts with a header (see
+core.environment.run_header) and continues with one record per
+(solver, case) result, written as soon as that result arrives:
+
+    *.jsonl                  - one JSON object per line: {"type": "run", ...}
+                               headers and {"type": "result", "run_id": ...}
+                               records, flushed line by line
+    *.db/.sqlite/.sqlite3    - SQLite tables `runs` and `results`, with an
+                               index on results (puzzle, solver, run_id)
+
+Solver outputs are not stored as-is by default: see OUTPUT_MODES.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional
+
+from core import results_dir
+
+OUTPUT_MODES = ("drop", "hash", "keep")
+DEFAULT_STORE = results_dir("logs", "results.jsonl")
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+# ----------------------------------------------------------------------
+# Outputs
+# ----------------------------------------------------------------------
+def output_digest(output: Any) -> str:
+    """Short stable hash of a solver output (compared across runs, not decoded)."""
+    data = json.dumps(output, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+def apply_output_mode(result: Dict[str, Any], mode: str) -> Dict[str, Any]:
+    """
+    Keep, hash or drop result["output"] in place.
+
+    "hash" replaces the output with output_hash (None for failed calls);
+    "drop" removes it entirely.
+    """
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output mode '{mode}', expected one of {OUTPUT_MODES}.")
+    if mode == "keep":
+        return result
+    output = result.pop("output", None)
+    if mode == "hash":
+        result["output_hash"] = output_digest(output) if result.get("success") else None
+    return result
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"), default=repr)
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+class _Store:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlStore(_Store):
+    """Results as JSON lines; the file is only created on the first write."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.run_id = None
+        self._fh = None
+
+    def _write(self, obj: Dict[str, Any]) -> None:
+        if self._fh is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._fh = open(self.path, "a", encoding="utf-8")
+        self._fh.write(_dumps(obj) + "\n")
+        self._fh.flush()
+
+    def start_run(self, header: Dict[str, Any]) -> None:
+        self.run_id = header["run_id"]
+        self._write({"type": "run", **header})
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self._write({"type": "result", "run_id": self.run_id, **result})
+
+    def _lines(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+    def runs(self, puzzle: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run headers, oldest first."""
+        return [
+            {k: v for k, v in obj.items() if k != "type"}
+            for obj in self._lines()
+            if obj["type"] == "run" and (puzzle is None or obj.get("puzzle") == puzzle)
+        ]
+
+    def results(self, run_id: Optional[str] = None, puzzle: Optional[str] = None,
+                solver: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        for obj in self._lines():
+            if (obj["type"] == "result"
+                    and (run_id is None or obj["run_id"] == run_id)
+                    and (puzzle is None or obj.get("puzzle") == puzzle)
+                    and (solver is None or obj.get("solver") == solver)):
+                del obj["type"]
+                yield obj
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class SqliteStore(_Store):
+    """Results in SQLite; the summary columns are queryable, the full record is JSON."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id      TEXT PRIMARY KEY,
+            started_at  TEXT,
+            puzzle      TEXT,
+            git_commit  TEXT,
+            dataset_id  TEXT,
+            header      TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            run_id      TEXT NOT NULL REFERENCES runs (run_id),
+            puzzle      TEXT,
+            solver      TEXT,
+            case_index  INTEGER,
+            status      TEXT,
+            time_ms     REAL,
+            accuracy    REAL,
+            mem_peak    INTEGER,
+            record      TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS results_puzzle_solver_run
+            ON results (puzzle, solver, run_id);
+    """
+    _COMMIT_EVERY = 256
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.run_id = None
+        self._db = sqlite3.connect(path)
+        self._db.executescript(self._SCHEMA)
+        self._pending = 0
+
+    def start_run(self, header: Dict[str, Any]) -> None:
+        self.run_id = header["run_id"]
+        self._db.execute(
+            "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+            (self.run_id, header.get("started_at"), header.get("puzzle"),
+             header.get("git_commit"), header.get("dataset_id"), _dumps(header)),
+        )
+        self._db.commit()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self._db.execute(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, result.get("puzzle"), result.get("solver"), result.get("case_index"),
+             result.get("status"), result.get("time_ms"), result.get("accuracy"),
+             result.get("mem_peak"), _dumps(result)),
+        )
+        self._pending += 1
+        if self._pending >= self._COMMIT_EVERY:
+            self._db.commit()
+            self._pending = 0
+
+    def runs(self, puzzle: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run headers, oldest first."""
+        query = "SELECT header FROM runs"
+        args = ()
+        if puzzle is not None:
+            query += " WHERE puzzle = ?"
+            args = (puzzle,)
+        return [json.loads(h) for (h,) in self._db.execute(query + " ORDER BY rowid", args)]
+
+    def results(self, run_id: Optional[str] = None, puzzle: Optional[str] = None,
+                solver: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        where, args = [], []
+        for column, value in (("puzzle", puzzle), ("solver", solver), ("run_id", run_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        query = "SELECT run_id, record FROM results"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        for rid, record in self._db.execute(query + " ORDER BY rowid", args):
+            yield {"run_id": rid, **json.loads(record)}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+
+def open_store(path: str = DEFAULT_STORE):
+    """Open a store, picking the backend from the file extension."""
+    if path.lower().endswith(_SQLITE_SUFFIXES):
+        return SqliteStore(path)
+    return JsonlStore(path)
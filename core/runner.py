@@ -5,92 +5,789 @@ Executes registered solvers with standardized benchmarking and reporting.
 
 Handles:
 - Fetching solvers from registry
-- Timing execution
-- (Optional) memory measurement
-- Validating output if a reference solution is available
+- Preparing inputs through the puzzle's freeze/thaw protocol (or deepcopy)
+- Timing execution (optional warm-up, repetitions, adaptive autorange)
+- (Optional) memory measurement, as its own untimed pass
+- (Optional) operation counting (see metrics.counter), likewise untimed
+- (Optional) cProfile / stack-sampling profiles, likewise untimed
+- Validating output if a reference solution is available (a chunk at a
+  time, through the puzzle's batch accuracy function when it has one)
+- Streaming (case, reference) pairs through in bounded chunks
+- Handing whole chunks to a solver's batch entry point, when it has one
+- (Optional) fanning cases out over supervised worker processes, with a
+  per-case wall-clock budget enforced by killing and recycling workers
+- (Optional) stable mode: CPU pinning, GC control and per-case
+  conditions (see core.hygiene)
 """
 
+import asyncio
 import copy
+import importlib
+import inspect
+import itertools
+import multiprocessing
+import os
+import sys
 import time
 import tracemalloc
+from multiprocessing.connection import wait
 from typing import Any, Callable, Dict, Optional
 
-from core.registry import get_solver
-from core import metrics
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # optional; /proc/self/statm is used instead where it exists
+    psutil = None
+
+from core.registry import (
+    get_solver, get_batch_solver, get_prepare, get_input_protocol, get_accuracy_fn,
+    get_batch_accuracy_fn, get_async_session,
+    autoload_internal_solvers, import_extra_modules,
+)
+from core import metrics, stats
+from core.hygiene import StableCase, assign_cpus, flag_outlier_cases, pin_to_cpu, pinned_to
+from core.profiling import profile_call
+from core.results import apply_output_mode
+
+
+def _unchanged(case):
+    return case
+
+
+def input_protocol(puzzle: str):
+    """
+    (freeze, thaw) for a puzzle's inputs.
+
+    Puzzles without a registered protocol keep the case as-is and thaw it
+    with copy.deepcopy.
+    """
+    freeze, thaw = get_input_protocol(puzzle)
+    if freeze is None:
+        return _unchanged, copy.deepcopy
+    return freeze, thaw
+
+
+_loop = None
+
+
+def resolve_solver(puzzle: str, solver_name: str) -> Callable:
+    """
+    The solver as a plain one-argument callable.
+
+    An ``async def`` solver is wrapped so each call turns the case into the
+    puzzle's async session (with an instant oracle) and plays it to the
+    end on a private event loop; for latency and concurrency use
+    core.interactive instead.
+    """
+    solver = get_solver(puzzle, solver_name)
+    if not inspect.iscoroutinefunction(solver):
+        return solver
+    make_session = get_async_session(puzzle)
+    if make_session is None:
+        raise ValueError(f"Solver '{solver_name}' is async, but puzzle '{puzzle}' has no async session.")
+
+    def play(case):
+        global _loop
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+        return _loop.run_until_complete(solver(make_session(case)))
+    return play
+
+
+def _timed_calls(solver: Callable, fresh_input: Callable[[], Any], warmup: int = 0,
+                 repeat: int = 1, min_time_ms: Optional[float] = None,
+                 target_cv: Optional[float] = None, max_repeat: int = 1000,
+                 stable: Optional[StableCase] = None):
+    """
+    Call solver repeatedly, timing each call on its own fresh input.
+
+    ``fresh_input()`` builds the input for one call; it always runs outside
+    the timed region.
+
+    Runs ``warmup`` untimed calls, then at least ``repeat`` timed ones. In
+    adaptive mode (``min_time_ms`` and/or ``target_cv`` given) it keeps going,
+    up to ``max_repeat``, until the timed calls add up to ``min_time_ms`` or
+    their coefficient of variation drops to ``target_cv``.
+
+    With a ``stable`` case, its enter() and exit() bracket every timed call.
+
+    Returns (output, success, samples_ms) for the last call.
+    """
+    adaptive = min_time_ms is not None or target_cv is not None
+
+    for _ in range(max(0, warmup)):
+        try:
+            solver(fresh_input())
+        except Exception:
+            break  # the timed call will surface the error
+
+    samples = []
+    while True:
+        case = fresh_input()
+        if stable:
+            stable.enter()
+        start_time = time.perf_counter()
+        try:
+            output = solver(case)
+            success = True
+        except Exception as e:
+            output = e
+            success = False
+        samples.append((time.perf_counter() - start_time) * 1000)  # ms
+        if stable:
+            stable.exit()
+
+        n = len(samples)
+        if not success or n >= max_repeat:
+            break
+        if n < repeat:
+            continue
+        if not adaptive:
+            break
+        if min_time_ms is not None and sum(samples) >= min_time_ms:
+            break
+        if target_cv is not None and n >= 3 and stats.cv(samples) <= target_cv:
+            break
+    return output, success, samples
+
+
+MEMORY_MODES = ("tracemalloc", "rss", "both")
+_TRACE_FRAMES = 8
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Process peak resident set size in KiB (ru_maxrss is bytes on macOS)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _current_rss_kb() -> Optional[int]:
+    """Current resident set size in KiB, or None where it cannot be read."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    try:
+        with open("/proc/self/statm") as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * (os.sysconf("SC_PAGE_SIZE") // 1024)
+
+
+def _format_trace(trace: tracemalloc.Traceback) -> str:
+    """Innermost-first 'file:line' chain for one allocation site, up to the solver call."""
+    frames = []
+    for f in reversed(trace):
+        if f.filename == __file__:
+            break
+        frames.append(f"{os.path.basename(f.filename)}:{f.lineno}")
+    return " <- ".join(frames)
+
+
+def _memory_pass(solver: Callable, input_data: Any, mode: str, top_n: int = 0) -> Dict[str, Any]:
+    """
+    Make one extra, untimed call to measure memory.
+
+    ``mode`` is "tracemalloc" (Python allocations: peak bytes and, with
+    ``top_n``, the largest allocation sites still alive when the solver
+    returns, grouped by traceback), "rss" (resident memory, which also
+    sees allocations made in C) or "both".
+
+    For "rss", rss_delta_kb is the change in current RSS from just before
+    the call to just after it, with the output still alive: memory the
+    call kept, not its transient peak, and only approximate, since the
+    allocator may keep or return freed pages at will. rss_peak_kb is the
+    high-water mark of the whole process so far.
+    """
+    fields = {"mem_peak": None}
+    trace = mode in ("tracemalloc", "both")
+    rss = mode in ("rss", "both")
+
+    rss_before = _current_rss_kb() if rss else None
+    if trace:
+        tracemalloc.start(_TRACE_FRAMES if top_n else 1)
+    try:
+        output = solver(input_data)
+    except Exception:
+        output = None
+    if trace:
+        _, fields["mem_peak"] = tracemalloc.get_traced_memory()
+        if top_n:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            fields["mem_top"] = [
+                (_format_trace(stat.traceback), stat.size, stat.count)
+                for stat in snapshot.statistics("traceback")[:top_n]
+            ]
+        tracemalloc.stop()  # frees the traces before RSS is sampled again
+    if rss:
+        rss_after = _current_rss_kb()
+        fields["rss_peak_kb"] = _max_rss_kb()
+        fields["rss_delta_kb"] = rss_after - rss_before if rss_before is not None else None
+    del output
+    return fields
+
+
+def _count_pass(solver: Callable, input_data: Any) -> Dict[str, int]:
+    """Make one extra, untimed call with operation counters switched on."""
+    with metrics.counting_operations() as counts:
+        try:
+            solver(input_data)
+        except Exception:
+            pass
+    return dict(counts)
 
 
 def run_single(puzzle: str, solver_name: str, input_data: Any,
                reference_output: Optional[Any] = None,
-               measure_memory: bool = False) -> Dict[str, Any]:
+               measure_memory=False,
+               warmup: int = 0, repeat: int = 1,
+               min_time_ms: Optional[float] = None,
+               target_cv: Optional[float] = None,
+               max_repeat: int = 1000,
+               memory_top: int = 0,
+               frozen: bool = False,
+               output_mode: str = "keep",
+               count_ops: bool = False,
+               profile: Optional[str] = None,
+               stable: bool = False,
+               disable_gc: bool = False) -> Dict[str, Any]:
     """
-    Run a single solver once and collect metrics.
+    Run a single solver and collect metrics.
 
     Args:
         puzzle: the puzzle name ("sudoku", "pathfinding", etc.)
         solver_name: the registered solver to use
         input_data: data to solve (puzzle board, graph, etc.)
         reference_output: optional known correct result for validation
-        measure_memory: whether to use tracemalloc
+        measure_memory: False, or a mode from MEMORY_MODES (True means
+            "tracemalloc"); measured in a separate untimed call
+        warmup: untimed calls made before timing starts
+        repeat: minimum number of timed calls
+        min_time_ms / target_cv: adaptive mode, see _timed_calls
+        max_repeat: cap on timed calls in adaptive mode
+        memory_top: with tracemalloc, keep this many top allocation sites
+        frozen: input_data is already in the puzzle's frozen form
+        output_mode: keep, hash or drop the solver output (see
+            core.results.OUTPUT_MODES)
+        count_ops: count operations (is_valid calls, guesses, backtracks...)
+            in a separate untimed call; reported as a name -> count dict
+        profile: "cprofile" or "sampling" to profile the solver in a separate
+            untimed pass; the raw profile is returned under "profile" for
+            core.profiling.ProfileCollector
+        stable: stable mode (see core.hygiene): gc.collect() before the
+            case, and gc_collections, cpu, cpu_mhz, load_avg,
+            outlier_samples and the "unstable" flags recorded with it
+        disable_gc: in stable mode, switch the garbage collector off
+            during each timed call
+
+    input_data is frozen once, and every call (timed, warm-up or memory)
+    gets its own input thawed from it outside the timed region, so solvers
+    may mutate what they are given. A solver's prepare hook (see
+    register_solver) runs on the case before warm-up, untimed. time_ms is the median of the timed
+    calls; all samples are kept in times_ms.
 
     Returns:
-        dict with runtime info, success, output, and stats
+        dict with runtime info, success, status ("ok" or "error"), output, and
+        stats. When the solver raises, output is None and error holds
+        "ExceptionType: message".
     """
-    solver = get_solver(puzzle, solver_name)
+    solver = resolve_solver(puzzle, solver_name)
     result = {"puzzle": puzzle, "solver": solver_name}
-    
+    memory_mode = _memory_mode(measure_memory)
+    freeze, thaw = input_protocol(puzzle)
+    if not frozen:
+        input_data = freeze(input_data)
+
     # measure performance
-    if measure_memory:
-        tracemalloc.start()
+    _prepare_case(puzzle, solver_name, thaw(input_data))
+    conditions = StableCase(disable_gc) if stable else None
+    output, success, samples = _timed_calls(
+        solver, lambda: thaw(input_data), warmup, repeat, min_time_ms, target_cv, max_repeat,
+        conditions,
+    )
+    elapsed = stats.median(samples)
 
-    start_time = time.perf_counter()
+    result.update(_case_result(output, success, elapsed, samples))
+    if conditions:
+        result.update(conditions.fields(samples))
+    result.update(_untimed_passes(solver, thaw, input_data, memory_mode, memory_top,
+                                  count_ops, profile))
+    validate_results(puzzle, [result], [reference_output])
+    return apply_output_mode(result, output_mode)
+
+
+def _prepare_case(puzzle: str, solver_name: str, case) -> None:
+    """Run the solver's prepare hook on one case, if it has one (untimed)."""
+    prepare = get_prepare(puzzle, solver_name)
+    if prepare is None:
+        return
     try:
-        output = solver(input_data)
-        success = True
-    except Exception as e:
-        output = e
-        success = False
-    elapsed = (time.perf_counter() - start_time) * 1000  # ms
-
-    if measure_memory:
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-    else:
-        current = peak = None
+        prepare(case)
+    except Exception:
+        pass  # the timed call will surface the error
+
 
-    # compute correctness metric (if reference provided)
-    accuracy = None
-    if reference_output is not None and success:
-        from core.registry import get_accuracy_fn
-        acc_fn = get_accuracy_fn(puzzle)
-        if reference_output is not None and success:
-            if acc_fn:
-                accuracy = acc_fn(output, reference_output)
-            else:
-                accuracy = metrics.compute_accuracy(output, reference_output)
+def _memory_mode(measure_memory) -> Optional[str]:
+    memory_mode = "tracemalloc" if measure_memory is True else measure_memory
+    if memory_mode and memory_mode not in MEMORY_MODES:
+        raise ValueError(f"Unknown memory mode '{memory_mode}', expected one of {MEMORY_MODES}.")
+    return memory_mode
 
 
-    result.update({
+def _case_result(output, success: bool, elapsed: float, samples) -> Dict[str, Any]:
+    """
+    Outcome fields of one case; accuracy is filled in by validate_results.
+    A failed case has no time (like timed-out and crashed ones), so it never
+    counts towards timing statistics.
+    """
+    return {
         "success": success,
-        "time_ms": round(elapsed, 3),
-        "mem_peak": peak,
-        "accuracy": accuracy,
-        "output": output,
-    })
-    return result
+        "status": "ok" if success else "error",
+        "error": None if success else f"{type(output).__name__}: {output}",
+        "time_ms": round(elapsed, 3) if success else None,
+        "times_ms": [round(t, 4) for t in samples] if success else [],
+        "accuracy": None,
+        "output": output if success else None,
+    }
 
 
-def run_batch(puzzle: str, solver_names, dataset, references=None, measure_memory=False):
+def validate_results(puzzle: str, results, references) -> None:
     """
-    Run each solver on each input in the dataset, returning a flat result list.
+    Set "accuracy" on every successful result that has a reference.
+
+    Several at once go through the puzzle's batch accuracy function, if it
+    registered one; otherwise (or for a single case) each is scored on its
+    own. Always called after timing, on outputs that are still kept.
+    """
+    todo = [(r, ref) for r, ref in zip(results, references) if ref is not None and r["success"]]
+    if not todo:
+        return
+    batch_fn = get_batch_accuracy_fn(puzzle)
+    if batch_fn and len(todo) > 1:
+        scores = batch_fn([r["output"] for r, _ in todo], [ref for _, ref in todo])
+    else:
+        acc_fn = get_accuracy_fn(puzzle) or metrics.compute_accuracy
+        scores = [acc_fn(r["output"], ref) for r, ref in todo]
+    for (result, _), score in zip(todo, scores):
+        result["accuracy"] = score
+
+
+def _untimed_passes(solver: Callable, thaw: Callable, frozen_case, memory_mode,
+                    memory_top: int, count_ops: bool, profile: Optional[str]) -> Dict[str, Any]:
+    """Memory, counting and profiling passes, each on its own fresh input."""
+    fields = {"counts": None, "mem_peak": None}
+    if memory_mode:
+        fields.update(_memory_pass(solver, thaw(frozen_case), memory_mode, memory_top))
+    if count_ops:
+        fields["counts"] = _count_pass(solver, thaw(frozen_case))
+    if profile:
+        fields["profile"] = profile_call(profile, solver, lambda: thaw(frozen_case))
+    return fields
+
+
+# ---------------------------------------------------------------------------
+# Batch entry points
+# ---------------------------------------------------------------------------
+def _timed_batch(solve_batch: Callable, thaw: Callable, frozen_cases, warmup: int = 0,
+                 repeat: int = 1, min_time_ms: Optional[float] = None,
+                 target_cv: Optional[float] = None, max_repeat: int = 1000,
+                 stable: Optional[StableCase] = None):
+    """
+    Time solve_batch over a whole chunk, with the same warm-up, repeat and
+    adaptive rules as _timed_calls (applied to the batch call).
+
+    Returns (outputs, success, per_case_samples): per_case_samples[k] holds
+    case k's share of every timed call, in ms. A case's share is the time
+    charged to it alone plus an even split of whatever was not charged.
     """
+    n = len(frozen_cases)
+    wants_charge = "charge" in inspect.signature(solve_batch).parameters
+    call_charges = []  # one list per call, warm-up calls included
+
+    def batch(cases):
+        charges = [0.0] * n
+        call_charges.append(charges)
+
+        def charge(index: int, ms: float) -> None:
+            charges[index] += ms
+
+        outputs = solve_batch(cases, charge=charge) if wants_charge else solve_batch(cases)
+        if len(outputs) != n:
+            raise ValueError(f"solve_batch returned {len(outputs)} outputs for {n} inputs.")
+        return outputs
+
+    outputs, success, totals = _timed_calls(
+        batch, lambda: [thaw(case) for case in frozen_cases],
+        warmup, repeat, min_time_ms, target_cv, max_repeat, stable,
+    )
+    per_case = [[] for _ in range(n)]
+    for total, charges in zip(totals, call_charges[-len(totals):]):
+        shared = max(0.0, total - sum(charges)) / n
+        for k in range(n):
+            per_case[k].append(shared + charges[k])
+    return outputs, success, per_case
+
+
+def run_chunk_batched(puzzle: str, solver_name: str, frozen_cases, references, start: int = 0,
+                      measure_memory=False, warmup: int = 0, repeat: int = 1,
+                      min_time_ms: Optional[float] = None, target_cv: Optional[float] = None,
+                      max_repeat: int = 1000, memory_top: int = 0, output_mode: str = "keep",
+                      count_ops: bool = False, profile: Optional[str] = None,
+                      stable: bool = False, disable_gc: bool = False):
+    """
+    Run a solver's batch entry point on a chunk of frozen cases.
+
+    Returns one result per case, shaped like run_single's, with case indices
+    counting from ``start``. Timing covers the batch call (see _timed_batch);
+    memory, counting and profiling passes still go through the per-case
+    solver, one untimed call per case. The chunk's outputs are validated
+    together afterwards (see validate_results). Each result is marked
+    ``"batched": True``. In stable mode the conditions are those of the
+    batch call, with outlier samples judged per case.
+    """
+    solver = resolve_solver(puzzle, solver_name)
+    solve_batch = get_batch_solver(puzzle, solver_name)
+    memory_mode = _memory_mode(measure_memory)
+    thaw = input_protocol(puzzle)[1]
+
+    for frozen_case in frozen_cases:
+        _prepare_case(puzzle, solver_name, thaw(frozen_case))
+    conditions = StableCase(disable_gc) if stable else None
+    outputs, success, per_case = _timed_batch(
+        solve_batch, thaw, frozen_cases, warmup, repeat, min_time_ms, target_cv, max_repeat,
+        conditions,
+    )
     results = []
-    for i, solver_name in enumerate(solver_names):
-        print(f"[SolverBench] Running solver '{solver_name}' on puzzle '{puzzle}'...")
-        for j, input_case in enumerate(dataset):
-            ref = references[j] if references and j < len(references) else None
-
-            fresh_input = copy.deepcopy(input_case)
-            res = run_single(puzzle, solver_name, fresh_input, ref, measure_memory)
-            res["case_index"] = j
-            results.append(res)
-    return results
\ No newline at end of file
+    for k, frozen_case in enumerate(frozen_cases):
+        output = outputs[k] if success else outputs
+        ok = success and not isinstance(output, Exception)
+        result = {"puzzle": puzzle, "solver": solver_name, "batched": True}
+        result.update(_case_result(output, ok, stats.median(per_case[k]), per_case[k]))
+        if conditions:
+            result.update(conditions.fields(per_case[k]))
+        result.update(_untimed_passes(solver, thaw, frozen_case, memory_mode, memory_top,
+                                      count_ops, profile))
+        result["case_index"] = start + k
+        results.append(result)
+    validate_results(puzzle, results, references)
+    return [apply_output_mode(result, output_mode) for result in results]
+
+
+def iter_batch(puzzle: str, solver_names, pairs, measure_memory=False,
+               workers: int = 1, extra_modules=None, timeout_ms: Optional[float] = None,
+               chunk_size: int = 256, batch: bool = True, **timing):
+    """
+    Lazily run each solver on a stream of (case, reference) pairs.
+
+    Pairs are pulled ``chunk_size`` at a time; every solver runs over a chunk
+    before the next one is read, and results are yielded as they are ready,
+    so memory stays bounded by the chunk size however long the stream is.
+    Case indices count from 0 across the whole stream.
+
+    With ``workers > 1`` or a ``timeout_ms`` budget, (solver, case_index) jobs
+    run in supervised worker processes. Every worker re-registers solvers
+    through the same loader path as the CLI (``extra_modules`` are the
+    ``--import`` paths) and times the solver call itself. A case that exceeds
+    ``timeout_ms`` gets its worker killed and replaced, and is reported with
+    status "timed_out" (the budget covers all repetitions of that case).
+    Results come back in the same order as a serial run.
+
+    Serially, solvers registered with a batch entry point get each chunk in
+    a single solve_batch call (see run_chunk_batched) unless ``batch`` is
+    False, and each solver's outputs for a chunk are validated together
+    once it is done. Supervised workers always run (and validate) one case
+    per job, since a budget per case cannot be enforced on a batch call.
+
+    In stable mode (``stable=True``) the serial runner pins itself to one
+    CPU for the duration, and each supervised worker to a CPU of its own;
+    cases far slower than the rest of their chunk are marked "slow_case"
+    as a hint (see core.hygiene.flag_outlier_cases).
+
+    Extra keyword arguments (warmup, repeat, min_time_ms, target_cv,
+    max_repeat, memory_top, output_mode, count_ops, profile, stable,
+    disable_gc) are passed on to run_single;
+    dropping or hashing outputs there also keeps them off the worker pipes.
+    """
+    for solver_name in solver_names:
+        get_solver(puzzle, solver_name)  # import lazy solvers (and their puzzle) before freezing
+    stable = timing.get("stable", False)
+    if workers > 1 or timeout_ms:
+        jobs = _iter_jobs(puzzle, solver_names, pairs, chunk_size, measure_memory, timing)
+        budget = f" with a {timeout_ms:g} ms budget per case" if timeout_ms else ""
+        print(f"[SolverBench] Running {len(solver_names)} solver(s) on puzzle '{puzzle}' "
+              f"across {max(1, workers)} worker(s){budget}...")
+        results = _run_supervised(puzzle, jobs, max(1, workers), extra_modules, timeout_ms,
+                                  pin=stable)
+    else:
+        results = _iter_serial(puzzle, solver_names, pairs, measure_memory, chunk_size, batch,
+                               timing)
+    yield from flag_outlier_cases(results, chunk_size) if stable else results
+
+
+def _iter_serial(puzzle: str, solver_names, pairs, measure_memory, chunk_size: int,
+                 batch: bool, timing):
+    """iter_batch in this process: chunk by chunk, each chunk solver-major."""
+    stable = timing.get("stable", False)
+    batched = {name for name in solver_names if batch and get_batch_solver(puzzle, name)}
+    announced = set()
+    cpu = assign_cpus(1)[0] if stable else None
+    with pinned_to(cpu) as pinned:
+        if stable:
+            where = f"pinned to CPU {cpu}" if pinned else "CPU pinning unavailable"
+            gc_note = "; garbage collector off while timing" if timing.get("disable_gc") else ""
+            print(f"[SolverBench] Stable mode: {where}{gc_note}.")
+        for start, chunk in iter_chunks(puzzle, pairs, chunk_size):
+            for solver_name in solver_names:
+                if solver_name not in announced:
+                    mode = " in batches" if solver_name in batched else ""
+                    print(f"[SolverBench] Running solver '{solver_name}' on puzzle '{puzzle}'{mode}...")
+                    announced.add(solver_name)
+                yield from _run_chunk(puzzle, solver_name, chunk, start, measure_memory, timing,
+                                      solver_name in batched)
+
+
+def _run_chunk(puzzle: str, solver_name: str, chunk, start: int, measure_memory, timing,
+               batched: bool):
+    """
+    One solver over one chunk, in this process. Outputs are kept until the
+    whole chunk has been validated in one batch, then kept, hashed or
+    dropped as asked.
+    """
+    cases, refs = [case for case, _ in chunk], [ref for _, ref in chunk]
+    if batched:
+        return run_chunk_batched(puzzle, solver_name, cases, refs, start, measure_memory, **timing)
+    options = dict(timing)
+    output_mode = options.pop("output_mode", "keep")
+    results = [_run_job((puzzle, solver_name, start + k, case, None, measure_memory, options))
+               for k, case in enumerate(cases)]
+    validate_results(puzzle, results, refs)
+    return [apply_output_mode(result, output_mode) for result in results]
+
+
+def run_batch(puzzle: str, solver_names, dataset, references=None, measure_memory=False,
+              workers: int = 1, extra_modules=None, timeout_ms: Optional[float] = None,
+              **timing):
+    """
+    Run each solver on each input in the dataset, returning a flat result list.
+
+    Results are ordered solver by solver, then by case index. See iter_batch
+    for the worker, timeout and timing options.
+    """
+    pairs = (
+        (input_case, references[j] if references and j < len(references) else None)
+        for j, input_case in enumerate(dataset)
+    )
+    return list(iter_batch(puzzle, solver_names, pairs, measure_memory, workers,
+                           extra_modules, timeout_ms, chunk_size=max(1, len(dataset)),
+                           **timing))
+
+
+def iter_chunks(puzzle: str, pairs, chunk_size: int):
+    """
+    (start index, [(frozen case, reference), ...]) chunks of a pair stream.
+
+    Cases are frozen once as they are read and shared by every solver;
+    this is also the form they are pickled in on the way to a worker.
+    """
+    freeze = input_protocol(puzzle)[0]
+    pairs = iter(pairs)
+    start = 0
+    while True:
+        chunk = [(freeze(case), ref) for case, ref in itertools.islice(pairs, chunk_size)]
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def _iter_jobs(puzzle: str, solver_names, pairs, chunk_size: int, measure_memory, timing):
+    """(solver, case) jobs, chunk by chunk, each chunk solver-major."""
+    for start, chunk in iter_chunks(puzzle, pairs, chunk_size):
+        for solver_name in solver_names:
+            for k, (frozen_case, ref) in enumerate(chunk):
+                yield (puzzle, solver_name, start + k, frozen_case, ref, measure_memory, timing)
+
+
+# ---------------------------------------------------------------------------
+# Supervised worker processes
+# ---------------------------------------------------------------------------
+MAX_STARTUP_FAILURES = 3
+
+
+class WorkerStartupError(RuntimeError):
+    """Worker processes keep dying before they are ready to take jobs."""
+
+
+def _init_worker(puzzle: str, extra_modules):
+    """Register the puzzle and all solvers inside a fresh worker process."""
+    try:
+        importlib.import_module(f"puzzles.{puzzle}")
+    except ModuleNotFoundError:
+        pass
+    autoload_internal_solvers()
+    import_extra_modules(extra_modules, quiet=True)
+
+
+def _run_job(job):
+    """Run one (solver, case) job and tag its case index."""
+    puzzle, solver_name, case_index, frozen_case, ref, measure_memory, timing = job
+    res = run_single(puzzle, solver_name, frozen_case, ref, measure_memory, frozen=True, **timing)
+    res["case_index"] = case_index
+    return res
+
+
+def _worker_main(conn, puzzle: str, extra_modules, cpu: Optional[int] = None):
+    """Worker loop: signal readiness, then answer jobs until told to stop."""
+    pin_to_cpu(cpu)
+    _init_worker(puzzle, extra_modules)
+    conn.send("ready")
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        conn.send(_run_job(job))
+
+
+def _failed_result(job, status: str) -> Dict[str, Any]:
+    """Result dict for a job whose worker never answered."""
+    puzzle, solver_name, case_index = job[:3]
+    return {
+        "puzzle": puzzle,
+        "solver": solver_name,
+        "success": False,
+        "status": status,
+        "error": None,
+        "time_ms": None,
+        "mem_peak": None,
+        "accuracy": None,
+        "output": None,
+        "case_index": case_index,
+    }
+
+
+class _Worker:
+    """One supervised worker process and the job it is currently running."""
+
+    def __init__(self, ctx, puzzle: str, extra_modules, cpu: Optional[int] = None):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main,
+                                   args=(child_conn, puzzle, extra_modules, cpu), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.slot = None
+        self.job = None
+        self.deadline = None
+
+    def submit(self, slot: int, job, timeout_ms: Optional[float]):
+        self.slot, self.job = slot, job
+        self.conn.send(job)
+        self.deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def _run_supervised(puzzle: str, jobs, workers: int, extra_modules,
+                    timeout_ms: Optional[float], pin: bool = False):
+    """
+    Run a (possibly lazy) job stream on supervised workers, yielding results
+    in job order. Workers that overrun their budget are killed and replaced.
+    With ``pin``, worker slot i runs on CPU cpus[i], replacements included.
+
+    A worker slot whose process dies before it is ready (e.g. an --import
+    module that raises) MAX_STARTUP_FAILURES times in a row raises
+    WorkerStartupError instead of being respawned forever.
+    """
+    ctx = multiprocessing.get_context()
+    extra_modules = list(extra_modules or [])
+    cpus = assign_cpus(workers) if pin else [None] * workers
+    if pin:
+        pinned = ", ".join(str(c) for c in cpus) if cpus[0] is not None else "unavailable"
+        print(f"[SolverBench] Stable mode: worker CPUs {pinned}.")
+
+    def spawn(i):
+        return _Worker(ctx, puzzle, extra_modules, cpus[i])
+
+    jobs = enumerate(jobs)
+    finished = {}  # slot -> result, held until every earlier slot is yielded
+    max_finished = workers * 16
+    next_slot = 0
+    exhausted = False
+    pool = [spawn(i) for i in range(workers)]
+    startup_failures = [0] * workers
+    try:
+        while True:
+            for w in pool:
+                if w.ready and w.job is None and not exhausted and len(finished) < max_finished:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                    else:
+                        w.submit(*job, timeout_ms)
+            if exhausted and all(w.job is None for w in pool):
+                break
+
+            deadlines = [w.deadline for w in pool if w.deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([w.conn for w in pool if not w.ready or w.job is not None], wait_for)
+
+            for i, w in enumerate(pool):
+                if w.conn in ready:
+                    try:
+                        message = w.conn.recv()
+                    except EOFError:
+                        message = None
+                    if message is None:
+                        # worker died (segfault, os._exit, ...) - record and recycle
+                        # (outside the except, so the new worker starts clean)
+                        if w.job is not None:
+                            finished[w.slot] = _failed_result(w.job, "crashed")
+                        w.kill()
+                        if not w.ready:
+                            startup_failures[i] += 1
+                            if startup_failures[i] >= MAX_STARTUP_FAILURES:
+                                raise WorkerStartupError(
+                                    f"Worker process exited before it was ready {MAX_STARTUP_FAILURES} "
+                                    f"times in a row; check the --import modules and the traceback above."
+                                )
+                        pool[i] = spawn(i)
+                        continue
+                    if message == "ready":
+                        w.ready = True
+                        startup_failures[i] = 0
+                    else:
+                        finished[w.slot] = message
+                        w.job = w.deadline = None
+                elif w.deadline is not None and time.monotonic() >= w.deadline:
+                    finished[w.slot] = _failed_result(w.job, "timed_out")
+                    w.kill()
+                    pool[i] = spawn(i)
+
+            while next_slot in finished:
+                yield finished.pop(next_slot)
+                next_slot += 1
+    finally:
+        for w in pool:
+            w.stop()
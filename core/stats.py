@@ -0,0 +1,119 @@
+"""
+SolverBench Statistics
+----------------------
+Small, dependency-free statistics helpers used for timing reports.
+
+Provides:
+- percentiles with linear interpolation (same convention as numpy's default)
+- sample standard deviation and coefficient of variation
+- slow outliers by the median absolute deviation
+- bootstrap confidence intervals for any statistic
+- a run-and-case bootstrap for paired differences measured over several runs
+"""
+
+import math
+import random
+from statistics import median, stdev
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of values, interpolating linearly."""
+    if not values:
+        raise ValueError("percentile() of empty data")
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100
+    lo, hi = math.floor(pos), math.ceil(pos)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def std(values: Sequence[float]) -> float:
+    """Sample standard deviation, 0.0 for fewer than two values."""
+    return stdev(values) if len(values) > 1 else 0.0
+
+
+def cv(values: Sequence[float]) -> float:
+    """Coefficient of variation (stddev / mean), inf when the mean is zero."""
+    m = sum(values) / len(values) if values else 0.0
+    return std(values) / m if m else math.inf
+
+
+def slow_outliers(values: Sequence[float], z: float = 3.5, floor: float = 0.05) -> List[int]:
+    """
+    Indices of values far above the median: robust z-score (median absolute
+    deviation scaled to a normal stddev) above ``z``. The MAD is floored at
+    ``floor`` times the median, so near-identical samples flag nothing.
+    """
+    if len(values) < 3:
+        return []
+    mid = median(values)
+    mad = max(median(abs(v - mid) for v in values) * 1.4826, floor * mid)
+    if not mad:
+        return []
+    return [i for i, v in enumerate(values) if (v - mid) / mad > z]
+
+
+def bootstrap_resamples(n: int) -> int:
+    """Resample count for n values, keeping bootstrap cost bounded on very large sets."""
+    return max(100, min(1000, 2_000_000 // max(n, 1)))
+
+
+def bootstrap_ci(values: Sequence[float],
+                 statistic: Callable[[Sequence[float]], float] = median,
+                 confidence: float = 0.95,
+                 resamples: int = 1000,
+                 seed: Optional[int] = 0) -> Tuple[float, float]:
+    """
+    Percentile-bootstrap confidence interval for statistic(values).
+
+    Uses a private RNG seeded with ``seed`` so reports are reproducible.
+    """
+    if not values:
+        raise ValueError("bootstrap_ci() of empty data")
+    if len(values) == 1:
+        return values[0], values[0]
+    rng = random.Random(seed)
+    n = len(values)
+    estimates = sorted(statistic(rng.choices(values, k=n)) for _ in range(resamples))
+    alpha = (1 - confidence) / 2
+    return percentile(estimates, alpha * 100), percentile(estimates, (1 - alpha) * 100)
+
+
+def paired_run_bootstrap(baseline_runs: Sequence[Sequence[float]],
+                         candidate_runs: Sequence[Sequence[float]],
+                         confidence: float = 0.95,
+                         resamples: int = 1000,
+                         seed: Optional[int] = 0) -> Tuple[float, Tuple[float, float], float]:
+    """
+    Median of paired per-case differences (candidate - baseline) measured
+    over several runs of each side, with a two-level bootstrap.
+
+    Every run is a list of per-case values in the same case order. Each
+    resample draws runs with replacement on each side, averages every case
+    over the drawn runs, then draws cases with replacement and takes the
+    median difference, so the interval covers variation between runs as
+    well as between cases. With one run per side it is an ordinary case
+    bootstrap.
+
+    Returns (estimate, (lo, hi), p): the median difference of the
+    run-averaged cases, its percentile interval, and the two-sided
+    bootstrap p-value for a median difference of zero.
+    """
+    def run_mean(runs):
+        return [sum(values) / len(runs) for values in zip(*runs)]
+
+    n = len(baseline_runs[0])
+    estimate = median(c - b for b, c in zip(run_mean(baseline_runs), run_mean(candidate_runs)))
+    rng = random.Random(seed)
+    estimates = []
+    for _ in range(resamples):
+        base = run_mean(rng.choices(baseline_runs, k=len(baseline_runs)))
+        cand = run_mean(rng.choices(candidate_runs, k=len(candidate_runs)))
+        diffs = [c - b for b, c in zip(base, cand)]
+        estimates.append(median(rng.choices(diffs, k=n)))
+    estimates.sort()
+    alpha = (1 - confidence) / 2
+    interval = percentile(estimates, alpha * 100), percentile(estimates, (1 - alpha) * 100)
+    below = sum(e <= 0 for e in estimates) / resamples
+    above = sum(e >= 0 for e in estimates) / resamples
+    return estimate, interval, min(1.0, 2 * min(below, above))
@@ -0,0 +1,213 @@
+"""
+SolverBench Sweep
+-----------------
+Runs solvers across a grid of generator parameters and fits growth curves.
+
+A grid is given as NAME=VALUES specs, one per parameter:
+
+    holes=20:64:4        inclusive range (start:stop[:step])
+    colors=6,8,10        explicit list (values parsed as Python literals)
+
+Every combination of the grid is a sweep point: a fresh dataset is
+generated for it and every solver is benchmarked on it. Per solver the
+report shows the median time at each point, the first point where cases
+start timing out, and two fits of median time against the swept
+parameter:
+
+    power law     time ~ x^k      (slope k of the log-log fit)
+    exponential   time ~ e^(r*x)  (slope r of the log-linear fit)
+
+with R^2 for each, so polynomial and exponential blow-ups can be told
+apart.
+"""
+
+import ast
+import itertools
+import math
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core import stats
+from core.metrics import SolverSummary
+from core.runner import iter_batch
+
+
+# ----------------------------------------------------------------------
+# Grid
+# ----------------------------------------------------------------------
+def _literal(text: str):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_grid(specs: Sequence[str]) -> Dict[str, List[Any]]:
+    """["holes=20:64:4", "colors=6,8"] -> {"holes": [20, 24, ...], "colors": [6, 8]}"""
+    grid = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not name or not values:
+            raise ValueError(f"--grid expects NAME=VALUES, got '{spec}'")
+        if ":" in values:
+            parts = [_literal(p) for p in values.split(":")]
+            if len(parts) not in (2, 3) or not all(isinstance(p, int) for p in parts):
+                raise ValueError(f"Range '{values}' must be start:stop[:step] with integers.")
+            start, stop, step = parts if len(parts) == 3 else (*parts, 1)
+            if step <= 0:
+                raise ValueError(f"Range '{values}' needs a positive step.")
+            grid[name] = list(range(start, stop + 1, step))
+        else:
+            grid[name] = [_literal(v) for v in values.split(",")]
+    return grid
+
+
+def grid_points(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*grid.values())]
+
+
+def _label(point: Dict[str, Any]) -> str:
+    return " ".join(f"{k}={v}" for k, v in point.items())
+
+
+# ----------------------------------------------------------------------
+# Curve fitting
+# ----------------------------------------------------------------------
+def _linear_fit(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float, float]:
+    """Least-squares y = a + b*x; returns (b, a, R^2)."""
+    n = len(xs)
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if not sxx:
+        return 0.0, my, 0.0
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    b = sxy / sxx
+    a = my - b * mx
+    ss_tot = sum((y - my) ** 2 for y in ys)
+    ss_res = sum((y - (a + b * x)) ** 2 for x, y in zip(xs, ys))
+    return b, a, (1 - ss_res / ss_tot) if ss_tot else 1.0
+
+
+def fit_growth(xs: Sequence[float], ys: Sequence[float]) -> Optional[Dict[str, float]]:
+    """
+    Power-law and exponential fits of ys against xs.
+
+    Returns {"power": k, "power_r2": ..., "exp_rate": r, "exp_r2": ...}, or
+    None with fewer than three usable (positive) points.
+    """
+    points = [(x, y) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 3:
+        return None
+    log_y = [math.log(y) for _, y in points]
+    power, _, power_r2 = _linear_fit([math.log(x) for x, _ in points], log_y)
+    rate, _, exp_r2 = _linear_fit([x for x, _ in points], log_y)
+    return {"power": power, "power_r2": power_r2, "exp_rate": rate, "exp_r2": exp_r2}
+
+
+# ----------------------------------------------------------------------
+# Running a sweep
+# ----------------------------------------------------------------------
+def run_sweep(puzzle: str, solvers: List[str], generate: Callable, grid: Dict[str, List[Any]],
+              params: Optional[Dict[str, Any]] = None, seed: Optional[int] = None,
+              stop_fraction: float = 0.5, on_result: Optional[Callable] = None,
+              **run_options) -> Dict[str, List[Tuple[Dict[str, Any], SolverSummary]]]:
+    """
+    Benchmark every solver at every grid point.
+
+    ``generate`` is the puzzle's generate_dataset; each point calls it with
+    ``params`` updated by the point (and ``seed``). A solver that times out
+    on at least ``stop_fraction`` of a point's cases is not run at later
+    points. ``run_options`` go to iter_batch (workers, timeout_ms, ...).
+
+    Returns {solver: [(point, SolverSummary), ...]}.
+    """
+    sweep = {name: [] for name in solvers}
+    active = list(solvers)
+    for point in grid_points(grid):
+        if not active:
+            break
+        kwargs = {**(params or {}), **point}
+        if seed is not None:
+            kwargs["seed"] = seed
+        print(f"[SolverBench] Sweep point {_label(point)}: {', '.join(active)}")
+        summaries = {name: SolverSummary(puzzle, name) for name in active}
+        for result in iter_batch(puzzle, active, generate(**kwargs, stream=True), **run_options):
+            summaries[result["solver"]].add(result)
+            if on_result:
+                result["params"] = point
+                on_result(result)
+        for name, summary in summaries.items():
+            sweep[name].append((point, summary))
+            if summary.cases and summary.timed_out >= stop_fraction * summary.cases:
+                active.remove(name)
+                print(f"[SolverBench] '{name}' timed out on {summary.timed_out}/{summary.cases} "
+                      f"cases at {_label(point)}; skipping it for the rest of the sweep.")
+    return sweep
+
+
+def _series(rows, x_param: str):
+    """Split rows into series that differ only in x_param."""
+    series: Dict[tuple, list] = {}
+    for point, summary in rows:
+        key = tuple((k, v) for k, v in point.items() if k != x_param)
+        series.setdefault(key, []).append((point[x_param], summary))
+    return series
+
+
+def _censored_times(summary: SolverSummary, timeout_ms: Optional[float]) -> List[float]:
+    """Case times, counting timed-out cases as the full budget (a lower bound)."""
+    times = list(summary.times)
+    if timeout_ms:
+        times += [timeout_ms] * summary.timed_out
+    return times
+
+
+def render_sweep(puzzle: str, sweep, x_param: Optional[str],
+                 timeout_ms: Optional[float] = None) -> str:
+    """
+    Per-solver sweep report. With ``timeout_ms``, timed-out cases count as
+    the budget in the medians and fits ("≥" marks such lower bounds), so
+    a solver that starts timing out does not look faster than it is.
+    """
+    out = []
+    for solver, rows in sweep.items():
+        line = f"SolverBench Sweep — {puzzle} / {solver}\n{'-'*54}\n"
+        first_timeout = None
+        for point, s in rows:
+            times = _censored_times(s, timeout_ms)
+            ok = f"✓ {s.successes}/{s.cases}"
+            bound = " "
+            if s.timed_out:
+                ok += f"  ⌛ {s.timed_out} timed out"
+                first_timeout = first_timeout or (point, s)
+                bound = "≥" if timeout_ms else " "
+            timing = (f"median {bound}{median(times):9.3f} ms   "
+                      f"p90 {bound}{stats.percentile(times, 90):9.3f} ms"
+                      if times else f"{'n/a':>42}")
+            line += f"  {_label(point):<24} {timing}   {ok}\n"
+        if first_timeout:
+            point, s = first_timeout
+            line += f"⌛ starts timing out at {_label(point)} ({s.timed_out}/{s.cases} cases)\n"
+        else:
+            line += "⌛ no timeouts in the swept range\n"
+
+        if x_param:
+            for rest, points in _series(rows, x_param).items():
+                usable = [(x, _censored_times(s, timeout_ms)) for x, s in points
+                          if isinstance(x, (int, float))]
+                xs = [x for x, times in usable if times]
+                ys = [median(times) for x, times in usable if times]
+                fit = fit_growth(xs, ys)
+                where = f" ({' '.join(f'{k}={v}' for k, v in rest)})" if rest else ""
+                if fit is None:
+                    line += f"📈 {x_param}{where}: too few points to fit\n"
+                    continue
+                better = "power law" if fit["power_r2"] >= fit["exp_r2"] else "exponential"
+                line += (
+                    f"📈 {x_param}{where}: time ~ {x_param}^{fit['power']:.2f} "
+                    f"(R²={fit['power_r2']:.3f})   time ~ e^({fit['exp_rate']:.3f}·{x_param}) "
+                    f"(R²={fit['exp_r2']:.3f})   best fit: {better}\n"
+                )
+        out.append(line)
+    return "\n".join(out)
@@ -2,38 +2,127 @@
 Mastermind Solver (Elimination, GameSession-based)
 ---------------------------------------------------
 Constraint-based approach using feedback-only GameSession.
+Candidates are kept as a bytemask over code indices and filtered with the
+shared precomputed feedback table.
+
+The batch entry point (with NumPy) plays a whole chunk of games in
+lockstep: every round, each unfinished game makes its guess and all of
+their bytemasks are filtered in one FeedbackTable.filter_batch call.
+
+"elimination_async" is the same strategy against an async session, for
+the interactive mode (--interactive).
 """
 
-import itertools
 import random
-from copy import deepcopy
-from typing import List
-from puzzles.mastermind import COLORS, CODE_LENGTH, MastermindSession, peg_feedback
+from typing import Dict, Generator, List, Tuple
+
+from puzzles.mastermind import (
+    HAVE_NUMPY, AsyncMastermindSession, MastermindSession, encode_feedback, feedback_table,
+    load_numpy, sample_mask_members,
+)
 from core.registry import register_solver
 
-ALL_CODES = ["".join(p) for p in itertools.product(COLORS, repeat=CODE_LENGTH)]
+# cap on the stacked bytemasks of one lockstep group
+BATCH_BYTES = 64 * 1024 * 1024
 
-@register_solver("mastermind", "elimination")
-def solve_mastermind(session: MastermindSession) -> List[str]:
-    candidates = deepcopy(ALL_CODES)
-    guesses: List[str] = []
 
-    current_guess = random.choice(candidates)
+def _play_lockstep(sessions: List[MastermindSession]) -> List[List[str]]:
+    """Play games of one variant together; returns each game's guesses."""
+    np = load_numpy()
+
+    table = feedback_table(sessions[0].colors, sessions[0].length)
+    masks = np.ones((len(sessions), table.n_codes), dtype=np.uint8)
+    guesses: List[List[str]] = [[] for _ in sessions]
+    current = [random.randrange(table.n_codes) for _ in sessions]
+    active = list(range(len(sessions)))
 
-    while len(guesses) < session.max_guesses:
-        guesses.append(current_guess)
-        blacks, whites = session.guess(current_guess)
-        if blacks == CODE_LENGTH:
+    while active:
+        playing, feedbacks = [], []
+        for k in active:
+            session = sessions[k]
+            guesses[k].append(table.code(current[k]))
+            blacks, whites = session.guess(guesses[k][-1])
+            if blacks != session.length and len(guesses[k]) < session.max_guesses:
+                playing.append(k)
+                feedbacks.append(encode_feedback(blacks, whites, session.length))
+        if not playing:
             break
 
-        candidates = [
-            code for code in candidates
-            if peg_feedback(current_guess, code) == (blacks, whites)
-        ]
+        masks[playing] = table.filter_batch(masks[playing], [current[k] for k in playing], feedbacks)
+        active = []
+        for k in playing:
+            remaining = np.flatnonzero(masks[k])
+            if len(remaining):
+                current[k] = int(remaining[random.randrange(len(remaining))])
+                active.append(k)
+    return guesses
 
 
-        if not candidates:
-            break
-        current_guess = random.choice(candidates)
+def solve_mastermind_batch(sessions: List[MastermindSession]) -> List[List[str]]:
+    variants: Dict[Tuple[Tuple[str, ...], int], List[int]] = {}
+    for k, session in enumerate(sessions):
+        variants.setdefault((tuple(session.colors), session.length), []).append(k)
 
-    return guesses
+    outputs: List[List[str]] = [[] for _ in sessions]
+    for (colors, length), indices in variants.items():
+        group = max(1, BATCH_BYTES // len(colors) ** length)
+        for start in range(0, len(indices), group):
+            part = indices[start:start + group]
+            for k, played in zip(part, _play_lockstep([sessions[k] for k in part])):
+                outputs[k] = played
+    return outputs
+
+
+def _prepare(session: MastermindSession) -> None:
+    """Build the feedback table, and load numpy for the batch entry point, before timing."""
+    feedback_table(session.colors, session.length)
+    if HAVE_NUMPY:
+        load_numpy()
+
+
+def _eliminate(session) -> Generator[str, Tuple[int, int], None]:
+    """
+    The strategy, shared by the sync and async entry points: yields each
+    guess and is sent its (blacks, whites) feedback, until the code is
+    found, the guesses run out or no candidate is left.
+    """
+    table = feedback_table(session.colors, session.length)
+    candidates = table.all_candidates()
+    current_guess = random.randrange(table.n_codes)
+
+    for _ in range(session.max_guesses):
+        blacks, whites = yield table.code(current_guess)
+        if blacks == session.length:
+            return
+
+        candidates = table.filter(candidates, current_guess, encode_feedback(blacks, whites, session.length))
+
+        remaining = sample_mask_members(candidates, 1)
+        if not remaining:
+            return
+        current_guess = remaining[0]
+
+
+@register_solver("mastermind", "elimination",
+                 batch=solve_mastermind_batch if HAVE_NUMPY else None, prepare=_prepare)
+def solve_mastermind(session: MastermindSession) -> List[str]:
+    guesses: List[str] = []
+    strategy = _eliminate(session)
+    try:
+        guesses.append(next(strategy))
+        while True:
+            guesses.append(strategy.send(session.guess(guesses[-1])))
+    except StopIteration:
+        return guesses
+
+
+@register_solver("mastermind", "elimination_async")
+async def solve_mastermind_async(session: AsyncMastermindSession) -> List[str]:
+    guesses: List[str] = []
+    strategy = _eliminate(session)
+    try:
+        guesses.append(next(strategy))
+        while True:
+            guesses.append(strategy.send(await session.guess(guesses[-1])))
+    except StopIteration:
+        return guesses
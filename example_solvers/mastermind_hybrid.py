@@ -5,64 +5,56 @@ Adds detailed debug prints to trace candidate counts,
 branch decisions, and entropy sampling each iteration.
 """
 
-import itertools
 import random
 from typing import List
-from collections import defaultdict
-from puzzles.mastermind import COLORS, CODE_LENGTH, MastermindSession, peg_feedback
+from puzzles.mastermind import (
+    MastermindSession, encode_feedback, feedback_table, sample_mask_members,
+)
 from core.registry import register_solver
 
-ALL_CODES = ["".join(p) for p in itertools.product(COLORS, repeat=CODE_LENGTH)]
 
 @register_solver("mastermind", "hybrid")
 def solve_mastermind(session: MastermindSession) -> List[str]:
-    candidates = ALL_CODES.copy()
+    table = feedback_table(session.colors, session.length)
+    mask = table.all_candidates()
     guesses: List[str] = []
 
-    def sample_entropy(guess: str, pool: List[str], sample_size: int = 80):
-        """Estimate entropy by sampling from the candidate pool only."""
-        if not pool:
+    def sample_entropy(guess: int, sample: List[int]):
+        """Estimate entropy over a sample of the candidate pool only."""
+        if not sample:
             return 0.0
-        if len(pool) <= sample_size:
-            sample = pool
-        else:
-            sample = random.sample(pool, sample_size)
-        partitions = defaultdict(int)
-        for code in sample:
-            partitions[peg_feedback(guess, code)] += 1
+        partitions = table.partition_counts(guess, sample)
         total = len(sample)
         if total == 0:
             return 0.0
         entropy = -sum((count / total) ** 2 for count in partitions.values())
         return entropy
 
-    current_guess = random.choice(candidates)
+    current_guess = random.randrange(table.n_codes)
 
     while len(guesses) < session.max_guesses:
-        guesses.append(current_guess)
-        blacks, whites = session.guess(current_guess)
+        guesses.append(table.code(current_guess))
+        blacks, whites = session.guess(guesses[-1])
 
-        if blacks == CODE_LENGTH:
+        if blacks == session.length:
             break
 
         # keep only codes consistent with current feedback
-        old_len = len(candidates)
-        candidates = [
-            code for code in candidates
-            if peg_feedback(current_guess, code) == (blacks, whites)
-        ]
+        mask = table.filter(mask, current_guess, encode_feedback(blacks, whites, session.length))
+        remaining = mask.count(1)
 
-        if not candidates:
+        if not remaining:
             break
 
-        if len(candidates) <= 10:
+        if remaining <= 10:
             # small pool → random elimination is fine
-            current_guess = random.choice(candidates)
+            current_guess = sample_mask_members(mask, 1)[0]
         else:
-            # score a small random subset of *candidates*
-            subset_size = min(60, len(candidates))
-            options = random.sample(candidates, subset_size)
-            scored = [(sample_entropy(g, candidates), g) for g in options]
+            # score a small random subset of *candidates* on one shared
+            # sample of 80, drawn chunk by chunk from the bytemask
+            options = sample_mask_members(mask, 60)
+            sample = sample_mask_members(mask, 80)
+            scored = [(sample_entropy(g, sample), g) for g in options]
             current_guess = max(scored, key=lambda x: x[0])[1]
 
     return guesses
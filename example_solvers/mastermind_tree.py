@@ -0,0 +1,194 @@
+"""
+Mastermind Solvers (Exact Minimax / Max-Entropy, Cached Decision Tree)
+----------------------------------------------------------------------
+Knuth-style minimax and true max-entropy strategies, scored over every
+possible guess with the shared feedback table. The full decision tree
+(which guess to play after each feedback path) is built once per game
+configuration and strategy, then cached as JSON under results/cache/, so
+solving a session is just a walk down the tree. Building or loading the
+tree happens in the solvers' prepare hook, before timing starts.
+
+Cache files are keyed by colors, code length, strategy and a hash of the
+feedback and tree-building code, so editing any of those rebuilds them.
+Exact trees are limited to variants of at most EXACT_LIMIT codes.
+"""
+
+import hashlib
+import inspect
+import json
+import math
+import os
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Sequence, Tuple
+
+from core import results_dir
+from core.registry import register_solver
+from puzzles.mastermind import (
+    FeedbackTable, MastermindSession, encode_feedback, feedback_table, peg_feedback,
+)
+
+EXACT_LIMIT = 4096
+CACHE_DIR = os.environ.get("SOLVERBENCH_CACHE_DIR", results_dir("cache"))
+
+# node = (guess index, {feedback: child node}); leaves have no children
+Node = Tuple[int, Dict[int, "Node"]]
+_trees: Dict[Tuple[Tuple[str, ...], int, str], Node] = {}
+
+
+# ----------------------------------------------------------------------
+# Tree construction
+# ----------------------------------------------------------------------
+def _root_guesses(table: FeedbackTable) -> List[int]:
+    """
+    One guess per color-multiplicity pattern (e.g. AABB, ABCD for 6x4).
+
+    Against the full code space every guess with the same pattern splits
+    the candidates identically, so these are the only ones worth scoring.
+    """
+    k, length = len(table.colors), table.length
+    guesses = []
+
+    def patterns(remaining: int, largest: int, parts: List[int]):
+        if remaining == 0:
+            if len(parts) <= k:
+                digits = [d for d, size in enumerate(parts) for _ in range(size)]
+                guesses.append(table.index("".join(table.colors[d] for d in digits)))
+            return
+        for size in range(min(remaining, largest), 0, -1):
+            patterns(remaining - size, size, parts + [size])
+
+    patterns(length, length, [])
+    return sorted(guesses)
+
+
+def _score(strategy: str, counts: Counter) -> float:
+    """Lower is better for both strategies."""
+    if strategy == "minimax":
+        return max(counts.values())
+    n = sum(counts.values())
+    # negative entropy: sum(c log c) / n - log n
+    return sum(c * math.log2(c) for c in counts.values()) / n - math.log2(n)
+
+
+def _best_guess(table: FeedbackTable, candidates: List[int], pool: Sequence[int],
+                strategy: str) -> int:
+    """Best-scoring guess; ties prefer a possible secret, then the lowest index."""
+    pick = itemgetter(*candidates)
+    candidate_set = set(candidates)
+    best_key, best = None, None
+    for g in pool:
+        values = pick(table.row(g))
+        counts = Counter(values if len(candidates) > 1 else (values,))
+        key = (_score(strategy, counts), g not in candidate_set, g)
+        if best_key is None or key < best_key:
+            best_key, best = key, g
+    return best
+
+
+def _build_tree(table: FeedbackTable, candidates: List[int], strategy: str,
+                pool: Sequence[int]) -> Node:
+    if len(candidates) == 1:
+        return candidates[0], {}
+    guess = _best_guess(table, candidates, pool, strategy)
+    row = table.row(guess)
+    groups: Dict[int, List[int]] = {}
+    for c in candidates:
+        groups.setdefault(row[c], []).append(c)
+    solved = encode_feedback(table.length, 0, table.length)
+    everything = range(table.n_codes)
+    return guess, {
+        f: _build_tree(table, group, strategy, everything)
+        for f, group in sorted(groups.items()) if f != solved
+    }
+
+
+# ----------------------------------------------------------------------
+# Disk cache
+# ----------------------------------------------------------------------
+def _code_hash() -> str:
+    """Hash of everything that determines a tree's contents."""
+    sources = [peg_feedback, encode_feedback, FeedbackTable.__init__, FeedbackTable.row,
+               _root_guesses, _score, _best_guess, _build_tree]
+    digest = hashlib.sha256()
+    for obj in sources:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()[:16]
+
+
+def _cache_path(colors: Sequence[str], length: int, strategy: str) -> str:
+    return os.path.join(CACHE_DIR, "mastermind",
+                        f"{strategy}-{''.join(colors)}-{length}-{_code_hash()}.json")
+
+
+def _to_json(node: Node):
+    guess, children = node
+    return [guess, {str(f): _to_json(child) for f, child in children.items()}]
+
+
+def _from_json(data) -> Node:
+    guess, children = data
+    return guess, {int(f): _from_json(child) for f, child in children.items()}
+
+
+def decision_tree(colors: Sequence[str], length: int, strategy: str) -> Node:
+    """Decision tree for a configuration, from memory, disk, or built fresh."""
+    if strategy not in ("minimax", "entropy"):
+        raise ValueError(f"Unknown strategy '{strategy}'.")
+    key = (tuple(colors), length, strategy)
+    if key in _trees:
+        return _trees[key]
+
+    path = _cache_path(colors, length, strategy)
+    if os.path.exists(path):
+        with open(path) as fh:
+            tree = _from_json(json.load(fh))
+    else:
+        table = feedback_table(colors, length)
+        if table.n_codes > EXACT_LIMIT:
+            raise ValueError(
+                f"{len(colors)} colors x {length} pegs has {table.n_codes} codes; "
+                f"exact trees are limited to {EXACT_LIMIT}."
+            )
+        tree = _build_tree(table, list(range(table.n_codes)), strategy, _root_guesses(table))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(_to_json(tree), fh, separators=(",", ":"))
+        os.replace(tmp, path)  # atomic, so parallel workers never see half a file
+    _trees[key] = tree
+    return tree
+
+
+# ----------------------------------------------------------------------
+# Solvers
+# ----------------------------------------------------------------------
+def _walk(session: MastermindSession, strategy: str) -> List[str]:
+    table = feedback_table(session.colors, session.length)
+    node = decision_tree(session.colors, session.length, strategy)
+    guesses: List[str] = []
+    while node is not None and len(guesses) < session.max_guesses:
+        guess, children = node
+        guesses.append(table.code(guess))
+        blacks, whites = session.guess(guesses[-1])
+        if blacks == session.length:
+            break
+        node = children.get(encode_feedback(blacks, whites, session.length))
+    return guesses
+
+
+def _prepare(strategy: str):
+    def prepare(session: MastermindSession) -> None:
+        feedback_table(session.colors, session.length)
+        decision_tree(session.colors, session.length, strategy)
+    return prepare
+
+
+@register_solver("mastermind", "minimax", prepare=_prepare("minimax"))
+def solve_minimax(session: MastermindSession) -> List[str]:
+    return _walk(session, "minimax")
+
+
+@register_solver("mastermind", "entropy", prepare=_prepare("entropy"))
+def solve_entropy(session: MastermindSession) -> List[str]:
+    return _walk(session, "entropy")
@@ -4,14 +4,16 @@ Example Sudoku Solver (Backtracking)
 Classic recursive solver using the registry system.
 """
 
-from copy import deepcopy
+from core.metrics import counter
 from core.registry import register_solver
 from puzzles.sudoku import is_valid, find_empty, Board
 
+backtracks = counter("backtracks")
+
 
 @register_solver("sudoku", "backtracking")
 def solve_sudoku(board: Board):
-    board = deepcopy(board)
+    board = [row[:] for row in board]  # leave the caller's board untouched
     if _solve(board):
         return board
     return None
@@ -30,5 +32,6 @@ def _solve(board: Board) -> bool:
             if _solve(board):
                 return True
             board[row][col] = 0
+            backtracks.inc()
 
     return False
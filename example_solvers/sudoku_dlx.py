@@ -0,0 +1,18 @@
+"""
+Example Sudoku Solver (Dancing Links)
+-------------------------------------
+Treats Sudoku as an exact-cover problem and solves it with the generic
+DLX engine in core.exact_cover. The clues are pre-selected rows of a shared
+matrix, so hard, sparse boards cost no more to set up than easy ones.
+"""
+
+from core.registry import register_solver
+from puzzles.sudoku import Board, sudoku_exact_cover, clue_rows, rows_to_board
+
+
+@register_solver("sudoku", "dlx")
+def solve_dlx(board: Board):
+    solutions = sudoku_exact_cover().solve(limit=1, given=clue_rows(board))
+    if not solutions:
+        return None
+    return rows_to_board(solutions[0])
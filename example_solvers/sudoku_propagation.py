@@ -0,0 +1,124 @@
+"""
+Example Sudoku Solver (Constraint Propagation)
+----------------------------------------------
+Works on the bitmask BitBoard: repeatedly fills naked singles (cells with a
+single candidate) and hidden singles (digits with a single place in a unit),
+then branches on the cell with the fewest candidates (MRV) and undoes its
+placements from a trail when a branch fails.
+
+The batch entry point (with NumPy) fills singles on the whole chunk at
+once with propagate_batch, and only searches the boards that are left.
+"""
+
+import time
+from typing import List
+
+from core.metrics import counter
+from core.registry import register_solver
+from puzzles.sudoku import (
+    BitBoard, Board, UNITS, BIT_COUNT, MASK_DIGITS, ALL_DIGITS, HAVE_NUMPY, load_numpy,
+    propagate_batch,
+)
+
+backtracks = counter("backtracks")
+
+
+def solve_propagation_batch(boards: List[Board], charge=None) -> List:
+    np = load_numpy()
+    cells = propagate_batch(np.array(boards, dtype=np.uint8).reshape(-1, 81))
+    outputs = []
+    for k, row in enumerate(cells):
+        if row.all():
+            outputs.append(row.reshape(9, 9).tolist())
+            continue
+        start = time.perf_counter()
+        outputs.append(solve_propagation(row.reshape(9, 9).tolist()))
+        if charge:
+            charge(k, (time.perf_counter() - start) * 1000)
+    return outputs
+
+
+def _prepare(board: Board) -> None:
+    if HAVE_NUMPY:
+        load_numpy()  # before timing, not in the first batch
+
+
+@register_solver("sudoku", "propagation",
+                 batch=solve_propagation_batch if HAVE_NUMPY else None, prepare=_prepare)
+def solve_propagation(board: Board):
+    try:
+        bb = BitBoard.from_grid(board)
+    except ValueError:
+        return None
+    if _search(bb):
+        return bb.to_grid()
+    return None
+
+
+def _propagate(bb: BitBoard, trail: list) -> bool:
+    """Place naked and hidden singles until stuck. False on contradiction."""
+    cells = bb.cells
+    progress = True
+    while progress:
+        progress = False
+
+        # naked singles
+        for i in range(81):
+            if not cells[i]:
+                mask = bb.candidates(i)
+                if not mask:
+                    return False
+                if BIT_COUNT[mask] == 1:
+                    bb.place(i, MASK_DIGITS[mask][0])
+                    trail.append(i)
+                    progress = True
+
+        # hidden singles
+        for unit in UNITS:
+            once = twice = used = 0
+            for i in unit:
+                if cells[i]:
+                    used |= 1 << (cells[i] - 1)
+                else:
+                    mask = bb.candidates(i)
+                    twice |= once & mask
+                    once |= mask
+            if (once | used) != ALL_DIGITS:
+                return False  # some digit has nowhere to go in this unit
+            hidden = once & ~twice
+            for d in MASK_DIGITS[hidden]:
+                bit = 1 << (d - 1)
+                for i in unit:
+                    if not cells[i] and bb.candidates(i) & bit:
+                        bb.place(i, d)
+                        trail.append(i)
+                        progress = True
+                        break
+    return True
+
+
+def _search(bb: BitBoard) -> bool:
+    """Propagate, then branch on the most constrained cell."""
+    trail = []
+    if _propagate(bb, trail):
+        best, best_mask, best_count = -1, 0, 10
+        cells = bb.cells
+        for i in range(81):
+            if not cells[i]:
+                mask = bb.candidates(i)
+                if BIT_COUNT[mask] < best_count:
+                    best, best_mask, best_count = i, mask, BIT_COUNT[mask]
+                    if best_count == 2:
+                        break
+        if best < 0:
+            return True  # solved
+        for d in MASK_DIGITS[best_mask]:
+            bb.place(best, d)
+            if _search(bb):
+                return True
+            bb.unplace(best)
+            backtracks.inc()
+
+    for i in reversed(trail):
+        bb.unplace(i)
+    return False
@@ -5,14 +5,13 @@ Fills cells that have only one valid option, repeating until stuck.
 This isn't guaranteed to solve all puzzles, but it's very fast for easy ones.
 """
 
-from copy import deepcopy
 from core.registry import register_solver
 from puzzles.sudoku import is_valid, find_empty, Board
 
 
 @register_solver("sudoku", "scanfill")
 def solve_scanfill(board: Board):
-    board = deepcopy(board)
+    board = [row[:] for row in board]  # leave the caller's board untouched
 
     progress = True
     while progress:
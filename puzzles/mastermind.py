@@ -2,38 +2,256 @@
 Mastermind Puzzle Definition (Self-contained)
 ---------------------------------------------
 Encapsulates dataset generation, GameSession logic, and accuracy.
+
+The classic game (6 colors x 4 pegs) is the default, but every session
+carries its own colors, code length and guess limit, so larger variants
+(8 x 5 = 32768 codes, 10 x 6 = 1M codes) can be generated and solved.
+
+AsyncMastermindSession is the same game against an oracle that answers
+asynchronously (await session.guess(code)); LocalOracle simulates a
+remote one with configurable round-trip latency.
 """
 
+import asyncio
+import importlib.util
+import itertools
 import random
-from typing import List, Tuple
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+# only filter_batch needs numpy; it is imported on first use (load_numpy)
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+if TYPE_CHECKING:
+    import numpy as np
+
+from core import metrics
 from core.registry import register_puzzle
 
-# Configuration
+# Configuration (defaults for the classic game)
 COLORS = ["R", "G", "B", "Y", "P", "O"]
 CODE_LENGTH = 4
 MAX_GUESSES = 6
 
+# color symbols used when a variant asks for a number of colors
+PALETTE = "RGBYPOWKCMABDEFHIJLNQSTUVXZ"
+
+
+def make_colors(colors) -> List[str]:
+    """Accept a color count or an explicit sequence of color symbols."""
+    if isinstance(colors, int):
+        if not 2 <= colors <= len(PALETTE):
+            raise ValueError(f"Number of colors must be between 2 and {len(PALETTE)}.")
+        return list(PALETTE[:colors])
+    return list(colors)
+
+
+def default_max_guesses(n_colors: int, length: int) -> int:
+    """Guess limit for a variant: 6 for the classic game, more for bigger ones."""
+    return MAX_GUESSES + max(0, length - CODE_LENGTH) + max(0, (n_colors - len(COLORS)) // 2)
+
 
 # ----------------------------------------------------------------------
 # Feedback Logic
 # ----------------------------------------------------------------------
 def peg_feedback(guess: str, secret: str) -> Tuple[int, int]:
     """Compute Mastermind-style feedback (black and white pegs)."""
+    if metrics.counting:
+        metrics.count("peg_feedback")
     blacks = sum(g == s for g, s in zip(guess, secret))
-    guess_colors = {c: guess.count(c) for c in COLORS}
-    secret_colors = {c: secret.count(c) for c in COLORS}
-    total_color_matches = sum(min(guess_colors[c], secret_colors[c]) for c in COLORS)
+    total_color_matches = sum(min(guess.count(c), secret.count(c)) for c in set(guess))
     whites = total_color_matches - blacks
     return blacks, whites
 
 
+# ----------------------------------------------------------------------
+# Code indexing and precomputed feedback
+# ----------------------------------------------------------------------
+# Codes are numbered in itertools.product order (first peg most significant),
+# feedback (b, w) is packed into one byte as b * (length + 1) + w, and a
+# candidate set is a "bytemask": one byte per code, 1 if still possible.
+# Bytemasks are filtered lane-wise with bytes.translate and big-int AND,
+# so every operation runs over all codes at C speed. Nothing is ever stored
+# per code as a Python object, which keeps million-code variants cheap.
+_ROW_CACHE_BYTES = 64 * 1024 * 1024
+_EQ = [bytes(int(v == x) for v in range(256)) for x in range(256)]
+_MIN = [bytes(min(a, v) for v in range(256)) for a in range(16)]
+
+
+def encode_feedback(blacks: int, whites: int, length: int = CODE_LENGTH) -> int:
+    return blacks * (length + 1) + whites
+
+
+def decode_feedback(code: int, length: int = CODE_LENGTH) -> Tuple[int, int]:
+    return divmod(code, length + 1)
+
+
+class FeedbackTable:
+    """
+    Feedback for every (guess, secret) code pair, one uint8 per pair.
+
+    Rows are computed on first use (or all at once with build()) and cached
+    up to a fixed memory budget; use feedback_table() to get the shared
+    instance for a configuration.
+    """
+
+    def __init__(self, colors: Sequence[str] = COLORS, length: int = CODE_LENGTH):
+        self.colors = tuple(colors)
+        self.length = length
+        self.n_codes = len(self.colors) ** length
+        self._color_index = {c: i for i, c in enumerate(self.colors)}
+        self._rows: Dict[int, bytes] = {}
+        self._max_rows = max(1, _ROW_CACHE_BYTES // self.n_codes)
+        k = len(self.colors)
+        # digit of every code at each position, and per-color counts, as byte lanes;
+        # position p cycles through the colors in blocks of k ** (length - 1 - p)
+        digits = []
+        for p in range(length):
+            block = k ** (length - 1 - p)
+            cycle = b"".join(bytes([d]) * block for d in range(k))
+            digits.append(cycle * (self.n_codes // len(cycle)))
+        self._digits = digits
+        self._color_counts = [
+            sum(int.from_bytes(d.translate(_EQ[c]), "big") for d in digits).to_bytes(self.n_codes, "big")
+            for c in range(k)
+        ]
+
+    def index(self, code: str) -> int:
+        """Code string -> integer index."""
+        i = 0
+        k = len(self.colors)
+        for ch in code:
+            i = i * k + self._color_index[ch]
+        return i
+
+    def code(self, index: int) -> str:
+        """Integer index -> code string."""
+        k = len(self.colors)
+        chars = []
+        for _ in range(self.length):
+            index, d = divmod(index, k)
+            chars.append(self.colors[d])
+        return "".join(reversed(chars))
+
+    def row(self, guess: int) -> bytes:
+        """Encoded feedback of guess against every secret, as n_codes bytes."""
+        row = self._rows.get(guess)
+        if row is None:
+            n = self.n_codes
+            gd = [self._digits[p][guess] for p in range(self.length)]
+            blacks = sum(int.from_bytes(self._digits[p].translate(_EQ[d]), "big")
+                         for p, d in enumerate(gd))
+            matches = sum(int.from_bytes(self._color_counts[c].translate(_MIN[a]), "big")
+                          for c, a in Counter(gd).items())
+            # b * (L + 1) + w == b * L + (b + w); lanes never overflow a byte
+            row = (blacks * self.length + matches).to_bytes(n, "big")
+            if len(self._rows) >= self._max_rows:
+                del self._rows[next(iter(self._rows))]  # evict the oldest row
+            self._rows[guess] = row
+        return row
+
+    def build(self) -> "FeedbackTable":
+        """Compute every row up front (only sensible for small variants)."""
+        for g in range(self.n_codes):
+            self.row(g)
+        return self
+
+    def matrix(self) -> bytes:
+        """The full n_codes x n_codes table, row-major."""
+        return b"".join(self.row(g) for g in range(self.n_codes))
+
+    # -- bytemask candidate sets -------------------------------------------
+    def all_candidates(self) -> bytes:
+        return b"\x01" * self.n_codes
+
+    def filter(self, mask: bytes, guess: int, feedback: int) -> bytes:
+        """Keep the candidates that would have produced ``feedback`` for ``guess``."""
+        if metrics.counting:
+            metrics.count("filter")
+        hits = self.row(guess).translate(_EQ[feedback])
+        return (int.from_bytes(mask, "big") & int.from_bytes(hits, "big")).to_bytes(self.n_codes, "big")
+
+    def filter_batch(self, masks: "np.ndarray", guesses: Sequence[int],
+                     feedbacks: Sequence[int]) -> "np.ndarray":
+        """
+        filter() for many games at once (needs NumPy): ``masks`` is an
+        (N, n_codes) uint8 stack of bytemasks, one guess and feedback per row.
+        """
+        np = load_numpy()
+        if metrics.counting:
+            metrics.count("filter", len(guesses))
+        rows = np.frombuffer(b"".join(self.row(int(g)) for g in guesses), dtype=np.uint8)
+        hits = rows.reshape(len(guesses), self.n_codes) == np.asarray(feedbacks, dtype=np.uint8)[:, None]
+        return masks & hits
+
+    def is_solved(self, feedback: int) -> bool:
+        return feedback == encode_feedback(self.length, 0, self.length)
+
+    def partition_counts(self, guess: int, candidates: Sequence[int]) -> Counter:
+        """How the candidate indices split by feedback to ``guess``."""
+        row = self.row(guess)
+        return Counter(row[c] for c in candidates)
+
+
+def load_numpy():
+    """
+    Import numpy on first use and return it. Batch solvers call it from
+    their prepare hook, so the import never lands in a timed call.
+    """
+    import numpy as np
+
+    return np
+
+
+_tables: Dict[Tuple[Tuple[str, ...], int], FeedbackTable] = {}
+
+
+def feedback_table(colors: Sequence[str] = COLORS, length: int = CODE_LENGTH) -> FeedbackTable:
+    """Shared FeedbackTable for a color set and code length."""
+    key = (tuple(colors), length)
+    if key not in _tables:
+        _tables[key] = FeedbackTable(colors, length)
+    return _tables[key]
+
+
+def iter_mask_members(mask: bytes, chunk_size: int = 65536):
+    """Indices set in a bytemask, produced in lists of at most chunk_size."""
+    for start in range(0, len(mask), chunk_size):
+        chunk = list(itertools.compress(range(start, start + chunk_size), mask[start:start + chunk_size]))
+        if chunk:
+            yield chunk
+
+
+def sample_mask_members(mask: bytes, k: int, chunk_size: int = 65536) -> List[int]:
+    """
+    Up to ``k`` distinct indices drawn at random from those set in a
+    bytemask (all of them if fewer are set), in index order. Members are
+    listed chunk by chunk and only up to the last one drawn, so a turn
+    never builds the full candidate list of a large variant.
+    """
+    count = mask.count(1)
+    ranks = sorted(random.sample(range(count), min(k, count)))
+    picked: List[int] = []
+    seen = 0
+    for chunk in iter_mask_members(mask, chunk_size):
+        while len(picked) < len(ranks) and ranks[len(picked)] < seen + len(chunk):
+            picked.append(chunk[ranks[len(picked)] - seen])
+        if len(picked) == len(ranks):
+            break
+        seen += len(chunk)
+    return picked
+
+
 # ----------------------------------------------------------------------
 # GameSession Class
 # ----------------------------------------------------------------------
 class MastermindSession:
     """Encapsulates the state and feedback for a single Mastermind game."""
-    def __init__(self, secret: str = None, max_guesses: int = MAX_GUESSES):
-        self.secret = secret or "".join(random.choices(COLORS, k=CODE_LENGTH))
+    def __init__(self, secret: str = None, max_guesses: int = MAX_GUESSES,
+                 colors: Sequence[str] = COLORS, length: int = CODE_LENGTH,
+                 rng: random.Random = None):
+        self.colors = make_colors(colors)
+        self.length = length
+        self.secret = secret or "".join((rng or random).choices(self.colors, k=length))
         self.max_guesses = max_guesses
         self.history = []
 
@@ -41,18 +259,113 @@ class MastermindSession:
         """Submit a guess and receive (blacks, whites) feedback."""
         if len(self.history) >= self.max_guesses:
             raise Exception("Max guesses exceeded.")
+        if metrics.counting:
+            metrics.count("guesses")
         feedback = peg_feedback(attempt, self.secret)
         self.history.append((attempt, feedback))
         return feedback
 
 
+# ----------------------------------------------------------------------
+# Async sessions
+# ----------------------------------------------------------------------
+class LocalOracle:
+    """
+    In-process oracle that answers after a simulated round trip of
+    ``latency_ms`` plus uniform jitter of up to ``jitter_ms``. Any object
+    with the same ``async feedback(guess)`` can stand in for it, e.g. a
+    client for a real remote service.
+    """
+
+    def __init__(self, secret: str, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rng: random.Random = None):
+        self.secret = secret
+        self.latency_ms, self.jitter_ms = latency_ms, jitter_ms
+        self.rng = rng or random
+
+    async def feedback(self, guess: str) -> Tuple[int, int]:
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        # sleep(0) still yields to the loop, like any real round trip would
+        await asyncio.sleep(delay / 1000)
+        return peg_feedback(guess, self.secret)
+
+
+class AsyncMastermindSession:
+    """A Mastermind game whose feedback comes from an awaitable oracle."""
+
+    def __init__(self, oracle, max_guesses: int = MAX_GUESSES,
+                 colors: Sequence[str] = COLORS, length: int = CODE_LENGTH):
+        self.oracle = oracle
+        self.colors = make_colors(colors)
+        self.length = length
+        self.max_guesses = max_guesses
+        self.history = []
+
+    async def guess(self, attempt: str) -> Tuple[int, int]:
+        """Submit a guess and await (blacks, whites) feedback."""
+        if len(self.history) >= self.max_guesses:
+            raise Exception("Max guesses exceeded.")
+        if metrics.counting:
+            metrics.count("guesses")
+        feedback = await self.oracle.feedback(attempt)
+        self.history.append((attempt, feedback))
+        return feedback
+
+
+def async_session(session: MastermindSession, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                  rng: random.Random = None) -> AsyncMastermindSession:
+    """The async twin of a session, answered by a LocalOracle."""
+    oracle = LocalOracle(session.secret, latency_ms, jitter_ms, rng)
+    played = AsyncMastermindSession(oracle, session.max_guesses, session.colors, session.length)
+    played.history = list(session.history)
+    return played
+
+
+# Input protocol: a session is frozen as an immutable tuple and thawed into a
+# new session, so no two solver calls ever share a history list.
+def freeze_session(session: MastermindSession) -> tuple:
+    return (session.secret, session.max_guesses, tuple(session.colors), session.length,
+            tuple(session.history))
+
+
+def thaw_session(frozen: tuple) -> MastermindSession:
+    secret, max_guesses, colors, length, history = frozen
+    session = MastermindSession(secret, max_guesses, colors, length)
+    session.history = list(history)
+    return session
+
+
 # ----------------------------------------------------------------------
 # Dataset Generator
 # ----------------------------------------------------------------------
-def generate_dataset(n: int = 45) -> Tuple[List[MastermindSession], List[str]]:
-    """Generate n random Mastermind sessions and their corresponding secrets."""
-    sessions = [MastermindSession() for _ in range(n)]
-    refs = [s.secret for s in sessions]
+def iter_dataset(n: int = 45, colors=COLORS, length: int = CODE_LENGTH,
+                 max_guesses: int = None, seed: int = None):
+    """Yield (session, secret) pairs one at a time; see generate_dataset()."""
+    colors = make_colors(colors)
+    if max_guesses is None:
+        max_guesses = default_max_guesses(len(colors), length)
+    rng = random.Random(seed)
+    for _ in range(n):
+        session = MastermindSession(max_guesses=max_guesses, colors=colors, length=length, rng=rng)
+        yield session, session.secret
+
+
+def generate_dataset(n: int = 45, colors=COLORS, length: int = CODE_LENGTH,
+                     max_guesses: int = None, seed: int = None, stream: bool = False):
+    """
+    Generate n random Mastermind sessions and their corresponding secrets.
+
+    ``colors`` is a color count or a sequence of symbols; ``max_guesses``
+    defaults to default_max_guesses() for the variant. ``stream`` returns an
+    iterator of (session, secret) pairs instead of two lists.
+    """
+    pairs = iter_dataset(n, colors, length, max_guesses, seed)
+    if stream:
+        return pairs
+    sessions, refs = [], []
+    for session, secret in pairs:
+        sessions.append(session)
+        refs.append(secret)
     return sessions, refs
 
 
@@ -66,10 +379,44 @@ def mastermind_accuracy(output: List[str], reference: str) -> float:
     return 1.0 if reference in output else 0.0
 
 
+# ----------------------------------------------------------------------
+# Binary record codec: the secret as a little-endian packed code index
+# ----------------------------------------------------------------------
+class MastermindCodec:
+    @staticmethod
+    def _variant(params: dict):
+        colors = make_colors(params.get("colors", COLORS))
+        length = params.get("length", CODE_LENGTH)
+        max_guesses = params.get("max_guesses") or default_max_guesses(len(colors), length)
+        return colors, length, max_guesses
+
+    def record_size(self, params: dict) -> int:
+        colors, length, _ = self._variant(params)
+        return max(1, ((len(colors) ** length - 1).bit_length() + 7) // 8)
+
+    def encode(self, case: MastermindSession, ref: str, params: dict) -> bytes:
+        colors, length, _ = self._variant(params)
+        index = 0
+        for ch in ref:
+            index = index * len(colors) + colors.index(ch)
+        return index.to_bytes(self.record_size(params), "little")
+
+    def decode(self, record: bytes, params: dict):
+        colors, length, max_guesses = self._variant(params)
+        index = int.from_bytes(record, "little")
+        chars = []
+        for _ in range(length):
+            index, d = divmod(index, len(colors))
+            chars.append(colors[d])
+        secret = "".join(reversed(chars))
+        return MastermindSession(secret, max_guesses, colors, length), secret
+
+
 # ----------------------------------------------------------------------
 # Puzzle Registration
 # ----------------------------------------------------------------------
-@register_puzzle("mastermind", accuracy_fn=mastermind_accuracy)
+@register_puzzle("mastermind", accuracy_fn=mastermind_accuracy, codec=MastermindCodec(),
+                 freeze=freeze_session, thaw=thaw_session, async_session=async_session)
 class _MastermindPuzzle:
     """Sentinel class to trigger decorator-based registration."""
     pass
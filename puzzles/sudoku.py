@@ -2,17 +2,207 @@
 Sudoku Puzzle Definition
 ------------------------
 Generates solved Sudoku boards and removes cells to create puzzles.
+
+Boards are exchanged as 9x9 lists of ints (0 = empty). Solvers that want a
+faster representation can convert to BitBoard, a flat 81-cell array with
+row/column/box digit bitmasks kept up to date on every place/unplace.
+With NumPy installed, propagate_batch fills singles on a whole stack of
+boards at once, for solvers with a batch entry point, and valid_boards
+checks a whole stack of finished boards.
 """
 
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import importlib.util
 import random
 
+# only the batch helpers need numpy; they import it on first use
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+if TYPE_CHECKING:
+    import numpy as np
+
+from core import metrics
+from core.exact_cover import ExactCover
+
 Board = List[List[int]]
 
+# ----------------------------------------------------------------------
+# Bitmask board
+# ----------------------------------------------------------------------
+# Cells are indexed 0..80 row-major; digit d is stored as bit (d - 1).
+ALL_DIGITS = 0x1FF
+ROW_OF = [i // 9 for i in range(81)]
+COL_OF = [i % 9 for i in range(81)]
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+UNITS = (
+    [[r * 9 + c for c in range(9)] for r in range(9)]
+    + [[r * 9 + c for r in range(9)] for c in range(9)]
+    + [[(b // 3) * 27 + (b % 3) * 3 + r * 9 + c for r in range(3) for c in range(3)]
+       for b in range(9)]
+)
+PEERS = [
+    sorted({j for u in UNITS if i in u for j in u} - {i})
+    for i in range(81)
+]
+BIT_COUNT = [bin(m).count("1") for m in range(ALL_DIGITS + 1)]
+MASK_DIGITS = [[d for d in range(1, 10) if m >> (d - 1) & 1] for m in range(ALL_DIGITS + 1)]
+
+
+class BitBoard:
+    """
+    Compact Sudoku board: 81 cells plus used-digit masks per row/col/box.
+
+    place/unplace update the masks incrementally, so candidates(i) is three
+    ORs instead of a scan of the row, column and box.
+    """
+    __slots__ = ("cells", "rows", "cols", "boxes")
+
+    def __init__(self):
+        self.cells = bytearray(81)
+        self.rows = [0] * 9
+        self.cols = [0] * 9
+        self.boxes = [0] * 9
+
+    @classmethod
+    def from_grid(cls, board: Board) -> "BitBoard":
+        """Build from a 9x9 list board. Raises ValueError on conflicting givens."""
+        bb = cls()
+        for i, d in enumerate(d for row in board for d in row):
+            if d:
+                if not bb.candidates(i) >> (d - 1) & 1:
+                    raise ValueError(f"Digit {d} conflicts at row {i // 9}, col {i % 9}.")
+                bb.place(i, d)
+        return bb
+
+    def to_grid(self) -> Board:
+        cells = self.cells
+        return [list(cells[r:r + 9]) for r in range(0, 81, 9)]
+
+    def copy(self) -> "BitBoard":
+        bb = BitBoard.__new__(BitBoard)
+        bb.cells = bytearray(self.cells)
+        bb.rows, bb.cols, bb.boxes = self.rows[:], self.cols[:], self.boxes[:]
+        return bb
+
+    def candidates(self, i: int) -> int:
+        """Bitmask of digits that can still go in (empty) cell i."""
+        return ALL_DIGITS & ~(self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]])
+
+    def place(self, i: int, d: int) -> None:
+        if metrics.counting:
+            metrics.count("place")
+        bit = 1 << (d - 1)
+        self.cells[i] = d
+        self.rows[ROW_OF[i]] |= bit
+        self.cols[COL_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+
+    def unplace(self, i: int) -> None:
+        if metrics.counting:
+            metrics.count("unplace")
+        keep = ~(1 << (self.cells[i] - 1))
+        self.cells[i] = 0
+        self.rows[ROW_OF[i]] &= keep
+        self.cols[COL_OF[i]] &= keep
+        self.boxes[BOX_OF[i]] &= keep
+
+    def empties(self) -> List[int]:
+        return [i for i, d in enumerate(self.cells) if not d]
+
+    def is_solved(self) -> bool:
+        return all(self.cells)
+
+
+# ----------------------------------------------------------------------
+# Batched candidate elimination (NumPy)
+# ----------------------------------------------------------------------
+# The same masks as BitBoard, for an (N, 81) uint8 stack of boards: every
+# step below works on all boards at once. Built by load_numpy().
+_NP_ROW_OF = _NP_COL_OF = _NP_BOX_OF = _NP_UNITS = None
+_NP_BIT_COUNT = _NP_SINGLE_DIGIT = _NP_DIGIT_BITS = None
+
+
+def load_numpy():
+    """
+    Import numpy and build the masks above on first use; returns numpy.
+    Batch solvers call it from their prepare hook, so neither cost lands
+    in a timed call.
+    """
+    global _NP_ROW_OF, _NP_COL_OF, _NP_BOX_OF, _NP_UNITS
+    global _NP_BIT_COUNT, _NP_SINGLE_DIGIT, _NP_DIGIT_BITS
+    import numpy as np
+
+    if _NP_UNITS is None:
+        _NP_ROW_OF, _NP_COL_OF, _NP_BOX_OF = np.array(ROW_OF), np.array(COL_OF), np.array(BOX_OF)
+        _NP_BIT_COUNT = np.array(BIT_COUNT, dtype=np.uint8)
+        # digit of a single-bit mask (0 for anything else)
+        _NP_SINGLE_DIGIT = np.array([MASK_DIGITS[m][0] if BIT_COUNT[m] == 1 else 0
+                                     for m in range(ALL_DIGITS + 1)], dtype=np.uint8)
+        _NP_DIGIT_BITS = np.array([0] + [1 << d for d in range(9)], dtype=np.uint16)
+        _NP_UNITS = np.array(UNITS)
+    return np
+
+
+def candidates_batch(cells: "np.ndarray") -> "np.ndarray":
+    """(N, 81) candidate bitmasks for an (N, 81) stack of cells; 0 where filled."""
+    np = load_numpy()
+    bits = _NP_DIGIT_BITS[cells]
+    rows = np.bitwise_or.reduce(bits.reshape(-1, 9, 9), axis=2)
+    cols = np.bitwise_or.reduce(bits.reshape(-1, 9, 9), axis=1)
+    boxes = np.bitwise_or.reduce(bits.reshape(-1, 3, 3, 3, 3), axis=(2, 4)).reshape(-1, 9)
+    used = rows[:, _NP_ROW_OF] | cols[:, _NP_COL_OF] | boxes[:, _NP_BOX_OF]
+    return np.where(cells == 0, ALL_DIGITS & ~used, 0).astype(np.uint16)
+
+
+def propagate_batch(cells: "np.ndarray") -> "np.ndarray":
+    """
+    Fill naked and hidden singles on an (N, 81) stack of boards until no
+    board makes progress; returns the filled stack (a new array).
+
+    Boards that hit a contradiction (an empty cell with no candidates, or
+    two singles placing the same digit in one unit) are left as they were
+    before that step, so a per-board search can report them.
+    """
+    if metrics.counting:
+        metrics.count("propagate_batch")
+    np = load_numpy()
+    cells = np.array(cells, dtype=np.uint8).reshape(-1, 81)
+    live = np.ones(len(cells), dtype=bool)
+    while live.any():
+        work = cells[live]
+        cand = candidates_batch(work)
+        empty = work == 0
+        dead = (empty & (cand == 0)).any(axis=1)
+
+        # naked singles
+        singles = empty & (_NP_BIT_COUNT[cand] == 1) & ~dead[:, None]
+        placed = np.where(singles, _NP_SINGLE_DIGIT[cand], work)
+
+        # hidden singles: a digit with exactly one place in a unit
+        unit_cand = cand[:, _NP_UNITS]                                    # (n, 27, 9)
+        has = (unit_cand[..., None] >> np.arange(9, dtype=np.uint16)) & 1  # (n, 27, 9, 9)
+        once = (has.sum(axis=2) == 1) & ~dead[:, None, None]              # (n, 27, 9)
+        board, unit, digit = np.nonzero(once)
+        cell = _NP_UNITS[unit, has[board, unit, :, digit].argmax(axis=1)]
+        placed[board, cell] = digit + 1
+
+        # simultaneous placements can clash on inconsistent boards: undo those
+        unit_cells = placed[:, _NP_UNITS]
+        unit_digits = np.bitwise_or.reduce(_NP_DIGIT_BITS[unit_cells], axis=2)
+        clash = (_NP_BIT_COUNT[unit_digits] != (unit_cells != 0).sum(axis=2)).any(axis=1)
+        placed[clash] = work[clash]
+
+        progress = (placed != work).any(axis=1)
+        cells[live] = placed
+        live[np.flatnonzero(live)[~progress]] = False
+    return cells
+
+
 # ----------------------------------------------------------------------
 # Basic Sudoku utilities
 # ----------------------------------------------------------------------
 def is_valid(board: Board, row: int, col: int, num: int) -> bool:
+    if metrics.counting:
+        metrics.count("is_valid")
     if num in board[row]:
         return False
     if num in [board[r][col] for r in range(9)]:
@@ -26,6 +216,8 @@ def is_valid(board: Board, row: int, col: int, num: int) -> bool:
 
 
 def find_empty(board: Board) -> Optional[tuple[int, int]]:
+    if metrics.counting:
+        metrics.count("find_empty")
     for r in range(9):
         for c in range(9):
             if board[r][c] == 0:
@@ -33,31 +225,72 @@ def find_empty(board: Board) -> Optional[tuple[int, int]]:
     return None
 
 
+# ----------------------------------------------------------------------
+# Exact cover formulation
+# ----------------------------------------------------------------------
+# Row id 9 * cell + (d - 1) places digit d in cell. Its four columns are
+# "cell filled", "digit in row", "digit in column" and "digit in box".
+_exact_cover: Optional[ExactCover] = None
+
+
+def _cover_columns(cell: int, d: int) -> List[int]:
+    r, c, b = ROW_OF[cell], COL_OF[cell], BOX_OF[cell]
+    return [cell, 81 + r * 9 + d - 1, 162 + c * 9 + d - 1, 243 + b * 9 + d - 1]
+
+
+def sudoku_exact_cover() -> ExactCover:
+    """Shared 729-row x 324-column Sudoku matrix, built on first use."""
+    global _exact_cover
+    if _exact_cover is None:
+        _exact_cover = ExactCover(324, [_cover_columns(i, d) for i in range(81) for d in range(1, 10)])
+    return _exact_cover
+
+
+def clue_rows(board: Board) -> List[int]:
+    """Exact-cover row ids for the filled cells of a board."""
+    return [i * 9 + d - 1 for i, d in enumerate(d for row in board for d in row) if d]
+
+
+def rows_to_board(rows: List[int]) -> Board:
+    cells = [0] * 81
+    for row_id in rows:
+        cells[row_id // 9] = row_id % 9 + 1
+    return [cells[r:r + 9] for r in range(0, 81, 9)]
+
+
+def count_solutions(board: Board, limit: int = 2) -> int:
+    """
+    Count the completions of a board, stopping at ``limit`` (<= 0: count all).
+
+    count_solutions(puzzle) == 1 is the uniqueness check a generator needs.
+    """
+    return sudoku_exact_cover().count(limit, given=clue_rows(board))
+
+
 # ----------------------------------------------------------------------
 # Generator: build a complete solved board using backtracking
 # ----------------------------------------------------------------------
-def _fill_board(board: Board) -> bool:
-    empty = find_empty(board)
-    if not empty:
+def _fill_board(bb: BitBoard, pos: int = 0) -> bool:
+    while pos < 81 and bb.cells[pos]:
+        pos += 1
+    if pos == 81:
         return True
-    row, col = empty
-    nums = list(range(1, 10))
+    nums = MASK_DIGITS[bb.candidates(pos)][:]
     random.shuffle(nums)
     for num in nums:
-        if is_valid(board, row, col, num):
-            board[row][col] = num
-            if _fill_board(board):
-                return True
-            board[row][col] = 0
+        bb.place(pos, num)
+        if _fill_board(bb, pos + 1):
+            return True
+        bb.unplace(pos)
     return False
 
 
 def generate_solved_board(seed: Optional[int] = None) -> Board:
     if seed is not None:
         random.seed(seed)
-    board = [[0 for _ in range(9)] for _ in range(9)]
-    _fill_board(board)
-    return board
+    bb = BitBoard()
+    _fill_board(bb)
+    return bb.to_grid()
 
 
 # ----------------------------------------------------------------------
@@ -73,34 +306,272 @@ def make_puzzle(board: Board, holes: int = 40) -> Board:
     return puzzle
 
 
+# ----------------------------------------------------------------------
+# Fast generation: symmetry transforms + uniqueness-preserving clue removal
+# ----------------------------------------------------------------------
+# Every valid grid maps to another valid grid under digit relabeling,
+# row/column permutations within a band/stack, band/stack permutations and
+# transposition, so a handful of seeds covers a huge space of solutions
+# without any search.
+SEED_GRIDS = (
+    "365897241784261935129534786692713854473658129518429673837946512951372468246185397",
+    "389124657475368921126579348863751294514982763792643815631497582948235176257816439",
+    "412368957375419826689752431968523174157846293243971685521697348894135762736284519",
+    "825371694764958312139264875386149527512837469947526183493612758251783946678495231",
+    "237986514985471236641352897124893765893567421576214389368749152759128643412635978",
+    "267593814831642795459871623143285976985467132672319548728954361316728459594136287",
+)
+
+# difficulty -> clue count to stop removing at (comments: technique it needs)
+DIFFICULTIES = {
+    "easy": 38,    # naked singles alone finish it
+    "medium": 30,  # needs hidden singles
+    "hard": 0,     # minimal puzzle that singles cannot finish
+}
+
+
+def _band_order(rng: random.Random) -> List[int]:
+    """Random row (or column) order that keeps bands (stacks) together."""
+    bands = rng.sample(range(3), 3)
+    return [b * 3 + i for b in bands for i in rng.sample(range(3), 3)]
+
+
+def transform_grid(cells: List[int], rng: random.Random) -> List[int]:
+    """Apply a random validity-preserving symmetry to a flat 81-cell grid."""
+    rows, cols = _band_order(rng), _band_order(rng)
+    relabel = [0] + rng.sample(range(1, 10), 9)
+    out = [relabel[cells[r * 9 + c]] for r in rows for c in cols]
+    if rng.random() < 0.5:
+        out = [out[c * 9 + r] for r in range(9) for c in range(9)]
+    return out
+
+
+def random_solved_cells(rng: random.Random) -> List[int]:
+    """A random solved grid as a flat list, via transforms of a seed grid."""
+    return transform_grid([int(ch) for ch in rng.choice(SEED_GRIDS)], rng)
+
+
+def _solve_by_singles(bb: BitBoard, hidden: bool) -> bool:
+    """Fill naked (and optionally hidden) singles in place. True if that solves the board."""
+    cells = bb.cells
+    progress = True
+    while progress:
+        progress = False
+        for i in range(81):
+            if not cells[i]:
+                mask = bb.candidates(i)
+                if BIT_COUNT[mask] == 1:
+                    bb.place(i, MASK_DIGITS[mask][0])
+                    progress = True
+        if hidden and not progress:
+            for unit in UNITS:
+                once = twice = 0
+                for i in unit:
+                    if not cells[i]:
+                        mask = bb.candidates(i)
+                        twice |= once & mask
+                        once |= mask
+                for d in MASK_DIGITS[once & ~twice]:
+                    bit = 1 << (d - 1)
+                    for i in unit:
+                        if not cells[i] and bb.candidates(i) & bit:
+                            bb.place(i, d)
+                            progress = True
+                            break
+    return bb.is_solved()
+
+
+def rate_difficulty(board: Board) -> str:
+    """
+    Rate a (uniquely solvable) puzzle by the techniques needed to solve it:
+    "easy" (naked singles), "medium" (hidden singles) or "hard" (search).
+    """
+    bb = BitBoard.from_grid(board)
+    if _solve_by_singles(bb.copy(), hidden=False):
+        return "easy"
+    if _solve_by_singles(bb, hidden=True):
+        return "medium"
+    return "hard"
+
+
+def remove_clues(solution: List[int], rng: random.Random, min_clues: int = 0,
+                 symmetric: bool = True) -> List[int]:
+    """
+    Remove clues from a flat solved grid while the puzzle stays unique.
+
+    Cells are tried in random order (in 180-degree-symmetric pairs when
+    ``symmetric``) until ``min_clues`` remain or nothing more can go. If
+    naked/hidden singles still solve the puzzle it is unique without a
+    solver call; otherwise the DLX solution counter decides.
+    """
+    cells = solution[:]
+    order = rng.sample(range(41), 41) if symmetric else rng.sample(range(81), 81)
+    clues = 81
+    for i in order:
+        group = {i, 80 - i} if symmetric else {i}
+        if clues - len(group) < min_clues:
+            continue
+        saved = [(j, cells[j]) for j in group]
+        for j in group:
+            cells[j] = 0
+        bb = BitBoard.from_grid([cells[r:r + 9] for r in range(0, 81, 9)])
+        if _solve_by_singles(bb, hidden=True) or sudoku_exact_cover().count(
+                2, given=[k * 9 + d - 1 for k, d in enumerate(cells) if d]) == 1:
+            clues -= len(group)
+        else:
+            for j, d in saved:
+                cells[j] = d
+    return cells
+
+
+def generate_puzzle(rng: random.Random, difficulty: str = "medium",
+                    attempts: int = 20) -> Tuple[Board, Board, str]:
+    """
+    Generate one unique-solution puzzle of the requested difficulty.
+
+    Returns (puzzle, solution, rating). If no attempt lands on the requested
+    rating, the last attempt is returned with its actual rating.
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty '{difficulty}', expected one of {list(DIFFICULTIES)}.")
+    for _ in range(attempts):
+        solution = random_solved_cells(rng)
+        cells = remove_clues(solution, rng, DIFFICULTIES[difficulty])
+        puzzle = [cells[r:r + 9] for r in range(0, 81, 9)]
+        rating = rate_difficulty(puzzle)
+        if rating == difficulty:
+            break
+    return puzzle, [solution[r:r + 9] for r in range(0, 81, 9)], rating
+
+
 # ----------------------------------------------------------------------
 # Convenience wrappers for benchmarking
 # ----------------------------------------------------------------------
-def generate_dataset(n: int = 45, holes: int = 40) -> tuple[list[Board], list[Board]]:
-    """Return (puzzles, solutions) pair lists."""
-    puzzles, solutions = [], []
+def iter_dataset(n: int = 45, holes: int = 40, difficulty: Optional[str] = None,
+                 seed: Optional[int] = None):
+    """Yield (puzzle, solution, rating) one at a time; see generate_dataset()."""
+    rng = random.Random(seed)
     for i in range(n):
-        solved = generate_solved_board()
-        puzzle = make_puzzle(solved, holes)
+        if difficulty is None:
+            solved = random_solved_cells(rng)
+            cells = solved[:]
+            for pos in rng.sample(range(81), min(holes, 81)):
+                cells[pos] = 0
+            yield ([cells[r:r + 9] for r in range(0, 81, 9)],
+                   [solved[r:r + 9] for r in range(0, 81, 9)], None)
+        else:
+            yield generate_puzzle(rng, difficulty)
+
+
+def generate_dataset(n: int = 45, holes: int = 40, difficulty: Optional[str] = None,
+                     seed: Optional[int] = None, with_ratings: bool = False,
+                     stream: bool = False):
+    """
+    Return (puzzles, solutions) pair lists.
+
+    Without ``difficulty``, ``holes`` random cells are blanked (the puzzle may
+    have several solutions). With ``difficulty`` ("easy", "medium", "hard")
+    every puzzle has a unique solution and the requested rating. The same
+    ``seed`` always yields the same dataset. ``with_ratings`` appends a third
+    list with each puzzle's difficulty rating. ``stream`` returns an iterator
+    of (puzzle, solution) pairs instead, generated on demand.
+    """
+    records = iter_dataset(n, holes, difficulty, seed)
+    if stream:
+        return ((puzzle, solution) for puzzle, solution, _ in records)
+    puzzles, solutions, ratings = [], [], []
+    for puzzle, solution, rating in records:
         puzzles.append(puzzle)
-        solutions.append(solved)
+        solutions.append(solution)
+        ratings.append(rating)
+    if with_ratings:
+        return puzzles, solutions, ratings
     return puzzles, solutions
 
 # ----------------------------------------------------------------------
 # Accuracy function for Sudoku
 # ----------------------------------------------------------------------
+_DIGIT_SET = set(range(1, 10))
+
+
+def _is_grid(output) -> bool:
+    return (isinstance(output, list) and len(output) == 9
+            and all(isinstance(row, list) and len(row) == 9 for row in output))
+
+
 def sudoku_accuracy(output, reference):
     # Require complete, valid board, not necessarily identical.
-    from puzzles.sudoku import find_empty, is_valid
-    if find_empty(output) is not None:
+    if not _is_grid(output):
         return 0.0
-    for r in range(9):
-        for c in range(9):
-            if not is_valid(output, r, c, output[r][c]):
-                return 0.0
-    # Optionally completed board, can be different from reference.
-    return 1.0
+    cells = [d for row in output for d in row]
+    # every unit must hold each digit once; the board may differ from the reference
+    try:
+        return 1.0 if all({cells[i] for i in unit} == _DIGIT_SET for unit in UNITS) else 0.0
+    except TypeError:  # unhashable cell
+        return 0.0
+
+
+def valid_boards(boards: "np.ndarray") -> "np.ndarray":
+    """
+    Validate an (N, 9, 9) stack of boards in a few array operations: a
+    board is valid if each of its 27 rows, columns and boxes, sorted, is
+    1..9. Returns an (N,) bool array.
+    """
+    np = load_numpy()
+    boards = np.asarray(boards).reshape(-1, 9, 9)
+    boxes = boards.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+    units = np.concatenate([boards, boards.transpose(0, 2, 1), boxes], axis=1)
+    return (np.sort(units, axis=2) == np.arange(1, 10)).all(axis=(1, 2))
+
+
+def sudoku_accuracy_batch(outputs, references) -> List[float]:
+    """sudoku_accuracy for many outputs at once, via valid_boards."""
+    scores = [0.0] * len(outputs)
+    grids = [k for k, output in enumerate(outputs) if isinstance(output, list) and len(output) == 9]
+    if not grids:
+        return scores
+    np = load_numpy()
+    try:
+        stacked = np.array([outputs[k] for k in grids], dtype=np.int64)
+    except (TypeError, ValueError):  # ragged rows or non-numeric cells
+        stacked = None
+    if stacked is None or stacked.shape != (len(grids), 9, 9):
+        return [sudoku_accuracy(output, ref) for output, ref in zip(outputs, references)]
+    for k, ok in zip(grids, valid_boards(stacked).tolist()):
+        scores[k] = 1.0 if ok else 0.0
+    return scores
+
+
+# ----------------------------------------------------------------------
+# Binary record codec: 81 bytes of puzzle followed by 81 bytes of solution
+# ----------------------------------------------------------------------
+class SudokuCodec:
+    def record_size(self, params: dict) -> int:
+        return 162
+
+    def encode(self, case: Board, ref: Board, params: dict) -> bytes:
+        return bytes(d for row in case for d in row) + bytes(d for row in ref for d in row)
+
+    def decode(self, record: bytes, params: dict):
+        return ([list(record[r:r + 9]) for r in range(0, 81, 9)],
+                [list(record[r:r + 9]) for r in range(81, 162, 9)])
+
+
+# ----------------------------------------------------------------------
+# Input protocol: boards are frozen as 81 bytes, thawed into fresh rows
+# ----------------------------------------------------------------------
+_ROW_STARTS = range(0, 81, 9)
+
+
+def freeze_board(board: Board) -> bytes:
+    return bytes(d for row in board for d in row)
+
+
+def thaw_board(frozen: bytes) -> Board:
+    return [list(frozen[r:r + 9]) for r in _ROW_STARTS]
 
 
 from core.registry import register_puzzle
-register_puzzle("sudoku", accuracy_fn=sudoku_accuracy)
\ No newline at end of file
+register_puzzle("sudoku", accuracy_fn=sudoku_accuracy, codec=SudokuCodec(),
+                freeze=freeze_board, thaw=thaw_board,
+                batch_accuracy_fn=sudoku_accuracy_batch if HAVE_NUMPY else None)(sudoku_accuracy)
\ No newline at end of file
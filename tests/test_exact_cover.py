@@ -0,0 +1,22 @@
+from core.exact_cover import ExactCover
+
+
+def test_given_rows_clashing_on_a_secondary_column():
+    ec = ExactCover(3, [[0, 2], [1, 2], [0], [1]], n_primary=2)
+    assert ec.solve(limit=0, given=[0, 1]) == []
+    assert ec.solve(limit=0, given=[0]) == [[0, 3]]
+    assert ec.solve(limit=0) == [[0, 3], [2, 1], [2, 3]]
+
+
+def test_given_rows_clashing_on_a_primary_column():
+    ec = ExactCover(2, [[0], [0, 1], [1]])
+    assert ec.solve(limit=0, given=[0, 1]) == []
+    assert ec.solve(limit=0, given=[0, 0]) == []
+    assert ec.solve(limit=0, given=[0, 2]) == [[0, 2]]
+
+
+def test_structure_is_restored_after_a_conflict():
+    ec = ExactCover(3, [[0, 2], [1, 2], [0], [1]], n_primary=2)
+    before = ec.solve(limit=0)
+    ec.solve(limit=0, given=[0, 1])
+    assert ec.solve(limit=0) == before